@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark for server cold start.
+
+Each measurement runs in a fresh interpreter and times the imports and set-up until
+the combined server can answer tools/list: the lazy server of run_server.py, which
+registers its tools from the manifest, against importing all assistant modules up
+front as the server used to. The first call of a tool then pays for importing its
+module; that cost is reported separately.
+
+Usage: python benchmarks/bench_server_startup.py [runs]
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LAZY = """
+import time
+start = time.perf_counter()
+import asyncio
+from run_server import combined_mcp
+tools = asyncio.run(combined_mcp.list_tools())
+print(time.perf_counter() - start)
+"""
+
+EAGER = """
+import time
+start = time.perf_counter()
+import asyncio
+from fastmcp import FastMCP
+from mcp_tools.version_support_assistant import mcp as version_support_mcp
+from mcp_tools.tests_triaging_assistant import mcp as tests_triaging_mcp
+from mcp_tools.release_signoff_assistant import mcp as release_signoff_mcp
+combined_mcp = FastMCP("flowfabric-ai-agents")
+for server in (version_support_mcp, tests_triaging_mcp, release_signoff_mcp):
+    combined_mcp._tool_manager._tools.update(server._tool_manager._tools)
+tools = asyncio.run(combined_mcp.list_tools())
+print(time.perf_counter() - start)
+"""
+
+FIRST_CALL = """
+import time
+from run_server import combined_mcp
+tool = combined_mcp._tool_manager.get_tool("fetch_ticket")
+start = time.perf_counter()
+tool.load()
+print(time.perf_counter() - start)
+"""
+
+
+def measure(script, runs):
+    timings = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout
+        timings.append(float(output.strip().splitlines()[-1]) * 1000)
+    return statistics.median(timings), min(timings)
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    print(f"Server cold start until tools/list, median of {runs} fresh interpreters")
+    for label, script in (("eager imports", EAGER), ("lazy manifest", LAZY), ("first call (release sign-off)", FIRST_CALL)):
+        median, best = measure(script, runs)
+        print(f"  {label:32s} median {median:7.1f} ms   best {best:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
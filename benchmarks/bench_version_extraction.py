@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Benchmark for extracting versions from release sign-off descriptions.
+
+Builds synthetic descriptions of growing size and reports the time per extraction,
+which should grow linearly with the number of nodes.
+
+Usage: python benchmarks/bench_version_extraction.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mcp_tools.release_signoff_assistant import extract_versions_from_description
+
+
+def build_description(paragraphs: int, nodes_per_paragraph: int):
+    """A sign-off description padded with long paragraphs of mixed inline nodes"""
+    filler = [
+        {"type": "text", "text": "Tested on "},
+        {"type": "text", "text": "25.3.0.20250101-0000", "marks": [{"type": "code"}]},
+        {"type": "hardBreak"},
+        {"type": "inlineCard", "attrs": {"url": "https://example.atlassian.net/browse/CON-1"}}
+    ]
+    content = [
+        {"type": "paragraph", "content": (filler * (nodes_per_paragraph // len(filler) + 1))[:nodes_per_paragraph]}
+        for _ in range(paragraphs)
+    ]
+    content.append({
+        "type": "paragraph",
+        "content": [{"type": "text", "text": "Filler"}] * nodes_per_paragraph + [
+            {"type": "text", "text": "Current Connector Version: "},
+            {"type": "text", "text": "25.3.0.20250904-1757", "marks": [{"type": "code"}]},
+            {"type": "text", "text": " Current SDK Version: "},
+            {"type": "text", "text": "25.3.0.20250804-1138", "marks": [{"type": "code"}]},
+            {"type": "text", "text": " Platform Version: 25.3.0.20250919-0941"}
+        ]
+    })
+    return {"type": "doc", "version": 1, "content": content}
+
+
+def main():
+    print(f"{'paragraphs':>10} {'nodes/para':>10} {'total nodes':>12} {'ms/run':>10} {'us/node':>10}")
+    for paragraphs, nodes_per_paragraph in [(10, 100), (100, 100), (100, 1000), (1000, 1000)]:
+        description = build_description(paragraphs, nodes_per_paragraph)
+        total_nodes = (paragraphs + 1) * (nodes_per_paragraph + 1)
+
+        runs = max(1, 200000 // total_nodes)
+        seconds = min(timeit.repeat(lambda: extract_versions_from_description(description), number=runs, repeat=3)) / runs
+
+        versions = extract_versions_from_description(description)
+        assert versions['current_connector_version'] == "25.3.0.20250904-1757", versions
+
+        print(f"{paragraphs:>10} {nodes_per_paragraph:>10} {total_nodes:>12} {seconds * 1000:>10.2f} {seconds * 1e6 / total_nodes:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
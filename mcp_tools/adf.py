@@ -0,0 +1,348 @@
+"""
+Helpers for Atlassian Document Format (ADF), the JSON structure Jira uses for
+rich text fields such as issue descriptions.
+"""
+import hashlib
+import json
+import re
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+Node = Dict[str, Any]
+
+_END = object()
+
+
+def walk(node: Any, prune: Optional[Callable[[Node], bool]] = None) -> Iterator[Node]:
+    """
+    Yield every node of an ADF tree in document order.
+
+    The traversal keeps an explicit stack of child iterators instead of recursing, so
+    arbitrarily deep documents are fine and no intermediate lists are built. Children
+    of a node for which prune(node) is true are not visited. Callers that only need the
+    first match can stop iterating at any point.
+    """
+    if not isinstance(node, dict):
+        return
+
+    stack = [iter((node,))]
+    while stack:
+        child = next(stack[-1], _END)
+        if child is _END:
+            stack.pop()
+            continue
+        if not isinstance(child, dict):
+            continue
+
+        yield child
+
+        content = child.get('content')
+        if content and isinstance(content, list) and not (prune and prune(child)):
+            stack.append(iter(content))
+
+
+def iter_text(node: Any) -> Iterator[str]:
+    """Yield the text of every text node in document order"""
+    for child in walk(node):
+        if child.get('type') == 'text':
+            yield child.get('text', '')
+
+
+def plain_text(node: Any) -> str:
+    """The text of a document (or of a plain string description) with text nodes joined"""
+    if isinstance(node, str):
+        return node
+    return "".join(iter_text(node)).strip()
+
+
+def word_after(node: Any, marker: str) -> Optional[str]:
+    """The first whitespace-separated word following marker in the document text"""
+    text = plain_text(node)
+    if marker not in text:
+        return None
+    words = text.split(marker, 1)[1].split(None, 1)
+    return words[0] if words else None
+
+
+def digest(node: Any, preview_chars: int = 200) -> Dict[str, Any]:
+    """
+    A short stand-in for a large document: a content hash to detect changes, its size
+    and the beginning of its text.
+    """
+    text = plain_text(node)
+    canonical = json.dumps(node, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return {
+        "sha256": hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:16],
+        "characters": len(text),
+        "preview": text[:preview_chars] + ("…" if len(text) > preview_chars else "")
+    }
+
+
+def find(node: Any, predicate: Callable[[Node], bool]) -> Optional[Node]:
+    """Return the first node matching predicate, stopping the walk there"""
+    return next((child for child in walk(node) if predicate(child)), None)
+
+
+# -----------------------------
+# Markdown rendering
+# -----------------------------
+_MARK_WRAPPERS = {
+    'strong': ('**', '**'),
+    'em': ('*', '*'),
+    'strike': ('~~', '~~'),
+    'underline': ('<u>', '</u>'),
+    'subsup': ('', '')
+}
+
+
+def _code_span(value: str) -> str:
+    """Inline code in a backtick fence longer than any run of backticks in value"""
+    fence = '`' * (_longest_backtick_run(value) + 1)
+    if value.startswith('`') or value.endswith('`'):
+        # Markdown drops one space on each side, so the fence stays apart from the text
+        value = f" {value} "
+    return f"{fence}{value}{fence}"
+
+
+def _longest_backtick_run(value: str) -> int:
+    return max((len(run) for run in re.findall('`+', value)), default=0)
+
+
+def _render_text(node: Node) -> str:
+    value = node.get('text', '')
+    marks = {mark.get('type'): mark for mark in node.get('marks') or ()}
+    if 'code' in marks:
+        value = _code_span(value)
+    for mark_type, (start, end) in _MARK_WRAPPERS.items():
+        if mark_type in marks:
+            value = f"{start}{value}{end}"
+    if 'link' in marks:
+        value = f"[{value}]({marks['link'].get('attrs', {}).get('href', '')})"
+    return value
+
+
+def _render_inline(nodes: List[Any]) -> str:
+    """Render inline content; hard breaks become newlines"""
+    parts = []
+    # Inline containers are entered with an explicit stack, like walk()
+    stack = [iter(nodes or ())]
+    while stack:
+        node = next(stack[-1], _END)
+        if node is _END:
+            stack.pop()
+            continue
+        if not isinstance(node, dict):
+            continue
+        node_type = node.get('type')
+        attrs = node.get('attrs') or {}
+        if node_type == 'text':
+            parts.append(_render_text(node))
+        elif node_type == 'hardBreak':
+            parts.append('\n')
+        elif node_type in ('inlineCard', 'blockCard', 'embedCard'):
+            parts.append(f"<{attrs.get('url', '')}>")
+        elif node_type == 'mention':
+            text = attrs.get('text', '')
+            parts.append(text if text.startswith('@') else f"@{text}")
+        elif node_type == 'emoji':
+            parts.append(attrs.get('text') or attrs.get('shortName', ''))
+        elif node_type == 'status':
+            parts.append(f"[{attrs.get('text', '')}]")
+        elif node_type == 'date':
+            parts.append(str(attrs.get('timestamp', '')))
+        elif isinstance(node.get('content'), list):
+            stack.append(iter(node['content']))
+    return ''.join(parts)
+
+
+def _table_lines(node: Node) -> Iterator[str]:
+    for index, row in enumerate(node.get('content') or ()):
+        cells = [
+            ' '.join(_render_inline(block.get('content')) for block in cell.get('content') or () if isinstance(block, dict))
+            .replace('\n', ' ').replace('|', '\\|')
+            for cell in row.get('content') or () if isinstance(cell, dict)
+        ]
+        yield '| ' + ' | '.join(cells) + ' |'
+        if index == 0:
+            yield '|' + '---|' * len(cells)
+
+
+def _leaf_lines(node: Node) -> Optional[List[str]]:
+    """The Markdown lines of a block without block children; None for containers"""
+    node_type = node.get('type')
+    attrs = node.get('attrs') or {}
+
+    if node_type == 'paragraph':
+        return _render_inline(node.get('content')).split('\n')
+    if node_type == 'heading':
+        return ['#' * attrs.get('level', 1) + ' ' + _render_inline(node.get('content')).replace('\n', ' ')]
+    if node_type == 'codeBlock':
+        code = ''.join(iter_text(node))
+        fence = '`' * max(3, _longest_backtick_run(code) + 1)
+        return [fence + (attrs.get('language') or ''), *code.split('\n'), fence]
+    if node_type == 'rule':
+        return ['---']
+    if node_type == 'table':
+        return list(_table_lines(node))
+    if node_type in ('text', 'hardBreak', 'inlineCard', 'mention', 'emoji', 'status', 'date'):
+        return _render_inline([node]).split('\n')
+    return None
+
+
+class _Prefix:
+    """Marks the lines of a container's children: a list item's marker or a quote"""
+    __slots__ = ('first', 'rest', 'empty', 'started')
+
+    def __init__(self, first: str, rest: str, empty: str):
+        self.first = first
+        self.rest = rest
+        self.empty = empty
+        self.started = False
+
+    def apply(self, line: str) -> str:
+        marker = self.rest if self.started else self.first
+        self.started = True
+        return marker + line if line else self.empty
+
+
+class _Container:
+    __slots__ = ('children', 'separated', 'prefix', 'ordered', 'number', 'empty', 'first')
+
+    def __init__(self, node: Node, separated: bool = True, prefix: Optional[_Prefix] = None, empty: Optional[str] = None):
+        self.children = iter(node.get('content') or ())
+        self.separated = separated
+        self.prefix = prefix
+        # Set for lists: whether they are numbered and the next item's number
+        self.ordered: Optional[bool] = None
+        self.number = 1
+        # Yielded for a list item without lines
+        self.empty = empty
+        self.first = True
+
+
+def _open(node: Node) -> _Container:
+    node_type = node.get('type')
+    if node_type in ('bulletList', 'orderedList'):
+        container = _Container(node, separated=False)
+        container.ordered = node_type == 'orderedList'
+        container.number = (node.get('attrs') or {}).get('order', 1)
+        return container
+    if node_type in ('blockquote', 'panel'):
+        return _Container(node, prefix=_Prefix('> ', '> ', '>'))
+    # doc, listItem, expand, layouts and unknown containers: render the children
+    return _Container(node)
+
+
+def _block_lines(root: Node) -> Iterator[str]:
+    """
+    Yield the Markdown lines of a block node. Nested blocks are entered with an
+    explicit stack, like walk(), and each line gets the markers of the lists and
+    quotes around it on the way out.
+    """
+    lines = _leaf_lines(root)
+    if lines is not None:
+        yield from lines
+        return
+
+    prefixes: List[_Prefix] = []
+
+    def prefixed(line: str) -> str:
+        for prefix in reversed(prefixes):
+            line = prefix.apply(line)
+        return line
+
+    stack = [_open(root)]
+    if stack[0].prefix:
+        prefixes.append(stack[0].prefix)
+    while stack:
+        container = stack[-1]
+        child = next(container.children, _END)
+        if child is _END:
+            stack.pop()
+            if container.prefix:
+                prefixes.pop()
+                if container.empty is not None and not container.prefix.started:
+                    yield prefixed(container.empty)
+            continue
+        if not isinstance(child, dict):
+            continue
+
+        if container.separated and not container.first:
+            yield prefixed('')
+        container.first = False
+
+        if container.ordered is not None:
+            # A list's children are its items
+            marker = f"{container.number}. " if container.ordered else "- "
+            container.number += 1
+            opened = _Container(child, separated=False, prefix=_Prefix(marker, ' ' * len(marker), ''), empty=marker.rstrip())
+        else:
+            lines = _leaf_lines(child)
+            if lines is not None:
+                for line in lines:
+                    yield prefixed(line)
+                continue
+            opened = _open(child)
+
+        stack.append(opened)
+        if opened.prefix:
+            prefixes.append(opened.prefix)
+
+
+def iter_markdown(node: Any) -> Iterator[str]:
+    """Render an ADF document to Markdown line by line, as it is read"""
+    if isinstance(node, str):
+        yield node
+        return
+    if not isinstance(node, dict):
+        return
+    for line in _block_lines(node):
+        yield line + '\n'
+
+
+def to_markdown(node: Any) -> str:
+    """Render an ADF document (or a plain string description) to Markdown"""
+    return ''.join(iter_markdown(node)).rstrip('\n')
+
+
+# -----------------------------
+# Document builders
+# -----------------------------
+# Each call returns new nodes, so callers may change what they build
+
+def doc(*content: Any) -> Node:
+    return {"type": "doc", "version": 1, "content": list(content)}
+
+
+def text(value: Any, *marks: str) -> Node:
+    node = {"type": "text", "text": value}
+    if marks:
+        node["marks"] = [{"type": mark} for mark in marks]
+    return node
+
+
+def paragraph(*content: Any) -> Node:
+    return {"type": "paragraph", "content": list(content)}
+
+
+def heading(level: int, *content: Any) -> Node:
+    return {"type": "heading", "attrs": {"level": level}, "content": list(content)}
+
+
+def bullet_list(*items: Any) -> Node:
+    return {"type": "bulletList", "content": list(items)}
+
+
+def list_item(*content: Any) -> Node:
+    return {"type": "listItem", "content": list(content)}
+
+
+def code_block(language: str, value: Any) -> Node:
+    return {"type": "codeBlock", "attrs": {"language": language}, "content": [text(value)]}
+
+
+def inline_card(url: Any) -> Node:
+    return {"type": "inlineCard", "attrs": {"url": url}}
+
+
+def hard_break() -> Node:
+    return {"type": "hardBreak"}
@@ -0,0 +1,87 @@
+"""
+Small in-memory caches shared by the MCP tools.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Iterable, List, Optional, Tuple
+
+
+class LRUCache:
+    """Thread-safe LRU cache with an optional time-to-live (in seconds) per entry."""
+
+    def __init__(self, maxsize: int = 256, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default if missing or expired"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            stored_at, value = entry
+            if self.ttl is not None and time.time() - stored_at > self.ttl:
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store value under key, evicting the least recently used entry when full"""
+        with self._lock:
+            self._data[key] = (time.time(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove key and return its value"""
+        with self._lock:
+            entry = self._data.pop(key, None)
+            return entry[1] if entry else default
+
+    def entries(self) -> List[Tuple[Hashable, float, Any]]:
+        """(key, stored at, value) of the live entries, least recently used first"""
+        now = time.time()
+        with self._lock:
+            return [
+                (key, stored_at, value)
+                for key, (stored_at, value) in self._data.items()
+                if self.ttl is None or now - stored_at <= self.ttl
+            ]
+
+    def restore(self, entries: Iterable[Tuple[Hashable, float, Any]]) -> int:
+        """
+        Add entries saved by entries(), keeping their age. Expired entries and keys
+        cached since are skipped. Returns the number of entries added.
+        """
+        now = time.time()
+        restored = 0
+        with self._lock:
+            # Restored entries are older than anything cached since start, so they go
+            # in front, most recently used of them last
+            for key, stored_at, value in reversed(list(entries)):
+                if key in self._data or (self.ttl is not None and now - stored_at > self.ttl):
+                    continue
+                self._data[key] = (stored_at, value)
+                self._data.move_to_end(key, last=False)
+                restored += 1
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return restored
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+_MISSING = object()
@@ -0,0 +1,68 @@
+"""
+JSON decoding and encoding for upstream (Jira, Jenkins, Gitiles) payloads.
+
+Uses orjson or msgspec when one is installed and falls back to the standard library.
+Responses are decoded straight from their raw bytes instead of going through a
+decoded text copy first.
+"""
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - depends on the environment
+    msgspec = None
+
+Buffer = Union[bytes, bytearray, memoryview, str]
+
+# Gitiles (like other Gerrit APIs) prefixes JSON with this line to defeat XSSI
+XSSI_PREFIX = b")]}'\n"
+
+if orjson is not None:
+    BACKEND = "orjson"
+    loads = orjson.loads
+
+    def dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+elif msgspec is not None:
+    BACKEND = "msgspec"
+    _decoder = msgspec.json.Decoder()
+    _encoder = msgspec.json.Encoder()
+
+    def loads(data: Buffer) -> Any:
+        return _decoder.decode(data.encode() if isinstance(data, str) else data)
+
+    def dumps(obj: Any) -> bytes:
+        return _encoder.encode(obj)
+
+else:
+    BACKEND = "json"
+
+    def loads(data: Buffer) -> Any:
+        # The stdlib parser needs bytes or str; memoryviews are copied once here
+        return json.loads(bytes(data) if isinstance(data, memoryview) else data)
+
+    def dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def decode_response(response: Any) -> Any:
+    """Decode the JSON body of a requests or httpx response from its raw bytes"""
+    return loads(response.content)
+
+
+def decode_xssi_response(response: Any) -> Any:
+    """Decode a Gerrit/Gitiles JSON response, skipping the XSSI prefix without copying the body"""
+    body = memoryview(response.content)
+    if body[:len(XSSI_PREFIX)] == XSSI_PREFIX:
+        body = body[len(XSSI_PREFIX):]
+    return loads(body)
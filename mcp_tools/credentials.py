@@ -0,0 +1,68 @@
+"""
+Per-session credentials.
+
+Over stdio the server belongs to one developer and reads Jira, Jenkins and Git
+credentials from the environment (.env). Over HTTP one server is shared by many
+clients; each client sends its own credentials as request headers, and they apply
+only to the tool calls of that request. An HTTP client that sends none has no
+credentials at all; the server's own never stand in for them. Tools read
+configuration through getenv(), which prefers the calling session's values.
+"""
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Mapping, Optional
+
+# Request header -> environment variable it overrides
+CREDENTIAL_HEADERS = {
+    "x-jira-url": "JIRA_URL",
+    "x-jira-user": "JIRA_USER",
+    "x-jira-token": "JIRA_TOKEN",
+    "x-jenkins-url": "JENKINS_URL",
+    "x-jenkins-user": "JENKINS_USER",
+    "x-jenkins-token": "JENKINS_TOKEN",
+    "x-git-user-name": "GIT_USER_NAME",
+    "x-git-password": "GIT_PASSWORD",
+}
+
+# Identities and secrets are never mixed between a session and the server environment;
+# service URLs fall back to the environment when a session does not send them
+SECRET_NAMES = frozenset({
+    "JIRA_USER", "JIRA_TOKEN", "JENKINS_USER", "JENKINS_TOKEN", "GIT_USER_NAME", "GIT_PASSWORD"
+})
+
+_session: ContextVar[Optional[Dict[str, str]]] = ContextVar("session_credentials", default=None)
+
+
+def credentials_from_headers(headers: Mapping[str, str]) -> Dict[str, str]:
+    """Credentials sent as request headers; empty if the request carries none"""
+    return {
+        name: headers[header]
+        for header, name in CREDENTIAL_HEADERS.items()
+        if headers.get(header)
+    }
+
+
+@contextmanager
+def session_credentials(values: Optional[Dict[str, str]]) -> Iterator[None]:
+    """
+    Use values instead of the environment for the code run inside the block; None
+    means no session (stdio), an empty dict a session without credentials
+    """
+    token = _session.set(values)
+    try:
+        yield
+    finally:
+        _session.reset(token)
+
+
+def getenv(name: str, default: Optional[str] = None) -> Optional[str]:
+    """os.getenv that prefers the credentials of the calling session"""
+    values = _session.get()
+    if values is None:
+        return os.getenv(name, default)
+    if name in values:
+        return values[name]
+    if name in SECRET_NAMES:
+        return default
+    return os.getenv(name, default)
@@ -0,0 +1,185 @@
+"""
+Planning of Jira issue writes.
+
+Jira's transition endpoint accepts "fields" and "update" next to the transition, so a
+field change and a status change of one issue can be sent as a single request. The
+planner builds that merged request and falls back to a separate field update and
+transition when the merged one fails. When Jira's errors say a sent field is not on
+the transition screen, that is remembered per project, transition and fields, so
+later writes of the same kind go straight to the separate requests. Other failures,
+e.g. a transition not available from the issue's current status, are not remembered.
+"""
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from mcp_tools.cache import LRUCache
+from mcp_tools.codec import decode_response
+
+# Merges Jira rejected, by _merge_key. Not keyed by Jira site: a wrong hit only costs
+# the separate requests
+_rejected_merges = LRUCache(maxsize=256)
+
+
+class WriteStep(NamedTuple):
+    method: str
+    path: str
+    payload: Dict[str, Any]
+
+    @property
+    def is_transition(self) -> bool:
+        return self.path.endswith("/transitions")
+
+
+def issue_path(issue_key: str) -> str:
+    return f"/rest/api/3/issue/{issue_key}"
+
+
+def plan_issue_write(
+    issue_key: str,
+    fields: Optional[Dict[str, Any]] = None,
+    update: Optional[Dict[str, Any]] = None,
+    transition_id: Optional[str] = None
+) -> List[WriteStep]:
+    """Plan the fewest requests that apply field changes and a transition to one issue"""
+    merge_key = _merge_key(issue_key, fields, update, transition_id)
+    if transition_id and merge_key is not None and merge_key in _rejected_merges:
+        return plan_separate_writes(issue_key, fields, update, transition_id)
+    if transition_id:
+        payload: Dict[str, Any] = {"transition": {"id": transition_id}}
+        if fields:
+            payload["fields"] = fields
+        if update:
+            payload["update"] = update
+        return [WriteStep("POST", f"{issue_path(issue_key)}/transitions", payload)]
+
+    return plan_separate_writes(issue_key, fields, update)
+
+
+def plan_separate_writes(
+    issue_key: str,
+    fields: Optional[Dict[str, Any]] = None,
+    update: Optional[Dict[str, Any]] = None,
+    transition_id: Optional[str] = None
+) -> List[WriteStep]:
+    """Plan a field update followed by a bare transition"""
+    steps = []
+
+    payload: Dict[str, Any] = {}
+    if fields:
+        payload["fields"] = fields
+    if update:
+        payload["update"] = update
+    if payload:
+        steps.append(WriteStep("PUT", issue_path(issue_key), payload))
+
+    if transition_id:
+        steps.append(WriteStep("POST", f"{issue_path(issue_key)}/transitions", {"transition": {"id": transition_id}}))
+
+    return steps
+
+
+def _same_value(current: Any, intended: Any) -> bool:
+    # Label-like lists are unordered in Jira
+    if isinstance(current, list) and isinstance(intended, list) and all(isinstance(v, str) for v in current + intended):
+        return sorted(current) == sorted(intended)
+    return current == intended
+
+
+def changed_fields(current_fields: Optional[Dict[str, Any]], intended_fields: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep only the intended fields whose value differs from the issue's current value"""
+    current_fields = current_fields or {}
+    return {
+        name: value
+        for name, value in intended_fields.items()
+        if name not in current_fields or not _same_value(current_fields[name], value)
+    }
+
+
+def succeeded(response: Any) -> bool:
+    return 200 <= response.status_code < 300
+
+
+def _merge_key(issue_key, fields, update, transition_id) -> Optional[tuple]:
+    # Transition screens belong to the project's workflow; numeric issue ids carry no
+    # project, so their merges are never remembered
+    if "-" not in issue_key:
+        return None
+    project = issue_key.rsplit("-", 1)[0]
+    return (project, transition_id, tuple(sorted(fields or ())), tuple(sorted(update or ())))
+
+
+def _not_on_screen(response: Any, names) -> bool:
+    """Whether Jira refused fields of names because they are not on the transition screen"""
+    if response.status_code != 400:
+        return False
+    try:
+        errors = decode_response(response).get("errors") or {}
+    except (AttributeError, TypeError, ValueError):
+        return False
+    # e.g. "Field 'labels' cannot be set. It is not on the appropriate screen, or unknown."
+    return any("screen" in str(errors.get(name, "")).lower() for name in names)
+
+
+def _needs_fallback(step: WriteStep, response: Any) -> bool:
+    """A merged transition that failed; the field update must still be tried on its own"""
+    return step.is_transition and ("fields" in step.payload or "update" in step.payload) and not succeeded(response)
+
+
+def _fall_back(issue_key, fields, update, transition_id, response) -> List[WriteStep]:
+    """The separate writes after a failed merge, remembering a merge the screen rejected"""
+    merge_key = _merge_key(issue_key, fields, update, transition_id)
+    if merge_key is not None and _not_on_screen(response, [*(fields or ()), *(update or ())]):
+        _rejected_merges.set(merge_key, True)
+    return plan_separate_writes(issue_key, fields, update, transition_id)
+
+
+def execute_steps(send: Callable[[WriteStep], Any], steps: List[WriteStep]) -> List[Tuple[WriteStep, Any]]:
+    """Send steps in order with send(step) -> response, stopping at the first failure"""
+    executed = []
+    for step in steps:
+        response = send(step)
+        executed.append((step, response))
+        if not succeeded(response):
+            break
+    return executed
+
+
+def execute_issue_write(
+    send: Callable[[WriteStep], Any],
+    issue_key: str,
+    fields: Optional[Dict[str, Any]] = None,
+    update: Optional[Dict[str, Any]] = None,
+    transition_id: Optional[str] = None
+) -> List[Tuple[WriteStep, Any]]:
+    """Plan and execute a write of one issue, returning every (step, response) sent"""
+    executed = execute_steps(send, plan_issue_write(issue_key, fields, update, transition_id))
+    if executed and _needs_fallback(*executed[-1]):
+        executed = execute_steps(send, _fall_back(issue_key, fields, update, transition_id, executed[-1][1]))
+    return executed
+
+
+async def aexecute_steps(
+    send: Callable[[WriteStep], Awaitable[Any]],
+    steps: List[WriteStep]
+) -> List[Tuple[WriteStep, Any]]:
+    """Async variant of execute_steps"""
+    executed = []
+    for step in steps:
+        response = await send(step)
+        executed.append((step, response))
+        if not succeeded(response):
+            break
+    return executed
+
+
+async def aexecute_issue_write(
+    send: Callable[[WriteStep], Awaitable[Any]],
+    issue_key: str,
+    fields: Optional[Dict[str, Any]] = None,
+    update: Optional[Dict[str, Any]] = None,
+    transition_id: Optional[str] = None
+) -> List[Tuple[WriteStep, Any]]:
+    """Async variant of execute_issue_write"""
+    executed = await aexecute_steps(send, plan_issue_write(issue_key, fields, update, transition_id))
+    if executed and _needs_fallback(*executed[-1]):
+        executed = await aexecute_steps(send, _fall_back(issue_key, fields, update, transition_id, executed[-1][1]))
+    return executed
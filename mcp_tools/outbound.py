@@ -0,0 +1,356 @@
+"""
+Scheduling of outbound HTTP requests to Jira, Jenkins and Gerrit.
+
+Each host gets a bulkhead: a limit on the requests in flight to it, so a slow Jenkins
+cannot use up the capacity needed for Jira and vice versa. When a host is at its limit,
+freed slots go to waiting requests by priority class: interactive tool calls, then
+batch tools, then background prefetch. A few slots per host are usable by interactive
+calls only, so a bulk job or a prefetch run cannot starve them.
+
+The priority is taken from the calling context (see priority()); tool calls are
+interactive unless they say otherwise. httpx clients get the scheduler as their
+transport (outbound.transport() / outbound.async_transport()), which also keeps one
+connection pool for all of them, so a tool call reuses the connections of earlier
+calls; requests calls are wrapped in outbound.gate(url).
+"""
+import asyncio
+import heapq
+import itertools
+import threading
+import weakref
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Callable, Dict, Iterator, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+# Requests in flight per host
+DEFAULT_HOST_LIMIT = 8
+# Of those, slots only interactive calls may use
+INTERACTIVE_RESERVE = 2
+
+
+class Priority(IntEnum):
+    INTERACTIVE = 0
+    BATCH = 1
+    PREFETCH = 2
+
+
+_priority: ContextVar[Priority] = ContextVar("outbound_priority", default=Priority.INTERACTIVE)
+
+
+@contextmanager
+def priority(level: Priority) -> Iterator[None]:
+    """Send the requests made inside the block with the given priority"""
+    token = _priority.set(level)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> Priority:
+    return _priority.get()
+
+
+class _Waiter:
+    __slots__ = ("wake", "granted", "abandoned")
+
+    def __init__(self, wake: Callable[[], None]):
+        self.wake = wake
+        self.granted = False
+        self.abandoned = False
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+def _in_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+class Bulkhead:
+    """Concurrency limit for one host; waiting requests are admitted by priority, then in order"""
+
+    def __init__(self, limit: int = DEFAULT_HOST_LIMIT, reserved: int = INTERACTIVE_RESERVE):
+        if not 0 <= reserved < limit:
+            raise ValueError("reserved slots must be fewer than the limit")
+        self.limit = limit
+        self.reserved = reserved
+        self.active = 0
+        self._waiting = []
+        self._order = itertools.count()
+        self._lock = threading.Lock()
+
+    def acquire(self, level: Priority) -> None:
+        """Wait for a slot in a worker thread"""
+        with self._lock:
+            if self._try_take(level):
+                return
+            if _in_event_loop():
+                # Blocking an event loop thread could wait forever on requests that loop
+                # itself has to finish; blocking calls made there are admitted at once
+                self.active += 1
+                return
+            event = threading.Event()
+            self._enqueue(level, _Waiter(event.set))
+        event.wait()
+
+    async def aacquire(self, level: Priority) -> None:
+        """Wait for a slot in a coroutine"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._lock:
+            if self._try_take(level):
+                return
+            waiter = _Waiter(lambda: loop.call_soon_threadsafe(_resolve, future))
+            self._enqueue(level, waiter)
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter.granted:
+                    self._release_locked()
+                else:
+                    waiter.abandoned = True
+            raise
+
+    def release(self) -> None:
+        with self._lock:
+            self._release_locked()
+
+    def _has_room(self, level: Priority) -> bool:
+        limit = self.limit if level == Priority.INTERACTIVE else self.limit - self.reserved
+        return self.active < limit
+
+    def _try_take(self, level: Priority) -> bool:
+        self._drop_abandoned()
+        # Requests of the same or a higher class that are already waiting go first
+        if self._waiting and self._waiting[0][0] <= level:
+            return False
+        if not self._has_room(level):
+            return False
+        self.active += 1
+        return True
+
+    def _enqueue(self, level: Priority, waiter: _Waiter) -> None:
+        heapq.heappush(self._waiting, (level, next(self._order), waiter))
+
+    def _drop_abandoned(self) -> None:
+        while self._waiting and self._waiting[0][2].abandoned:
+            heapq.heappop(self._waiting)
+
+    def _release_locked(self) -> None:
+        self.active -= 1
+        self._drop_abandoned()
+        while self._waiting:
+            level, _, waiter = self._waiting[0]
+            if not self._has_room(level):
+                break
+            heapq.heappop(self._waiting)
+            self.active += 1
+            waiter.granted = True
+            waiter.wake()
+            self._drop_abandoned()
+
+
+class _ReleasingStream(httpx.SyncByteStream):
+    """Response body that frees its slot when the response is closed"""
+
+    def __init__(self, stream, release: Callable[[], None]):
+        self._stream = stream
+        self._release = release
+
+    def __iter__(self):
+        yield from self._stream
+
+    def close(self) -> None:
+        try:
+            self._stream.close()
+        finally:
+            if self._release:
+                self._release, release = None, self._release
+                release()
+
+
+class _AsyncReleasingStream(httpx.AsyncByteStream):
+    def __init__(self, stream, release: Callable[[], None]):
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._release:
+                self._release, release = None, self._release
+                release()
+
+
+class GatedTransport(httpx.BaseTransport):
+    def __init__(
+        self,
+        scheduler: "OutboundScheduler",
+        inner: Optional[httpx.BaseTransport] = None,
+        shared: bool = False
+    ):
+        self._scheduler = scheduler
+        self._inner = inner or httpx.HTTPTransport()
+        # A shared transport outlives the clients using it, so closing one keeps the pool
+        self._shared = shared
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        bulkhead = self._scheduler.bulkhead(request.url.host)
+        bulkhead.acquire(current_priority())
+        try:
+            response = self._inner.handle_request(request)
+        except BaseException:
+            bulkhead.release()
+            raise
+        # The slot is held until the body has been read (or the stream closed);
+        # a response built from content is closed already
+        if response.is_closed:
+            bulkhead.release()
+        else:
+            response.stream = _ReleasingStream(response.stream, bulkhead.release)
+        return response
+
+    def close(self) -> None:
+        if not self._shared:
+            self._inner.close()
+
+
+class AsyncGatedTransport(httpx.AsyncBaseTransport):
+    def __init__(
+        self,
+        scheduler: "OutboundScheduler",
+        inner: Optional[httpx.AsyncBaseTransport] = None,
+        shared: bool = False
+    ):
+        self._scheduler = scheduler
+        self._inner = inner or httpx.AsyncHTTPTransport()
+        self._shared = shared
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        bulkhead = self._scheduler.bulkhead(request.url.host)
+        await bulkhead.aacquire(current_priority())
+        try:
+            response = await self._inner.handle_async_request(request)
+        except BaseException:
+            bulkhead.release()
+            raise
+        if response.is_closed:
+            bulkhead.release()
+        else:
+            response.stream = _AsyncReleasingStream(response.stream, bulkhead.release)
+        return response
+
+    async def aclose(self) -> None:
+        if not self._shared:
+            await self._inner.aclose()
+
+
+class OutboundScheduler:
+    def __init__(
+        self,
+        limit: int = DEFAULT_HOST_LIMIT,
+        reserved: int = INTERACTIVE_RESERVE,
+        host_limits: Optional[Dict[str, int]] = None
+    ):
+        self.limit = limit
+        self.reserved = reserved
+        self.host_limits = host_limits or {}
+        self._bulkheads: Dict[str, Bulkhead] = {}
+        self._transport: Optional[GatedTransport] = None
+        # Async connections belong to the event loop that opened them
+        self._async_transports: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncGatedTransport]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+
+    def bulkhead(self, host: str) -> Bulkhead:
+        with self._lock:
+            bulkhead = self._bulkheads.get(host)
+            if bulkhead is None:
+                limit = self.host_limits.get(host, self.limit)
+                bulkhead = Bulkhead(limit, min(self.reserved, limit - 1))
+                self._bulkheads[host] = bulkhead
+            return bulkhead
+
+    @contextmanager
+    def gate(self, url: str) -> Iterator[None]:
+        """Hold a slot of url's host for the block; for clients other than httpx"""
+        bulkhead = self.bulkhead(urlsplit(url).hostname or "")
+        bulkhead.acquire(current_priority())
+        try:
+            yield
+        finally:
+            bulkhead.release()
+
+    @asynccontextmanager
+    async def agate(self, url: str):
+        bulkhead = self.bulkhead(urlsplit(url).hostname or "")
+        await bulkhead.aacquire(current_priority())
+        try:
+            yield
+        finally:
+            bulkhead.release()
+
+    def transport(self, **kwargs) -> GatedTransport:
+        """
+        Transport for an httpx.Client. Without kwargs it is the scheduler's own, whose
+        connection pool is shared by all clients; kwargs get a new httpx.HTTPTransport
+        """
+        if kwargs:
+            return GatedTransport(self, httpx.HTTPTransport(**kwargs))
+        with self._lock:
+            if self._transport is None:
+                self._transport = GatedTransport(self, httpx.HTTPTransport(), shared=True)
+            return self._transport
+
+    def async_transport(self, **kwargs) -> AsyncGatedTransport:
+        """
+        Transport for an httpx.AsyncClient. Without kwargs it is shared by all clients
+        on the running event loop; kwargs get a new httpx.AsyncHTTPTransport
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if kwargs or loop is None:
+            return AsyncGatedTransport(self, httpx.AsyncHTTPTransport(**kwargs))
+        with self._lock:
+            transport = self._async_transports.get(loop)
+            if transport is None:
+                transport = AsyncGatedTransport(self, httpx.AsyncHTTPTransport(), shared=True)
+                self._async_transports[loop] = transport
+            return transport
+
+    def close(self) -> None:
+        """Close the connections of the shared sync transport"""
+        with self._lock:
+            transport, self._transport = self._transport, None
+        if transport is not None:
+            transport._inner.close()
+
+    async def aclose(self) -> None:
+        """Close the connections of the running event loop; call before a short-lived loop ends"""
+        with self._lock:
+            transport = self._async_transports.pop(asyncio.get_running_loop(), None)
+        if transport is not None:
+            await transport._inner.aclose()
+
+
+outbound = OutboundScheduler()
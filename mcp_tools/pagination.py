@@ -0,0 +1,65 @@
+"""
+Cursor-based pagination of large tool results.
+
+A tool result that is larger than the page budget is cut after the first page; the
+remaining items stay in a server-side buffer under an opaque cursor, and a follow-up
+call with that cursor is served from the buffer instead of querying upstream again.
+"""
+import secrets
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from mcp_tools.cache import LRUCache
+from mcp_tools.codec import dumps
+
+# Serialized size of the items on one page
+DEFAULT_PAGE_BYTES = 32 * 1024
+# Buffered results not continued within this many seconds are dropped
+DEFAULT_CURSOR_TTL = 15 * 60
+
+
+class Page(NamedTuple):
+    items: List[Any]
+    next_cursor: Optional[str]
+    remaining: int
+    meta: Dict[str, Any]
+
+
+class CursorError(ValueError):
+    """The cursor is unknown, expired, already used or belongs to another tool"""
+
+
+class ResultBuffer:
+    def __init__(self, page_bytes: int = DEFAULT_PAGE_BYTES, maxsize: int = 64, ttl: float = DEFAULT_CURSOR_TTL):
+        self.page_bytes = page_bytes
+        self._pending = LRUCache(maxsize=maxsize, ttl=ttl)
+
+    def paginate(self, scope: str, items: List[Any], meta: Optional[Dict[str, Any]] = None) -> Page:
+        """Return the first page of items, buffering the rest under a new cursor"""
+        meta = meta or {}
+        size = 0
+        end = 0
+        for end, item in enumerate(items, start=1):
+            size += len(dumps(item))
+            # Always return at least one item, even if it alone exceeds the budget
+            if size > self.page_bytes and end > 1:
+                end -= 1
+                break
+        else:
+            return Page(list(items), None, 0, meta)
+
+        rest = items[end:]
+        cursor = secrets.token_urlsafe(16)
+        self._pending.set(cursor, (scope, rest, meta))
+        return Page(items[:end], cursor, len(rest), meta)
+
+    def next_page(self, scope: str, cursor: str) -> Page:
+        """Serve the page after cursor; each cursor can be used once"""
+        entry = self._pending.get(cursor)
+        if entry is None or entry[0] != scope:
+            raise CursorError("Cursor is unknown or expired; repeat the original request")
+        self._pending.pop(cursor)
+        _, rest, meta = entry
+        return self.paginate(scope, rest, meta)
+
+
+result_buffer = ResultBuffer()
@@ -0,0 +1,285 @@
+"""
+Background prefetching of predictable workloads.
+
+A scheduler thread inside the server runs prefetch tasks on cron-like schedules, e.g.
+the latest builds of the nightly connector jobs before triage and the "To Triage"
+version support tickets before the morning review. The tasks call the same code as
+the tools, so interactive calls afterwards find the data warm:
+
+- Failures of finished builds go to the tests triaging build cache, like any call.
+- Jira search results are kept in warm_results for a short time, but only when a
+  prefetch task fetched them; an interactive call with the same query, user and
+  limit is served from there while the result is fresh. The tools that change
+  tickets drop the searches of their assistant after a successful write.
+
+Tasks run one at a time in a single thread with lowered OS priority, their requests
+are sent with the lowest outbound priority, and a failing task is logged and retried
+at its next scheduled time.
+
+The schedule is a JSON file passed to run_server.py with --prefetch-config, see
+prefetch.example.json. Each task has a name, a cron schedule in server local time and
+the options of its PREFETCH_TASKS function (for the ticket tasks, the fields of the
+tool's request).
+"""
+import asyncio
+import importlib
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+from mcp_tools.cache import LRUCache
+from mcp_tools.outbound import Priority, outbound, priority
+
+logger = logging.getLogger(__name__)
+
+# Prefetched search results are served to interactive calls for this many seconds
+DEFAULT_WARM_TTL = 30 * 60
+# Niceness of the prefetch thread, where the OS supports per-thread priorities
+PREFETCH_NICENESS = 10
+
+_CRON_FIELDS = (
+    ("minute", 0, 59),
+    ("hour", 0, 23),
+    ("day", 1, 31),
+    ("month", 1, 12),
+    ("weekday", 0, 6),
+)
+
+
+class CronSchedule:
+    """
+    A five-field cron expression: minute hour day-of-month month day-of-week.
+    Fields take *, numbers, ranges (1-5), lists (0,30) and steps (*/15, 8-18/2);
+    Sunday is 0 (or 7).
+    """
+
+    def __init__(self, expression: str):
+        parts = expression.split()
+        if len(parts) != len(_CRON_FIELDS):
+            raise ValueError(f"Cron expression needs 5 fields, got {expression!r}")
+        self.expression = expression
+        self.fields = [
+            self._parse(part, name, low, high) for part, (name, low, high) in zip(parts, _CRON_FIELDS)
+        ]
+        self.fields[4] = {0 if day == 7 else day for day in self.fields[4]}
+        # Like cron: with both days restricted, either one matching is enough
+        self._any_day = parts[2] != "*" and parts[4] != "*"
+
+    @staticmethod
+    def _parse(part: str, name: str, low: int, high: int) -> set:
+        # Sunday may be written as 7
+        top = 7 if name == "weekday" else high
+        values = set()
+        for item in part.split(","):
+            spec, _, step_text = item.partition("/")
+            step = int(step_text) if step_text else 1
+            if spec == "*":
+                start, end = low, high
+            elif "-" in spec:
+                start_text, end_text = spec.split("-", 1)
+                start, end = int(start_text), int(end_text)
+            else:
+                start = int(spec)
+                end = high if step_text else start
+            if step < 1 or not (low <= start <= end <= top):
+                raise ValueError(f"Invalid {name} field {item!r} in cron expression")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def _day_matches(self, moment: datetime) -> bool:
+        days, months, weekdays = self.fields[2:]
+        if moment.month not in months:
+            return False
+        # datetime counts Monday as 0, cron counts Sunday as 0
+        day_match = moment.day in days
+        weekday_match = (moment.weekday() + 1) % 7 in weekdays
+        return (day_match or weekday_match) if self._any_day else (day_match and weekday_match)
+
+    def matches(self, moment: datetime) -> bool:
+        minutes, hours = self.fields[:2]
+        return moment.minute in minutes and moment.hour in hours and self._day_matches(moment)
+
+    def next_after(self, moment: datetime) -> datetime:
+        """The first matching minute after moment"""
+        start = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        minutes, hours = sorted(self.fields[0]), sorted(self.fields[1])
+        first_day = start.replace(hour=0, minute=0)
+        # Every satisfiable expression matches within 8 years (29 February)
+        for offset in range(8 * 366 + 1):
+            day = first_day + timedelta(days=offset)
+            if not self._day_matches(day):
+                continue
+            for hour in hours:
+                for minute in minutes:
+                    candidate = day.replace(hour=hour, minute=minute)
+                    if candidate >= start:
+                        return candidate
+        raise ValueError(f"Cron expression {self.expression!r} never matches")
+
+
+_prefetching: ContextVar[bool] = ContextVar("prefetching", default=False)
+
+
+@contextmanager
+def prefetching():
+    """Mark the code run inside the block as a prefetch"""
+    token = _prefetching.set(True)
+    try:
+        yield
+    finally:
+        _prefetching.reset(token)
+
+
+class WarmResults:
+    """Results fetched by prefetch tasks, served to interactive calls while fresh"""
+
+    def __init__(self, maxsize: int = 64, ttl: float = DEFAULT_WARM_TTL):
+        self._cache = LRUCache(maxsize=maxsize, ttl=ttl)
+
+    def get(self, key: Hashable) -> Any:
+        # A prefetch always goes upstream, so it refreshes what it is meant to warm
+        if _prefetching.get():
+            return None
+        return self._cache.get(key)
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Keep value if a prefetch task fetched it; interactive results are not kept"""
+        if _prefetching.get():
+            self._cache.set(key, value)
+
+    def discard(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Drop the results whose key matches predicate, e.g. after a change upstream"""
+        keys = [key for key, _, _ in self._cache.entries() if predicate(key)]
+        for key in keys:
+            self._cache.pop(key)
+        return len(keys)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+warm_results = WarmResults()
+
+
+# -----------------------------
+# Prefetch Tasks
+# -----------------------------
+# Assistant modules are imported when a task first runs, like their tools
+
+def prefetch_build_failures(jobs: List[str]) -> None:
+    """Latest build of each job, with its failed tests"""
+    tests_triaging = importlib.import_module("mcp_tools.tests_triaging_assistant")
+    for job_name in jobs:
+        try:
+            tests_triaging.fetch_latest_build_failures(job_name)
+        except Exception as e:
+            logger.warning("Prefetching failures of %s failed: %s", job_name, e)
+
+
+def prefetch_triage_tickets(**options) -> None:
+    """Version support tickets, "To Triage" unless configured otherwise"""
+    version_support = importlib.import_module("mcp_tools.version_support_assistant")
+
+    async def fetch():
+        try:
+            await version_support.fetch_tickets(version_support.TicketFetchInput(**options))
+        finally:
+            # The loop ends with the task, so its connections are not kept
+            await outbound.aclose()
+
+    asyncio.run(fetch())
+
+
+def prefetch_signoff_tickets(**options) -> None:
+    """Release sign-off tickets"""
+    release_signoff = importlib.import_module("mcp_tools.release_signoff_assistant")
+    result = release_signoff.fetch_release_signoff_tickets(release_signoff.FetchReleaseTicketsRequest(**options))
+    if result.get("success") is False:
+        raise RuntimeError(result.get("error"))
+
+
+PREFETCH_TASKS: Dict[str, Callable[..., None]] = {
+    "build_failures": prefetch_build_failures,
+    "triage_tickets": prefetch_triage_tickets,
+    "signoff_tickets": prefetch_signoff_tickets,
+}
+
+
+# -----------------------------
+# Scheduler
+# -----------------------------
+
+class ScheduledTask:
+    def __init__(self, task: str, schedule: str, **options):
+        if task not in PREFETCH_TASKS:
+            raise ValueError(f"Unknown prefetch task {task!r}; expected one of {', '.join(PREFETCH_TASKS)}")
+        self.task = task
+        self.schedule = CronSchedule(schedule)
+        self.options = options
+
+    def run(self) -> None:
+        with prefetching(), priority(Priority.PREFETCH):
+            PREFETCH_TASKS[self.task](**self.options)
+
+
+class PrefetchScheduler:
+    def __init__(self, tasks: List[ScheduledTask], clock: Callable[[], datetime] = datetime.now):
+        self.tasks = tasks
+        self.clock = clock
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_config(cls, path: str) -> "PrefetchScheduler":
+        with open(path, encoding="utf-8") as config_file:
+            config = json.load(config_file)
+        return cls([ScheduledTask(**entry) for entry in config.get("tasks", [])])
+
+    def run_due(self, moment: datetime) -> int:
+        """Run the tasks scheduled for moment's minute; returns how many ran"""
+        ran = 0
+        for scheduled in self.tasks:
+            if self._stop.is_set():
+                break
+            if not scheduled.schedule.matches(moment):
+                continue
+            try:
+                scheduled.run()
+            except Exception:
+                logger.exception("Prefetch task %s failed", scheduled.task)
+            ran += 1
+        return ran
+
+    def start(self) -> None:
+        if self._thread is None and self.tasks:
+            self._thread = threading.Thread(target=self._run, name="prefetch", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        _lower_thread_priority()
+        moment = self.clock()
+        while not self._stop.is_set():
+            due = min(scheduled.schedule.next_after(moment) for scheduled in self.tasks)
+            if self._stop.wait(max(0.0, (due - self.clock()).total_seconds())):
+                break
+            self.run_due(due)
+            # Minutes that passed while tasks ran are skipped, not caught up on
+            moment = max(due, self.clock())
+
+
+def _lower_thread_priority() -> None:
+    """Lower the priority of the calling thread; Linux applies niceness per thread"""
+    try:
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), PREFETCH_NICENESS)
+    except (AttributeError, OSError):
+        pass
@@ -0,0 +1,68 @@
+"""
+Progress reporting for long-running tools.
+
+Tools take an optional FastMCP Context (ctx: Context = None) and wrap it in a
+ProgressReporter, which sends MCP progress notifications (items done / total) and log
+messages for stages and partial results. Without a context, e.g. when a tool function
+is called directly, reporting does nothing.
+"""
+import asyncio
+from typing import Any, Callable, Optional
+
+from mcp_tools.codec import dumps
+
+# progress(done, total=None, message=None, partial=None), callable from worker threads
+ProgressCallback = Callable[..., None]
+
+
+class ProgressReporter:
+    def __init__(self, ctx: Any = None):
+        self.ctx = ctx
+
+    async def update(
+        self,
+        done: float,
+        total: Optional[float] = None,
+        message: Optional[str] = None,
+        partial: Any = None
+    ) -> None:
+        """Report items done out of total, with an optional stage message and partial result"""
+        if self.ctx is None:
+            return
+        try:
+            await self.ctx.report_progress(done, total)
+            if message:
+                await self.ctx.info(message)
+            if partial is not None:
+                await self.ctx.info(f"partial result: {dumps(partial).decode('utf-8')}")
+        except Exception:
+            # Progress is best effort; a client that went away must not fail the tool
+            pass
+
+    async def stage(self, message: str) -> None:
+        """Announce a new stage of the work"""
+        if self.ctx is None:
+            return
+        try:
+            await self.ctx.info(message)
+        except Exception:
+            pass
+
+    def threadsafe(self) -> ProgressCallback:
+        """
+        A plain callback for work running in a thread (asyncio.to_thread). Updates are
+        scheduled on the event loop of the calling coroutine without blocking the worker.
+        """
+        if self.ctx is None:
+            return _ignore
+
+        loop = asyncio.get_running_loop()
+
+        def progress(done, total=None, message=None, partial=None):
+            asyncio.run_coroutine_threadsafe(self.update(done, total, message, partial), loop)
+
+        return progress
+
+
+def _ignore(*args, **kwargs) -> None:
+    pass
@@ -0,0 +1,116 @@
+"""
+Compact internal records for Jira issues, Jenkins test cases and Git commits.
+
+Upstream JSON is decoded into these once, right after it is fetched, and the tools
+pass the records around instead of raw nested dicts. Conversion to the dicts or
+pydantic models a tool returns happens only at the boundary, in bulk.
+"""
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+TASK_KEY_PATTERN = re.compile(r'(CON-\d+)')
+JIRA_BROWSE_URL = 'https://tasktop.atlassian.net/browse'
+
+
+def _display_name(user: Optional[Dict[str, Any]]) -> Optional[str]:
+    return user['displayName'] if user else None
+
+
+@dataclass(slots=True, frozen=True)
+class Issue:
+    key: str
+    id: Optional[str]
+    summary: str
+    status: str
+    created: Optional[str]
+    updated: Optional[str]
+    assignee: Optional[str]
+    reporter: Optional[str]
+    fix_versions: Tuple[str, ...]
+    labels: Tuple[str, ...]
+    description: Any
+
+    @classmethod
+    def from_json(cls, issue: Dict[str, Any]) -> "Issue":
+        """Decode an issue from a Jira REST response"""
+        fields = issue.get('fields') or {}
+        return cls(
+            key=issue['key'],
+            id=issue.get('id'),
+            summary=fields.get('summary', ''),
+            status=(fields.get('status') or {}).get('name', ''),
+            created=fields.get('created'),
+            updated=fields.get('updated'),
+            assignee=_display_name(fields.get('assignee')),
+            reporter=_display_name(fields.get('reporter')),
+            fix_versions=tuple(version['name'] for version in fields.get('fixVersions') or ()),
+            labels=tuple(fields.get('labels') or ()),
+            description=fields.get('description', '')
+        )
+
+    def as_ticket(self) -> Dict[str, Any]:
+        """The ticket shape returned by the release sign-off tools"""
+        return {
+            'key': self.key,
+            'summary': self.summary,
+            'status': self.status,
+            'created': self.created,
+            'description': self.description,
+            'assignee': self.assignee,
+            'reporter': self.reporter,
+            'fixVersions': list(self.fix_versions)
+        }
+
+
+@dataclass(slots=True, frozen=True)
+class TestCase:
+    __test__ = False  # not a pytest test class
+
+    class_name: str
+    name: str
+    error_details: str
+    stack_trace: str
+    configuration: Optional[str] = None
+
+    @property
+    def api(self) -> str:
+        if self.class_name and self.name:
+            return f"{self.class_name}.{self.name}"
+        return self.class_name or self.name
+
+    def as_failure(self) -> Dict[str, Any]:
+        """The failed test shape returned by the tests triaging tools"""
+        failure = {
+            "api": self.api,
+            "error_details": self.error_details,
+            "stack_trace": self.stack_trace
+        }
+        if self.configuration:
+            failure["configuration"] = self.configuration
+        return failure
+
+
+@dataclass(slots=True, frozen=True)
+class Commit:
+    hash: str
+    message: str
+    task_url: Optional[str]
+
+    @classmethod
+    def from_gitiles(cls, entry: Dict[str, Any]) -> "Commit":
+        """Decode a commit of a Gitiles log, linking the Jira task named in its subject"""
+        message = entry.get('message', '').split('\n')[0]
+        task_match = TASK_KEY_PATTERN.search(message)
+        return cls(
+            hash=entry.get('commit', '')[:8],
+            message=message,
+            task_url=f'{JIRA_BROWSE_URL}/{task_match.group(1)}' if task_match else None
+        )
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'hash': self.hash,
+            'message': self.message,
+            'task_url': self.task_url
+        }
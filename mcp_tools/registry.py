@@ -0,0 +1,114 @@
+"""
+Lazy registration of the assistant tools on the combined server.
+
+The names, descriptions and parameter schemas of all tools are declared up front in
+tool_manifest.json, so the server can list its tools right after start-up without
+importing the assistant modules (and requests, dotenv and their pydantic models).
+An assistant module is imported on the first call of one of its tools, and the call
+is delegated to the tool as registered on that module's own FastMCP instance.
+
+The manifest is generated from the modules; regenerate it after adding or changing
+a tool with: python -m mcp_tools.registry
+"""
+import asyncio
+import importlib
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+from fastmcp.exceptions import ToolError
+from fastmcp.tools.base import Tool
+from pydantic import PrivateAttr
+
+ASSISTANT_MODULES = [
+    "mcp_tools.version_support_assistant",
+    "mcp_tools.tests_triaging_assistant",
+    "mcp_tools.release_signoff_assistant",
+]
+
+MANIFEST_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tool_manifest.json")
+
+
+def _not_loaded(**kwargs):
+    raise RuntimeError("Lazy tools are run through LazyTool.run")
+
+
+class LazyTool(Tool):
+    """A tool declared by the manifest whose module is imported on first call"""
+    module: str
+    fn: Any = _not_loaded
+    is_async: bool = True
+
+    _target: Optional[Tool] = PrivateAttr(default=None)
+
+    def load(self) -> Tool:
+        """Import the tool's module and return the tool registered there"""
+        if self._target is None:
+            mcp = importlib.import_module(self.module).mcp
+            target = mcp._tool_manager.get_tool(self.name)
+            if target is None:
+                raise RuntimeError(f"{self.module} does not define tool {self.name}; regenerate the manifest")
+            self._target = target
+        return self._target
+
+    async def run(self, arguments: dict, context=None) -> Any:
+        target = self.load()
+        if target.is_async:
+            return await target.run(arguments, context=context)
+        # Blocking tools run in a worker thread, so they neither stall other sessions
+        # nor wait for outbound capacity on the event loop
+        return await asyncio.to_thread(_run_blocking, target, arguments, context)
+
+
+def _run_blocking(tool: Tool, arguments: dict, context=None) -> Any:
+    """Tool.run for a synchronous tool, callable from a worker thread"""
+    if tool.context_kwarg:
+        arguments[tool.context_kwarg] = context
+    try:
+        return tool.fn(**arguments)
+    except Exception as e:
+        raise ToolError(f"Error executing tool {tool.name}: {e}") from e
+
+
+def build_manifest(modules: List[str] = ASSISTANT_MODULES) -> List[Dict[str, Any]]:
+    """Describe every tool of the assistant modules; imports them all"""
+    manifest = []
+    seen = {}
+    for module_name in modules:
+        mcp = importlib.import_module(module_name).mcp
+        for tool in mcp._tool_manager.list_tools():
+            if tool.name in seen:
+                raise ValueError(f"Tool {tool.name} is defined by both {seen[tool.name]} and {module_name}")
+            seen[tool.name] = module_name
+            manifest.append({
+                "name": tool.name,
+                "module": module_name,
+                "description": tool.description,
+                "parameters": tool.parameters,
+                "context_kwarg": tool.context_kwarg
+            })
+    return manifest
+
+
+def load_manifest(path: str = MANIFEST_PATH) -> List[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as manifest_file:
+        return json.load(manifest_file)
+
+
+def write_manifest(path: str = MANIFEST_PATH) -> int:
+    manifest = build_manifest()
+    with open(path, "w", encoding="utf-8") as manifest_file:
+        json.dump(manifest, manifest_file, indent=2, ensure_ascii=False)
+        manifest_file.write("\n")
+    return len(manifest)
+
+
+def register_lazy_tools(server, path: str = MANIFEST_PATH) -> None:
+    """Register every tool of the manifest on server without importing its module"""
+    for entry in load_manifest(path):
+        server._tool_manager._tools[entry["name"]] = LazyTool(**entry)
+
+
+if __name__ == "__main__":
+    count = write_manifest()
+    print(f"Wrote {count} tools to {MANIFEST_PATH}")
@@ -1,28 +1,69 @@
-import os
+import asyncio
+import re
+import time
 import requests
-from typing import List, Dict, Any, Optional
+from functools import partial
+from http.cookiejar import DefaultCookiePolicy
+from typing import List, Dict, Any, Literal, Optional
 from pydantic import BaseModel
 from dotenv import load_dotenv
-from fastmcp import FastMCP
+from fastmcp import Context, FastMCP
+
+from mcp_tools import adf
+from mcp_tools.cache import LRUCache
+from mcp_tools.codec import decode_response, decode_xssi_response
+from mcp_tools.credentials import getenv
+from mcp_tools.jira_writes import WriteStep, changed_fields, execute_issue_write, succeeded
+from mcp_tools.outbound import outbound
+from mcp_tools.pagination import Page, result_buffer
+from mcp_tools.prefetch import warm_results
+from mcp_tools.progress import ProgressReporter
+from mcp_tools.records import Commit, Issue
+from mcp_tools.snapshot import snapshots
+from mcp_tools.ticket_watch import changes_query, take_changes, ticket_watch
 
 load_dotenv()
 
 mcp = FastMCP("release-signoff-assistant")
 
+# One connection pool for the Jira, Jenkins and Gitiles requests of every call. Auth is
+# sent per request and no cookies are kept, since all sessions' calls share it
+http_session = requests.Session()
+http_session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+# Rendered descriptions by (Jira URL, ticket key, updated timestamp); an edit changes
+# the key, so entries never go stale and are kept across restarts
+_markdown_cache = snapshots.register("release_signoff.markdown", LRUCache(maxsize=256), version=2)
+
 # -----------------------------
 # Schemas
 # -----------------------------
+# "compact" replaces the raw ADF description with extracted fields and a digest,
+# "markdown" returns the description rendered as Markdown, "full" the raw ADF. The
+# fetch tools default to "full", their output before the modes existed
+OutputMode = Literal["compact", "markdown", "full"]
 
 class FetchReleaseTicketsRequest(BaseModel):
     status: Optional[str] = None
     limit: Optional[int] = 50
     hours_back: Optional[int] = None
+    output_mode: OutputMode = "full"
+    cursor: Optional[str] = None
+
+class WatchReleaseTicketsRequest(BaseModel):
+    status: Optional[str] = None
+    limit: Optional[int] = 50
+    since_hours: Optional[int] = 24
+    output_mode: OutputMode = "compact"
+    reset: bool = False
 
 class FetchTicketRequest(BaseModel):
     ticket_key: str
+    output_mode: OutputMode = "full"
 
 class FetchPreviousVersionTicketRequest(BaseModel):
     current_version: str
+    output_mode: OutputMode = "full"
 
 class UpdateTicketWithPreviousVersionsRequest(BaseModel):
     current_version: str
@@ -38,38 +79,45 @@ class UpdateTicketStatusRequest(BaseModel):
     status: str = "Approved"
     label: str = "Denim"
 
+class ScanConsoleVersionsRequest(BaseModel):
+    build_url: str
+    max_wait_seconds: int = 0
+
 # -----------------------------
 # Jira Client
 # -----------------------------
 
 class JiraClient:
     def __init__(self):
-        self.base_url = os.getenv('JIRA_URL')
-        self.username = os.getenv('JIRA_USER')
-        self.token = os.getenv('JIRA_TOKEN')
+        self.base_url = getenv('JIRA_URL')
+        self.username = getenv('JIRA_USER')
+        self.token = getenv('JIRA_TOKEN')
 
         if not all([self.base_url, self.username, self.token]):
             raise ValueError("Missing Jira credentials. Please set JIRA_URL, JIRA_USER, and JIRA_TOKEN in .env")
 
-    def search_tickets(self, jql: str, max_results: int = 50) -> Dict[str, Any]:
-        """Search Jira tickets using JQL"""
+    def search_tickets(self, jql: str, max_results: int = 50, next_page_token: Optional[str] = None) -> Dict[str, Any]:
+        """Search Jira tickets using JQL; next_page_token is the one of the previous page"""
         url = f"{self.base_url}/rest/api/3/search/jql"
 
         params = {
             'jql': jql,
             'maxResults': max_results,
-            'fields': 'key,summary,status,created,description,assignee,reporter,fixVersions'
+            'fields': 'key,summary,status,created,updated,description,assignee,reporter,fixVersions'
         }
+        if next_page_token:
+            params['nextPageToken'] = next_page_token
 
-        response = requests.get(
-            url,
-            params=params,
-            auth=(self.username, self.token),
-            headers={'Accept': 'application/json'}
-        )
+        with outbound.gate(url):
+            response = http_session.get(
+                url,
+                params=params,
+                auth=(self.username, self.token),
+                headers={'Accept': 'application/json'}
+            )
 
         if response.status_code == 200:
-            return response.json()
+            return decode_response(response)
         else:
             raise Exception(f"Jira API error: {response.status_code} - {response.text}")
 
@@ -78,25 +126,51 @@ class JiraClient:
         url = f"{self.base_url}/rest/api/3/issue/{ticket_key}"
 
         params = {
-            'fields': 'key,summary,status,created,description,assignee,reporter,fixVersions'
+            'fields': 'key,summary,status,created,updated,description,assignee,reporter,fixVersions'
         }
 
-        response = requests.get(
-            url,
-            params=params,
-            auth=(self.username, self.token),
-            headers={'Accept': 'application/json'}
-        )
+        with outbound.gate(url):
+            response = http_session.get(
+                url,
+                params=params,
+                auth=(self.username, self.token),
+                headers={'Accept': 'application/json'}
+            )
 
         if response.status_code == 200:
-            return response.json()
+            return decode_response(response)
         else:
             raise Exception(f"Jira API error: {response.status_code} - {response.text}")
 
-    def update_ticket(self, ticket_key: str, description: Dict[str, Any] = None, status: str = None, labels: List[str] = None, assignee: str = None) -> Dict[str, Any]:
-        """Update a ticket's description, status, labels, and assignee"""
-        url = f"{self.base_url}/rest/api/3/issue/{ticket_key}"
+    def get_transition_id(self, ticket_key: str, status: str) -> str:
+        """Find the id of the transition that moves a ticket to the given status"""
+        transitions_url = f"{self.base_url}/rest/api/3/issue/{ticket_key}/transitions"
+
+        with outbound.gate(transitions_url):
+            trans_response = http_session.get(
+                transitions_url,
+                auth=(self.username, self.token),
+                headers={'Accept': 'application/json'}
+            )
+
+        if trans_response.status_code != 200:
+            raise Exception(f"Failed to get transitions: {trans_response.status_code}")
 
+        transitions = decode_response(trans_response).get('transitions', [])
+
+        for transition in transitions:
+            if transition['to']['name'].lower() == status.lower():
+                return transition['id']
+
+        available = [t['to']['name'] for t in transitions]
+        raise Exception(f"No transition to {status}. Available: {available}")
+
+    def update_ticket(self, ticket_key: str, description: Dict[str, Any] = None, status: str = None, labels: List[str] = None, assignee: str = None, current_fields: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Update a ticket's description, status, labels, and assignee.
+        When the ticket's current fields are given, unchanged fields and a transition
+        to the status it already has are skipped.
+        """
         # Build fields payload
         fields = {}
         if description:
@@ -106,115 +180,277 @@ class JiraClient:
         if assignee:
             fields["assignee"] = {"emailAddress": assignee}
 
-        # Update fields if any
-        if fields:
-            payload = {"fields": fields}
-            response = requests.put(
-                url,
-                json=payload,
-                auth=(self.username, self.token),
-                headers={'Accept': 'application/json', 'Content-Type': 'application/json'}
-            )
+        if current_fields is not None:
+            fields = changed_fields(current_fields, fields)
+            current_status = (current_fields.get('status') or {}).get('name', '')
+            if status and current_status.lower() == status.lower():
+                status = None
 
-            if response.status_code != 204:
-                raise Exception(f"Jira field update error: {response.status_code} - {response.text}")
+        # Resolve the transition first so field changes can be sent along with it
+        transition_id = self.get_transition_id(ticket_key, status) if status else None
 
-        # Handle status transition if requested
-        if status:
-            transitions_url = f"{url}/transitions"
+        executed = execute_issue_write(
+            partial(send_jira_write, self.base_url, (self.username, self.token)),
+            ticket_key,
+            fields=fields,
+            transition_id=transition_id
+        )
 
-            # Get available transitions
-            trans_response = requests.get(
-                transitions_url,
-                auth=(self.username, self.token),
-                headers={'Accept': 'application/json'}
-            )
+        for step, response in executed:
+            if not succeeded(response):
+                if step.is_transition and 'fields' not in step.payload:
+                    raise Exception(f"Transition failed: {response.status_code}")
+                raise Exception(f"Jira field update error: {response.status_code} - {response.text}")
 
-            if trans_response.status_code != 200:
-                raise Exception(f"Failed to get transitions: {trans_response.status_code}")
+        drop_prefetched_searches()
+        return {'success': True, 'requests_sent': len(executed)}
 
-            transitions = trans_response.json().get('transitions', [])
 
-            # Find transition ID
-            transition_id = None
-            for transition in transitions:
-                if transition['to']['name'].lower() == status.lower():
-                    transition_id = transition['id']
-                    break
+def drop_prefetched_searches() -> None:
+    """Forget prefetched sign-off searches after a write, which may have changed their results"""
+    warm_results.discard(lambda key: key[0] == 'release_signoff_tickets')
 
-            if not transition_id:
-                available = [t['to']['name'] for t in transitions]
-                raise Exception(f"No transition to {status}. Available: {available}")
 
-            # Execute transition
-            transition_payload = {"transition": {"id": transition_id}}
-            trans_exec_response = requests.post(
-                transitions_url,
-                json=transition_payload,
-                auth=(self.username, self.token),
-                headers={'Accept': 'application/json', 'Content-Type': 'application/json'}
-            )
-
-            if trans_exec_response.status_code != 204:
-                raise Exception(f"Transition failed: {trans_exec_response.status_code}")
-
-        return {'success': True}
+def send_jira_write(base_url: str, auth: tuple, step: WriteStep) -> requests.Response:
+    """Send a planned Jira write step"""
+    send = http_session.put if step.method == 'PUT' else http_session.post
+    url = f"{base_url}{step.path}"
+    with outbound.gate(url):
+        return send(
+            url,
+            json=step.payload,
+            auth=auth,
+            headers={'Accept': 'application/json', 'Content-Type': 'application/json'}
+        )
 
 # -----------------------------
 # Helper Functions
 # -----------------------------
 
+# Versions published by CI look like 25.3.0.20250904-1757
+VERSION_PATTERN = r'\d+\.\d+\.\d+\.\d{8}-\d{4}'
+
+# Labels in sign-off descriptions and the version each one introduces
+DESCRIPTION_VERSION_LABELS = {
+    'Platform Version': 'current_platform_version',
+    'Current Connector Version': 'current_connector_version',
+    'Current SDK Version': 'current_sdk_version',
+    'Previous Connector Version': 'previous_connector_version',
+    'Previous SDK Version': 'previous_sdk_version'
+}
+
+# A label or a version; finditer yields them in the order they appear in the text
+DESCRIPTION_TOKEN_PATTERN = re.compile(
+    '(?P<label>' + '|'.join(re.escape(label) for label in DESCRIPTION_VERSION_LABELS) + ')'
+    f'|(?P<version>{VERSION_PATTERN})'
+)
+
+
 def extract_versions_from_description(description: Any) -> Dict[str, str]:
-    """Extract connector, SDK, and platform versions from ticket description"""
+    """
+    Extract connector, SDK, and platform versions from ticket description.
+
+    A single pass over the document: each label sets the version expected next, and
+    the next version found in the same block is assigned to it. A ticket that only
+    lists previous versions reports them as the current ones as well.
+    """
     versions = {
         'current_connector_version': None,
         'current_sdk_version': None,
-        'current_platform_version': None
+        'current_platform_version': None,
+        'previous_connector_version': None,
+        'previous_sdk_version': None
     }
 
     if not description or not isinstance(description, dict):
         return versions
 
-    # Navigate through the description structure to find version info
-    content = description.get('content', [])
-    for paragraph in content:
-        if paragraph.get('type') == 'paragraph':
-            paragraph_content = paragraph.get('content', [])
-            
-            # Look through all text elements in this paragraph
-            for i, item in enumerate(paragraph_content):
-                if item.get('type') == 'text':
-                    text = item.get('text', '').strip()
-                    marks = item.get('marks', [])
-                    
-                    # Check if this is a version number (has code formatting and looks like a version)
-                    if any(mark.get('type') == 'code' for mark in marks) and '.' in text and len(text) > 10:
-                        # Look backwards to see what this version is for
-                        for j in range(i - 1, -1, -1):
-                            prev_item = paragraph_content[j]
-                            if prev_item.get('type') == 'text':
-                                prev_text = prev_item.get('text', '').strip()
-                                if 'Platform Version' in prev_text:
-                                    versions['current_platform_version'] = text
-                                    break
-                                elif 'Current Connector Version' in prev_text:
-                                    versions['current_connector_version'] = text
-                                    break
-                                elif 'Current SDK Version' in prev_text:
-                                    versions['current_sdk_version'] = text
-                                    break
-                                elif 'Previous Connector Version' in prev_text:
-                                    if not versions['current_connector_version']:
-                                        versions['current_connector_version'] = text
-                                    break
-                                elif 'Previous SDK Version' in prev_text:
-                                    if not versions['current_sdk_version']:
-                                        versions['current_sdk_version'] = text
-                                    break
+    expected = None
+    for node in adf.walk(description):
+        if node.get('type') != 'text':
+            # A label only applies within its own paragraph (or other block)
+            if 'content' in node:
+                expected = None
+            continue
+
+        for match in DESCRIPTION_TOKEN_PATTERN.finditer(node.get('text', '')):
+            if match.lastgroup == 'label':
+                expected = DESCRIPTION_VERSION_LABELS[match.group('label')]
+            elif expected:
+                versions[expected] = match.group('version')
+                expected = None
+
+    versions['current_connector_version'] = versions['current_connector_version'] or versions['previous_connector_version']
+    versions['current_sdk_version'] = versions['current_sdk_version'] or versions['previous_sdk_version']
 
     return versions
 
 
+def extract_inline_card_urls(description: Any) -> set:
+    """Collect the URLs of all inline cards in a ticket description"""
+    return {
+        node.get('attrs', {}).get('url')
+        for node in adf.walk(description)
+        if node.get('type') == 'inlineCard' and node.get('attrs', {}).get('url')
+    }
+
+
+def append_to_description(description: Any, node: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a copy of an ADF description with node appended, leaving the original untouched"""
+    if isinstance(description, dict) and 'content' in description:
+        return {**description, 'content': description['content'] + [node]}
+    return {
+        "type": "doc",
+        "version": 1,
+        "content": [node]
+    }
+
+
+def description_markdown(issue: Issue) -> str:
+    """Render a ticket description as Markdown, reusing the result until the ticket is updated"""
+    if not issue.updated:
+        return adf.to_markdown(issue.description)
+
+    # HTTP sessions may point at different Jira sites, which reuse ticket keys
+    cache_key = (getenv('JIRA_URL'), issue.key, issue.updated)
+    markdown = _markdown_cache.get(cache_key)
+    if markdown is None:
+        markdown = adf.to_markdown(issue.description)
+        _markdown_cache.set(cache_key, markdown)
+    return markdown
+
+
+def tickets_page(page: Page) -> Dict[str, Any]:
+    """The fetch_release_signoff_tickets result for one page of tickets"""
+    return {
+        'success': True,
+        'total': page.meta['total'],
+        'returned': len(page.items),
+        'tickets': page.items,
+        'query': page.meta['query'],
+        'next_cursor': page.next_cursor,
+        'remaining': page.remaining
+    }
+
+
+def ticket_output(issue: Issue, output_mode: str = "full") -> Dict[str, Any]:
+    """
+    Shape a ticket for a tool result. Compact output drops the raw ADF description in
+    favour of the versions and release notes link found in it and a digest of it.
+    """
+    ticket = issue.as_ticket()
+    if output_mode == "full":
+        return ticket
+    if output_mode == "markdown":
+        ticket['description'] = description_markdown(issue)
+        return ticket
+
+    del ticket['description']
+    ticket['versions'] = {
+        name: version
+        for name, version in extract_versions_from_description(issue.description).items()
+        if version
+    }
+    ticket['release_notes_url'] = adf.word_after(issue.description, "Release Information:")
+    ticket['description_digest'] = adf.digest(issue.description)
+    return ticket
+
+
+def previous_versions_paragraph(connector_version: str, sdk_version: str) -> Dict[str, Any]:
+    return adf.paragraph(
+        adf.hard_break(),
+        adf.text("Previous Connector Version: ", "strong"),
+        adf.text(connector_version, "code"),
+        adf.hard_break(),
+        adf.text("Previous SDK Version: ", "strong"),
+        adf.text(sdk_version, "code")
+    )
+
+
+def related_tickets_paragraph(task_urls: List[str]) -> Dict[str, Any]:
+    """One Jira inline link per related task"""
+    content = [adf.hard_break(), adf.text("Related tickets:", "strong"), adf.hard_break()]
+    for task_url in task_urls:
+        content.extend([adf.text("• "), adf.inline_card(task_url), adf.text(" "), adf.hard_break()])
+    return adf.paragraph(*content)
+
+
+# Maven coordinates or artifact paths followed by the version in build logs
+CONSOLE_VERSION_PATTERNS = {
+    'current_connector_version': re.compile(rb'com[./]tasktop[./]connector\S{0,200}?[\s:/=@_-]+v?(' + VERSION_PATTERN.encode() + rb')'),
+    'current_sdk_version': re.compile(rb'com[./]tasktop[./]sdk\S{0,200}?[\s:/=@_-]+v?(' + VERSION_PATTERN.encode() + rb')')
+}
+
+CONSOLE_CHUNK_SIZE = 64 * 1024
+CONSOLE_MAX_LINE_BYTES = 64 * 1024
+CONSOLE_POLL_INTERVAL = 5
+
+
+def scan_console_for_versions(build_url: str, auth: tuple, max_wait_seconds: int = 0) -> Dict[str, Any]:
+    """
+    Stream a Jenkins build console through logText/progressiveText and pick out
+    connector and SDK versions. Lines are scanned as they arrive and the download
+    stops as soon as every version is found, so the log is never held in memory.
+    """
+    found = {name: None for name in CONSOLE_VERSION_PATTERNS}
+    remaining = dict(CONSOLE_VERSION_PATTERNS)
+    progressive_url = f"{build_url.rstrip('/')}/logText/progressiveText"
+    deadline = time.monotonic() + max_wait_seconds
+    start = 0
+    bytes_scanned = 0
+    pending = b''
+    more_data = False
+
+    def scan_line(line: bytes):
+        for name, pattern in list(remaining.items()):
+            match = pattern.search(line)
+            if match:
+                found[name] = match.group(1).decode('ascii')
+                del remaining[name]
+
+    while remaining:
+        # The slot is held while the console streams
+        with outbound.gate(progressive_url), http_session.get(
+            progressive_url,
+            params={'start': start},
+            auth=auth,
+            stream=True,
+            timeout=30
+        ) as response:
+            if response.status_code != 200:
+                raise Exception(f"Jenkins console error: {response.status_code}")
+
+            received = 0
+            for chunk in response.iter_content(chunk_size=CONSOLE_CHUNK_SIZE):
+                received += len(chunk)
+                lines = (pending + chunk).split(b'\n')
+                # Keep the unterminated tail for the next chunk, bounded in size
+                pending = lines.pop()[-CONSOLE_MAX_LINE_BYTES:]
+                for line in lines:
+                    scan_line(line)
+                if not remaining:
+                    break
+
+            bytes_scanned += received
+            next_start = int(response.headers.get('X-Text-Size', start + received))
+            more_data = response.headers.get('X-More-Data', '').lower() == 'true'
+
+        if not remaining or not more_data or time.monotonic() >= deadline:
+            break
+        if next_start <= start:
+            time.sleep(CONSOLE_POLL_INTERVAL)
+        start = next_start
+
+    if remaining and pending:
+        scan_line(pending)
+
+    return {
+        **found,
+        'bytes_scanned': bytes_scanned,
+        'build_running': more_data
+    }
+
+
 # -----------------------------
 # MCP Tool Implementation
 # -----------------------------
@@ -228,11 +464,16 @@ def fetch_release_signoff_tickets(request: FetchReleaseTicketsRequest) -> Dict[s
         status: Filter by ticket status (optional)
         limit: Maximum number of tickets to return (default: 50)
         hours_back: Only fetch tickets created in the last N hours (optional)
+        output_mode: "full" (default) for the raw ADF description, "compact" for extracted versions and a description digest, "markdown" for the description as Markdown
+        cursor: next_cursor of a previous call, to get the next page of its results (other arguments are ignored)
 
     Returns:
-        Dictionary containing the fetched tickets and metadata
+        Dictionary containing the fetched tickets and metadata; next_cursor is set when more pages remain
     """
     try:
+        if request.cursor:
+            return tickets_page(result_buffer.next_page('release_signoff_tickets', request.cursor))
+
         jira_client = JiraClient()
 
         # Build JQL query for Release Sign-Off tickets
@@ -252,30 +493,91 @@ def fetch_release_signoff_tickets(request: FetchReleaseTicketsRequest) -> Dict[s
         # Order by created date (newest first)
         jql = ' AND '.join(jql_parts) + ' ORDER BY created DESC'
 
-        # Search tickets
-        result = jira_client.search_tickets(jql, request.limit)
+        # Search tickets; open sign-off tickets are usually prefetched
+        warm_key = ('release_signoff_tickets', jira_client.base_url, jira_client.username, jql, request.limit)
+        result = warm_results.get(warm_key)
+        if result is None:
+            result = jira_client.search_tickets(jql, request.limit)
+            warm_results.put(warm_key, result)
 
         # Format response
-        tickets = []
-        for issue in result.get('issues', []):
-            ticket = {
-                'key': issue['key'],
-                'summary': issue['fields']['summary'],
-                'status': issue['fields']['status']['name'],
-                'created': issue['fields']['created'],
-                'description': issue['fields'].get('description', ''),
-                'assignee': issue['fields']['assignee']['displayName'] if issue['fields'].get('assignee') else None,
-                'reporter': issue['fields']['reporter']['displayName'] if issue['fields'].get('reporter') else None,
-                'fixVersions': [v['name'] for v in issue['fields'].get('fixVersions', [])]
-            }
-            tickets.append(ticket)
+        issues = [Issue.from_json(issue) for issue in result.get('issues', [])]
+        tickets = [ticket_output(issue, request.output_mode) for issue in issues]
+
+        # Large results come back a page at a time; the rest is served from the buffer
+        meta = {'total': result.get('total', 0), 'query': jql}
+        return tickets_page(result_buffer.paginate('release_signoff_tickets', tickets, meta))
+
+    except Exception as e:
+        return {
+            'success': False,
+            'error': str(e),
+            'tickets': []
+        }
+
+@mcp.tool()
+def watch_release_signoff_tickets(request: WatchReleaseTicketsRequest) -> Dict[str, Any]:
+    """
+    Fetch the release sign-off tickets created or updated since the previous call.
+
+    Each call asks Jira only for tickets updated after the latest one it returned and
+    reports every change once; the position is kept across server restarts, separately
+    per Jira user and status filter.
+
+    Args:
+        status: Filter by ticket status (optional)
+        limit: Maximum number of tickets to return (default: 50); call again while more is true
+        since_hours: How far back the first call (or the first after a reset) looks (default: 24)
+        output_mode: "compact" (default) for extracted versions and a description digest, "markdown" for the description as Markdown, "full" for the raw ADF description
+        reset: Forget the position and start over from since_hours back
+
+    Returns:
+        Dictionary containing the new and changed tickets, each with change ("created" or "updated") and its updated timestamp
+    """
+    try:
+        jira_client = JiraClient()
+        limit = request.limit or 50
+        since_hours = request.since_hours or 24
+
+        jql = 'issuetype = "Release Sign-Off"'
+        if request.status:
+            jql += f' AND status = "{request.status}"'
+
+        name = f"release_signoff {jira_client.base_url} {jira_client.username} {request.status or '*'}"
+        if request.reset:
+            ticket_watch.reset(name)
+
+        # The output is built before the state is saved, so the tickets of a call that
+        # fails are reported again by the next one
+        with ticket_watch.watching(name) as state:
+            query = changes_query(jql, state, since_hours)
+            page_token = None
+            while True:
+                result = jira_client.search_tickets(query, limit, page_token)
+                issues = result.get('issues', [])
+                changes = take_changes(state, issues, since_hours)
+                page_token = result.get('nextPageToken')
+                # After a bulk edit, the tickets of the watermark's minute returned before
+                # can fill whole pages; page past them to the first change
+                if changes or len(issues) < limit or not page_token:
+                    break
+
+            tickets = []
+            for change in changes:
+                issue = Issue.from_json(change.issue)
+                ticket = ticket_output(issue, request.output_mode)
+                ticket['change'] = change.kind
+                ticket['updated'] = issue.updated
+                tickets.append(ticket)
 
         return {
             'success': True,
-            'total': result.get('total', 0),
             'returned': len(tickets),
             'tickets': tickets,
-            'query': jql
+            'watermark': state.watermark,
+            'query': query,
+            # A full page may have left changes for the next call
+            'more': len(issues) >= limit
         }
 
     except Exception as e:
@@ -292,6 +594,7 @@ def fetch_ticket(request: FetchTicketRequest) -> Dict[str, Any]:
 
     Args:
         ticket_key: The Jira ticket key (e.g., CON-25671)
+        output_mode: "full" (default) for the raw ADF description, "compact" for extracted versions and a description digest, "markdown" for the description as Markdown
 
     Returns:
         Dictionary containing the ticket details
@@ -300,23 +603,11 @@ def fetch_ticket(request: FetchTicketRequest) -> Dict[str, Any]:
         jira_client = JiraClient()
 
         # Get the specific ticket
-        issue = jira_client.get_ticket(request.ticket_key)
-
-        # Format response
-        ticket = {
-            'key': issue['key'],
-            'summary': issue['fields']['summary'],
-            'status': issue['fields']['status']['name'],
-            'created': issue['fields']['created'],
-            'description': issue['fields'].get('description', ''),
-            'assignee': issue['fields']['assignee']['displayName'] if issue['fields'].get('assignee') else None,
-            'reporter': issue['fields']['reporter']['displayName'] if issue['fields'].get('reporter') else None,
-            'fixVersions': [v['name'] for v in issue['fields'].get('fixVersions', [])]
-        }
+        issue = Issue.from_json(jira_client.get_ticket(request.ticket_key))
 
         return {
             'success': True,
-            'ticket': ticket
+            'ticket': ticket_output(issue, request.output_mode)
         }
 
     except Exception as e:
@@ -333,6 +624,7 @@ def fetch_previous_version_ticket(request: FetchPreviousVersionTicketRequest) ->
 
     Args:
         current_version: Current version (e.g., "25.3.4") to find previous version ticket
+        output_mode: "full" (default) for the raw ADF description, "compact" for extracted versions and a description digest, "markdown" for the description as Markdown
 
     Returns:
         Dictionary containing the previous version ticket details
@@ -366,25 +658,13 @@ def fetch_previous_version_ticket(request: FetchPreviousVersionTicketRequest) ->
         result = jira_client.search_tickets(jql, 1)
 
         if result.get('issues'):
-            issue = result['issues'][0]
-            description = issue['fields'].get('description', '')
-            versions = extract_versions_from_description(description)
-
-            ticket = {
-                'key': issue['key'],
-                'summary': issue['fields']['summary'],
-                'status': issue['fields']['status']['name'],
-                'created': issue['fields']['created'],
-                'description': description,
-                'assignee': issue['fields']['assignee']['displayName'] if issue['fields'].get('assignee') else None,
-                'reporter': issue['fields']['reporter']['displayName'] if issue['fields'].get('reporter') else None,
-                'fixVersions': [v['name'] for v in issue['fields'].get('fixVersions', [])]
-            }
+            issue = Issue.from_json(result['issues'][0])
+            versions = extract_versions_from_description(issue.description)
 
             return {
                 'success': True,
                 'previous_version': previous_version,
-                'ticket': ticket,
+                'ticket': ticket_output(issue, request.output_mode),
                 'current_connector_version': versions['current_connector_version'],
                 'current_sdk_version': versions['current_sdk_version']
             }
@@ -468,31 +748,32 @@ def update_ticket_with_previous_versions(request: UpdateTicketWithPreviousVersio
                 'error': 'Could not extract connector and SDK versions from previous ticket'
             }
 
-        # Create new paragraph with previous versions
-        new_paragraph = {
-            "type": "paragraph",
-            "content": [
-                {"type": "hardBreak"},
-                {"type": "text", "text": "Previous Connector Version: ", "marks": [{"type": "strong"}]},
-                {"type": "text", "text": versions['current_connector_version'], "marks": [{"type": "code"}]},
-                {"type": "hardBreak"},
-                {"type": "text", "text": "Previous SDK Version: ", "marks": [{"type": "strong"}]},
-                {"type": "text", "text": versions['current_sdk_version'], "marks": [{"type": "code"}]}
-            ]
-        }
-
-        # Update description
-        if isinstance(current_description, dict) and 'content' in current_description:
-            current_description['content'].append(new_paragraph)
-        else:
-            current_description = {
-                "type": "doc",
-                "version": 1,
-                "content": [new_paragraph]
+        # Nothing to do when an earlier run already recorded these versions
+        existing_versions = extract_versions_from_description(current_description)
+        if (existing_versions['previous_connector_version'] == versions['current_connector_version']
+                and existing_versions['previous_sdk_version'] == versions['current_sdk_version']):
+            return {
+                'success': True,
+                'ticket_key': current_key,
+                'previous_version': previous_version,
+                'added_connector_version': versions['current_connector_version'],
+                'added_sdk_version': versions['current_sdk_version'],
+                'skipped': True,
+                'reason': 'Previous versions are already in the ticket description'
             }
 
+        # Create new paragraph with previous versions
+        new_paragraph = previous_versions_paragraph(
+            versions['current_connector_version'],
+            versions['current_sdk_version']
+        )
+
         # Update the ticket
-        jira_client.update_ticket(current_key, current_description)
+        jira_client.update_ticket(
+            current_key,
+            append_to_description(current_description, new_paragraph),
+            current_fields=current_ticket['fields']
+        )
 
         return {
             'success': True,
@@ -582,8 +863,8 @@ def get_commits_between_tags(request: GetCommitsBetweenTagsRequest) -> Dict[str,
         git_branch = f"{version_parts[0]}.{version_parts[1]}.x"
 
         # Git repository URL with credentials
-        git_username = os.getenv('GIT_USER_NAME', 'divyangi.mayank')
-        git_password = os.getenv('GIT_PASSWORD')
+        git_username = getenv('GIT_USER_NAME', 'divyangi.mayank')
+        git_password = getenv('GIT_PASSWORD')
 
         if not git_password:
             return {
@@ -599,8 +880,8 @@ def get_commits_between_tags(request: GetCommitsBetweenTagsRequest) -> Dict[str,
         # Use Gerrit REST API with timeout and fallback
         import urllib.parse
 
-        git_username = os.getenv('GIT_USER_NAME', 'divyangi.mayank')
-        git_password = os.getenv('GIT_PASSWORD')
+        git_username = getenv('GIT_USER_NAME', 'divyangi.mayank')
+        git_password = getenv('GIT_PASSWORD')
 
         try:
             # Use Gitiles API for commit log
@@ -608,44 +889,23 @@ def get_commits_between_tags(request: GetCommitsBetweenTagsRequest) -> Dict[str,
 
             params = {'format': 'JSON'}
 
-            response = requests.get(
-                gitiles_url,
-                params=params,
-                auth=(git_username, git_password),
-                headers={'Accept': 'application/json'},
-                timeout=10
-            )
+            with outbound.gate(gitiles_url):
+                response = http_session.get(
+                    gitiles_url,
+                    params=params,
+                    auth=(git_username, git_password),
+                    headers={'Accept': 'application/json'},
+                    timeout=10
+                )
 
             if response.status_code != 200:
                 raise Exception(f'Gitiles API error: {response.status_code}')
 
             # Parse Gitiles JSON response
-            response_text = response.text
-            if response_text.startswith(")]}'\n"):
-                response_text = response_text[5:]
-
-            import json
-            commit_data = json.loads(response_text)
+            commit_data = decode_xssi_response(response)
 
             # Extract commits from Gitiles response
-            commits = []
-            if 'log' in commit_data:
-                for commit in commit_data['log']:
-                    message = commit.get('message', '').split('\n')[0]
-
-                    # Extract task ID from commit message (e.g., CON-25522)
-                    import re
-                    task_match = re.search(r'(CON-\d+)', message)
-                    task_url = None
-                    if task_match:
-                        task_id = task_match.group(1)
-                        task_url = f'https://tasktop.atlassian.net/browse/{task_id}'
-
-                    commits.append({
-                        'hash': commit.get('commit', '')[:8],
-                        'message': message,
-                        'task_url': task_url
-                    })
+            commits = [Commit.from_gitiles(entry).as_dict() for entry in commit_data.get('log', [])]
 
         except Exception as api_error:
             # Fallback: Return structure with error info
@@ -675,22 +935,52 @@ def get_commits_between_tags(request: GetCommitsBetweenTagsRequest) -> Dict[str,
             'error': str(e)
         }
 
-@mcp.tool()
-def update_ticket_with_task_urls(request: UpdateTicketWithTaskUrlsRequest) -> Dict[str, Any]:
+def check_task_statuses(jira_client: JiraClient, task_urls: List[str], progress=None) -> List[Dict[str, Any]]:
     """
-    Update current release sign-off ticket with related task URLs from commits.
+    Check the Jira status of each linked task, once per task, and return the ones
+    that are not done. progress(done, total, message, partial) is called per task.
+    """
+    incomplete_tasks = []
+    unique_urls = list(dict.fromkeys(task_urls))
 
-    Args:
-        current_version: Current version (e.g., "25.3.4") to find and update the ticket
+    for done, task_url in enumerate(unique_urls, start=1):
+        task_id = task_url.split('/')[-1]
+        incomplete = None
+        try:
+            task_ticket = jira_client.get_ticket(task_id)
+            task_status = task_ticket['fields']['status']['name']
+
+            if task_status.lower() not in ['done', 'closed', 'resolved', 'complete', 'completed']:
+                incomplete = {
+                    'task_id': task_id,
+                    'status': task_status,
+                    'url': task_url
+                }
+        except Exception as e:
+            task_status = 'ERROR'
+            incomplete = {
+                'task_id': task_id,
+                'status': 'ERROR',
+                'url': task_url,
+                'error': str(e)
+            }
+
+        if incomplete:
+            incomplete_tasks.append(incomplete)
+        if progress:
+            progress(done, len(unique_urls), f'Checked {task_id}: {task_status}', incomplete)
+
+    return incomplete_tasks
 
-    Returns:
-        Dictionary containing the update result
-    """
 
+def link_task_urls(request: UpdateTicketWithTaskUrlsRequest, progress=None) -> Dict[str, Any]:
+    """Body of update_ticket_with_task_urls; runs in a worker thread"""
     jira_client = JiraClient()
 
     try:
         # Get commits between tags first
+        if progress:
+            progress(0, None, f'Fetching commits for {request.current_version}')
         commits_request = GetCommitsBetweenTagsRequest(current_version=request.current_version)
         commits_result = get_commits_between_tags(commits_request)
 
@@ -701,32 +991,7 @@ def update_ticket_with_task_urls(request: UpdateTicketWithTaskUrlsRequest) -> Di
             }
 
         # Extract task URLs and check their status
-        task_urls = []
-        incomplete_tasks = []
-
-        for commit in commits_result.get('commits', []):
-            if commit.get('task_url'):
-                task_urls.append(commit['task_url'])
-
-                # Check task status
-                task_id = commit['task_url'].split('/')[-1]
-                try:
-                    task_ticket = jira_client.get_ticket(task_id)
-                    task_status = task_ticket['fields']['status']['name']
-
-                    if task_status.lower() not in ['done', 'closed', 'resolved', 'complete', 'completed']:
-                        incomplete_tasks.append({
-                            'task_id': task_id,
-                            'status': task_status,
-                            'url': commit['task_url']
-                        })
-                except Exception as e:
-                    incomplete_tasks.append({
-                        'task_id': task_id,
-                        'status': 'ERROR',
-                        'url': commit['task_url'],
-                        'error': str(e)
-                    })
+        task_urls = [commit['task_url'] for commit in commits_result.get('commits', []) if commit.get('task_url')]
 
         if not task_urls:
             return {
@@ -734,8 +999,9 @@ def update_ticket_with_task_urls(request: UpdateTicketWithTaskUrlsRequest) -> Di
                 'error': 'No task URLs found in commits'
             }
 
+        incomplete_tasks = check_task_statuses(jira_client, task_urls, progress)
+
         # Get current ticket
-        jira_client = JiraClient()
         jql = f'issuetype = "Release Sign-Off" AND fixVersion = "{request.current_version}" ORDER BY created DESC'
         result = jira_client.search_tickets(jql, 1)
 
@@ -749,63 +1015,46 @@ def update_ticket_with_task_urls(request: UpdateTicketWithTaskUrlsRequest) -> Di
         current_key = current_ticket['key']
         current_description = current_ticket['fields'].get('description', {})
 
-        # Create related tickets section
-        related_tickets_content = [
-            {"type": "hardBreak"},
-            {"type": "text", "text": "Related tickets:", "marks": [{"type": "strong"}]},
-            {"type": "hardBreak"}
-        ]
-
-        # Add each task URL as Jira inline link
-        for task_url in task_urls:
-            task_id = task_url.split('/')[-1]  # Extract CON-XXXXX from URL
-            related_tickets_content.extend([
-                {"type": "text", "text": "• "},
-                {"type": "inlineCard", "attrs": {"url": task_url}},
-                {"type": "text", "text": " "},
-                {"type": "hardBreak"}
-            ])
-
-        new_paragraph = {
-            "type": "paragraph",
-            "content": related_tickets_content
-        }
+        # Only link tasks that an earlier run has not linked yet
+        linked_urls = extract_inline_card_urls(current_description)
+        new_task_urls = [url for url in dict.fromkeys(task_urls) if url not in linked_urls]
 
-        # Update description
-        if isinstance(current_description, dict) and 'content' in current_description:
-            current_description['content'].append(new_paragraph)
-        else:
-            current_description = {
-                "type": "doc",
-                "version": 1,
-                "content": [new_paragraph]
-            }
+        description = None
+        if new_task_urls:
+            new_paragraph = related_tickets_paragraph(new_task_urls)
+            description = append_to_description(current_description, new_paragraph)
 
         # Update the ticket with description
         if incomplete_tasks:
             # Set to In Progress if tasks are not done
-            jira_client.update_ticket(current_key, current_description, status='In Progress')
+            update_result = jira_client.update_ticket(
+                current_key, description, status='In Progress', current_fields=current_ticket['fields']
+            )
 
             return {
                 'success': True,
                 'ticket_key': current_key,
                 'status_set': 'In Progress',
                 'reason': 'Some related tasks are not completed',
-                'task_urls_added': task_urls,
+                'task_urls_added': new_task_urls,
                 'task_count': len(task_urls),
                 'incomplete_tasks': incomplete_tasks,
-                'warning': f'{len(incomplete_tasks)} tasks are not in Done status'
+                'warning': f'{len(incomplete_tasks)} tasks are not in Done status',
+                'requests_sent': update_result.get('requests_sent', 0)
             }
         else:
             # All tasks are done, just update description
-            jira_client.update_ticket(current_key, current_description)
+            update_result = jira_client.update_ticket(
+                current_key, description, current_fields=current_ticket['fields']
+            )
 
             return {
                 'success': True,
                 'ticket_key': current_key,
-                'task_urls_added': task_urls,
+                'task_urls_added': new_task_urls,
                 'task_count': len(task_urls),
-                'all_tasks_done': True
+                'all_tasks_done': True,
+                'requests_sent': update_result.get('requests_sent', 0)
             }
 
     except Exception as e:
@@ -814,6 +1063,21 @@ def update_ticket_with_task_urls(request: UpdateTicketWithTaskUrlsRequest) -> Di
             'error': str(e)
         }
 
+@mcp.tool()
+async def update_ticket_with_task_urls(request: UpdateTicketWithTaskUrlsRequest, ctx: Context = None) -> Dict[str, Any]:
+    """
+    Update current release sign-off ticket with related task URLs from commits.
+    Reports progress while the status of each related task is checked.
+
+    Args:
+        current_version: Current version (e.g., "25.3.4") to find and update the ticket
+
+    Returns:
+        Dictionary containing the update result
+    """
+    reporter = ProgressReporter(ctx)
+    return await asyncio.to_thread(link_task_urls, request, reporter.threadsafe())
+
 @mcp.tool()
 def update_ticket_status(request: UpdateTicketStatusRequest) -> Dict[str, Any]:
     """
@@ -830,14 +1094,16 @@ def update_ticket_status(request: UpdateTicketStatusRequest) -> Dict[str, Any]:
     try:
         jira_client = JiraClient()
 
-        # Get available transitions
-        transitions_url = f"{jira_client.base_url}/rest/api/3/issue/{request.ticket_key}/transitions"
+        # One read gives the current labels, status and the transitions available from it
+        issue_url = f"{jira_client.base_url}/rest/api/3/issue/{request.ticket_key}"
 
-        response = requests.get(
-            transitions_url,
-            auth=(jira_client.username, jira_client.token),
-            headers={'Accept': 'application/json'}
-        )
+        with outbound.gate(issue_url):
+            response = http_session.get(
+                issue_url,
+                params={'fields': 'labels,status', 'expand': 'transitions'},
+                auth=(jira_client.username, jira_client.token),
+                headers={'Accept': 'application/json'}
+            )
 
         if response.status_code != 200:
             return {
@@ -845,60 +1111,99 @@ def update_ticket_status(request: UpdateTicketStatusRequest) -> Dict[str, Any]:
                 'error': f'Failed to get transitions: {response.status_code} - {response.text}'
             }
 
-        transitions = response.json().get('transitions', [])
+        issue = decode_response(response)
+        current_fields = issue.get('fields') or {}
+        transitions = issue.get('transitions', [])
+
+        fields = changed_fields(current_fields, {"labels": [request.label]})
+        current_status = (current_fields.get('status') or {}).get('name', '')
 
-        # Find transition to target status
+        # Find transition to target status, unless the ticket is already there
         target_transition_id = None
-        for transition in transitions:
-            if transition['to']['name'].lower() == request.status.lower():
-                target_transition_id = transition['id']
-                break
+        if current_status.lower() != request.status.lower():
+            for transition in transitions:
+                if transition['to']['name'].lower() == request.status.lower():
+                    target_transition_id = transition['id']
+                    break
 
-        if not target_transition_id:
-            available_statuses = [t['to']['name'] for t in transitions]
+            if not target_transition_id:
+                available_statuses = [t['to']['name'] for t in transitions]
+                return {
+                    'success': False,
+                    'error': f'No transition to {request.status} found. Available: {available_statuses}'
+                }
+
+        # Label and transition go out together; separate calls only if the screen refuses the label
+        executed = execute_issue_write(
+            partial(send_jira_write, jira_client.base_url, (jira_client.username, jira_client.token)),
+            request.ticket_key,
+            fields=fields,
+            transition_id=target_transition_id
+        )
+
+        label_response = next((response for step, response in executed if 'fields' in step.payload), None)
+        transition_response = next((response for step, response in executed if step.is_transition), None)
+
+        if not all(succeeded(response) for step, response in executed):
+            _, response = executed[-1]
             return {
                 'success': False,
-                'error': f'No transition to {request.status} found. Available: {available_statuses}'
+                'error': f'Jira update failed: {response.status_code} - {response.text}',
+                'ticket_key': request.ticket_key
             }
 
-        # Update label first
-        update_url = f"{jira_client.base_url}/rest/api/3/issue/{request.ticket_key}"
+        drop_prefetched_searches()
+        return {
+            'success': True,
+            'ticket_key': request.ticket_key,
+            'status_updated': request.status,
+            'label_added': request.label,
+            'transition_id': target_transition_id,
+            'label_update_status': label_response.status_code if label_response is not None else None,
+            'transition_status': transition_response.status_code if transition_response is not None else None,
+            'requests_sent': len(executed)
+        }
 
-        label_payload = {
-            "fields": {
-                "labels": [request.label]
-            }
+    except Exception as e:
+        return {
+            'success': False,
+            'error': str(e)
         }
 
-        label_response = requests.put(
-            update_url,
-            json=label_payload,
-            auth=(jira_client.username, jira_client.token),
-            headers={'Accept': 'application/json', 'Content-Type': 'application/json'}
-        )
+@mcp.tool()
+def scan_console_versions(request: ScanConsoleVersionsRequest) -> Dict[str, Any]:
+    """
+    Extract current connector and SDK versions from a Jenkins build console output.
 
-        # Transition to target status
-        transition_payload = {
-            "transition": {
-                "id": target_transition_id
-            }
-        }
+    Args:
+        build_url: Jenkins build URL (e.g., https://ci-comp.tasktop.com/job/connector-release/123/)
+        max_wait_seconds: How long to keep following the console of a running build (default: 0)
 
-        transition_response = requests.post(
-            transitions_url,
-            json=transition_payload,
-            auth=(jira_client.username, jira_client.token),
-            headers={'Accept': 'application/json', 'Content-Type': 'application/json'}
-        )
+    Returns:
+        Dictionary containing the versions found and how much of the log was read
+    """
+    try:
+        jenkins_user = getenv('JENKINS_USER')
+        jenkins_token = getenv('JENKINS_TOKEN')
+
+        if not all([jenkins_user, jenkins_token]):
+            raise ValueError("Missing Jenkins credentials. Please set JENKINS_USER and JENKINS_TOKEN in .env")
+
+        result = scan_console_for_versions(request.build_url, (jenkins_user, jenkins_token), request.max_wait_seconds)
+
+        if not result['current_connector_version'] or not result['current_sdk_version']:
+            missing = [name for name in CONSOLE_VERSION_PATTERNS if not result[name]]
+            return {
+                'success': False,
+                'error': f'Could not find {", ".join(missing)} in console output; please provide them manually',
+                'build_url': request.build_url,
+                **result
+            }
 
         return {
             'success': True,
-            'ticket_key': request.ticket_key,
-            'status_updated': request.status,
-            'label_added': request.label,
-            'transition_id': target_transition_id,
-            'label_update_status': label_response.status_code,
-            'transition_status': transition_response.status_code
+            'build_url': request.build_url,
+            **result
         }
 
     except Exception as e:
@@ -0,0 +1,118 @@
+"""
+Warm-start snapshots of the in-memory caches.
+
+Modules register their hot caches under a name. The server enables snapshots at
+start-up and saves the registered caches to a JSON file on shutdown; a cache
+registered later (assistant modules are imported on the first call of one of their
+tools) is filled from the snapshot when it registers. Nothing is read or written
+unless the server enabled snapshots.
+
+Staleness is checked at three levels: a snapshot older than max_age or written by
+another format version is ignored, a cache whose version changed is skipped, and each
+entry keeps its original age, so the cache's TTL still applies after a restart.
+"""
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from mcp_tools.cache import LRUCache
+from mcp_tools.codec import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT = 1
+DEFAULT_SNAPSHOT_PATH = os.path.join(os.path.expanduser("~"), ".cache", "flowfabric-ai-agents", "cache-snapshot.json")
+# Snapshots older than this are not restored
+DEFAULT_MAX_AGE = 24 * 60 * 60
+
+
+def _as_key(value: Any) -> Any:
+    """JSON turns tuple keys into lists; turn them back"""
+    if isinstance(value, list):
+        return tuple(_as_key(item) for item in value)
+    return value
+
+
+class CacheSnapshots:
+    def __init__(self):
+        self.path: Optional[str] = None
+        self.max_age = DEFAULT_MAX_AGE
+        self._caches: Dict[str, tuple] = {}
+        self._saved: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, cache: LRUCache, version: int = 1) -> LRUCache:
+        """Include cache in snapshots; bump version when the cached values change shape"""
+        with self._lock:
+            self._caches[name] = (cache, version)
+            self._restore(name)
+        return cache
+
+    def enable(self, path: str = DEFAULT_SNAPSHOT_PATH, max_age: float = DEFAULT_MAX_AGE) -> None:
+        """Read the snapshot at path and fill the caches registered so far"""
+        with self._lock:
+            self.path = path
+            self.max_age = max_age
+            self._saved = self._read()
+            for name in self._caches:
+                self._restore(name)
+
+    def save(self) -> None:
+        """Write the registered caches to the snapshot file, if enabled"""
+        if not self.path:
+            return
+        with self._lock:
+            caches = {
+                name: {
+                    "version": version,
+                    "entries": [[key, stored_at, value] for key, stored_at, value in cache.entries()]
+                }
+                for name, (cache, version) in self._caches.items()
+            }
+            # Caches of modules not loaded in this run keep their previous snapshot
+            for name, saved in self._saved.items():
+                caches.setdefault(name, saved)
+
+        directory = os.path.dirname(self.path) or "."
+        try:
+            data = dumps({"format": SNAPSHOT_FORMAT, "saved_at": time.time(), "caches": caches})
+            os.makedirs(directory, exist_ok=True)
+            # Written privately and renamed into place, so a crash never leaves half a file
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".cache-snapshot-")
+            with os.fdopen(fd, "wb") as tmp_file:
+                tmp_file.write(data)
+            os.replace(tmp_path, self.path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning("Could not save cache snapshot to %s: %s", self.path, e)
+
+    def _read(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, "rb") as snapshot_file:
+                snapshot = loads(snapshot_file.read())
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable cache snapshot %s: %s", self.path, e)
+            return {}
+
+        if not isinstance(snapshot, dict) or snapshot.get("format") != SNAPSHOT_FORMAT:
+            return {}
+        if time.time() - snapshot.get("saved_at", 0) > self.max_age:
+            return {}
+        return snapshot.get("caches") or {}
+
+    def _restore(self, name: str) -> None:
+        saved = self._saved.pop(name, None)
+        cache, version = self._caches[name]
+        if not saved or saved.get("version") != version:
+            return
+        restored = cache.restore(
+            (_as_key(key), stored_at, value) for key, stored_at, value in saved.get("entries", [])
+        )
+        logger.debug("Restored %d entries of %s from the cache snapshot", restored, name)
+
+
+snapshots = CacheSnapshots()
@@ -1,11 +1,26 @@
+import asyncio
+import contextvars
 import datetime
-import os
+import fnmatch
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import quote, unquote
 
 import httpx
 from dotenv import load_dotenv
-from fastmcp import FastMCP
+from fastmcp import Context, FastMCP
 from pydantic import BaseModel, Field
 
+from mcp_tools import adf
+from mcp_tools.cache import LRUCache
+from mcp_tools.codec import JSON_HEADERS, decode_response, dumps
+from mcp_tools.credentials import getenv
+from mcp_tools.jira_writes import aexecute_issue_write, succeeded
+from mcp_tools.outbound import Priority, outbound, priority
+from mcp_tools.progress import ProgressReporter
+from mcp_tools.records import TestCase
+from mcp_tools.snapshot import snapshots
+
 load_dotenv()
 
 mcp = FastMCP("tests-triaging-assistant")
@@ -30,6 +45,26 @@ class FailedTest(BaseModel):
     standard_output: str
     frequency_rule: str = "daily"
 
+class CaseDetailFetchInput(BaseModel):
+    job_name: str = "connector-leankit"
+    build_number: int | None = None   # latest build when not set
+    class_name: str
+    test_name: str
+    max_bytes: int = 4000
+    offset: int | None = None   # tail of each output when not set
+
+class BuildWaitInput(BaseModel):
+    job_name: str = "connector-leankit"
+    build_number: int | None = None   # latest build when not set
+    timeout_seconds: int = 1800
+    initial_interval: float = 5
+    max_interval: float = 120
+
+class JUnitArtifactFetchInput(BaseModel):
+    job_name: str = "connector-leankit"
+    build_number: int | None = None   # latest build when not set
+    pattern: str = "*.xml"   # matched against archived artifact paths
+
 class TicketFetchInput(BaseModel):
     type: str = "Build Issue"
     component: str = "Planview AgilePlace"
@@ -50,105 +85,659 @@ class BuildIssueCreateInput(BaseModel):
     failure_message: str = ""
     stacktrace: str = ""
 
+class BuildIssueCreateManyInput(BaseModel):
+    issues: list[BuildIssueCreateInput]
+
 class BuildIssueUpdateInput(BaseModel):
     issue_id: str
     status: str = None
     last_seen: str = None
 
+class BuildIssueUpdateManyInput(BaseModel):
+    issues: list[BuildIssueUpdateInput]
+
+# -----------------------------
+# Jenkins Helpers
+# -----------------------------
+
+# Per-case details of completed builds never change, so they are kept between calls
+# and across restarts; keyed by Jenkins URL too, since HTTP sessions may point at
+# different servers
+_case_detail_cache = snapshots.register("tests_triaging.case_detail", LRUCache(maxsize=128))
+
+# Failures of finished builds never change either; the prefetcher fills this ahead of triage
+_build_failures_cache = snapshots.register("tests_triaging.build_failures", LRUCache(maxsize=64))
+
+# Build fields needed for failure extraction, including matrix runs and downstream builds
+BUILD_INFO_TREE = "number,url,result,building,runs[number,url],subBuilds[jobName,buildNumber,url,result]"
+CHILD_REPORT_WORKERS = 8
+
+# Stack traces are cut to this many characters in failure summaries
+STACK_TRACE_LIMIT = 300
+
+def get_jenkins_base_url():
+    return getenv("JENKINS_URL", "https://ci-comp.tasktop.com").rstrip("/")
+
+def get_jenkins_auth():
+    jenkins_user = getenv("JENKINS_USER")
+    jenkins_token = getenv("JENKINS_TOKEN")
+
+    if not all([jenkins_user, jenkins_token]):
+        raise ValueError("JENKINS_USER or JENKINS_TOKEN missing in .env")
+
+    return jenkins_user, jenkins_token
+
+def _safe_url_segment(name):
+    """Escape a test report path segment the same way Jenkins does"""
+    for char in '/\\:?#%<>':
+        name = name.replace(char, "_")
+    return quote(name, safe="")
+
+def build_case_report_url(build_url, class_name, test_name):
+    """Build the per-case testReport API URL for a test case"""
+    package, _, simple_class = class_name.rpartition(".")
+    return (
+        f"{build_url.rstrip('/')}/testReport/{_safe_url_segment(package or '(root)')}/"
+        f"{_safe_url_segment(simple_class)}/{_safe_url_segment(test_name)}/api/json"
+    )
+
+def slice_output(text, max_bytes, offset=None):
+    """
+    Return a byte range of text. Without an offset the last max_bytes are returned.
+    """
+    data = (text or "").encode("utf-8")
+    total = len(data)
+    if offset is None:
+        start = max(total - max_bytes, 0)
+    else:
+        start = min(max(offset, 0), total)
+    end = min(start + max(max_bytes, 0), total)
+
+    return {
+        "content": data[start:end].decode("utf-8", errors="ignore"),
+        "start": start,
+        "end": end,
+        "total_bytes": total,
+        "truncated": start > 0 or end < total
+    }
+
+def collect_failed_tests(report, configuration=None):
+    """Collect failed test cases from a Jenkins testReport JSON as TestCase records"""
+    failed_tests = []
+
+    for suite in report.get("suites", []):
+        for case in suite.get("cases", []):
+            if case.get("status") != "PASSED":
+                error_details = case.get("errorDetails", "")
+                stack_trace = case.get("errorStackTrace", "")
+
+                # Skip infrastructure failures (no error details or stack trace)
+                if not error_details and not stack_trace:
+                    continue
+
+                failed_tests.append(TestCase(
+                    class_name=case.get("className", ""),
+                    name=case.get("name", ""),
+                    error_details=error_details,
+                    stack_trace=stack_trace[:STACK_TRACE_LIMIT],
+                    configuration=configuration
+                ))
+
+    return failed_tests
+
+def failures_output(failed_tests):
+    """Convert TestCase records to the failed test dicts the tools return"""
+    return [case.as_failure() for case in failed_tests]
+
+def configuration_label(build_url):
+    """
+    Label a child build by its URL: the axis values of a matrix run
+    (e.g. jdk=11,label=linux) or the job name and number of a downstream build.
+    """
+    segments = [unquote(segment) for segment in build_url.rstrip("/").split("/")]
+    if len(segments) >= 2 and "=" in segments[-2]:
+        return segments[-2]
+    if len(segments) >= 3 and segments[-3] == "job":
+        return f"{segments[-2]} #{segments[-1]}"
+    return "/".join(segments[-2:])
+
+def discover_child_builds(base_url, build_info):
+    """Find matrix runs and downstream builds that carry their own test reports"""
+    children = []
+    build_number = build_info.get("number")
+
+    for run in build_info.get("runs") or []:
+        # Matrix jobs also list runs left over from older builds
+        if run.get("number") == build_number and run.get("url"):
+            children.append({"label": configuration_label(run["url"]), "url": run["url"]})
+
+    for sub_build in build_info.get("subBuilds") or []:
+        url = sub_build.get("url")
+        if not url:
+            continue
+        if not url.startswith("http"):
+            url = f"{base_url}/{url.lstrip('/')}"
+        label = f"{sub_build.get('jobName')} #{sub_build.get('buildNumber')}" if sub_build.get("jobName") else configuration_label(url)
+        children.append({"label": label, "url": url})
+
+    return children
+
+def fetch_child_failures(client, children, progress=None):
+    """
+    Fetch test reports of child builds concurrently and merge their failures.
+    progress(done, total, message=..., partial=...) is called as each child completes.
+    """
+    def fetch_one(child):
+        response = client.get(f"{child['url'].rstrip('/')}/testReport/api/json")
+        if response.status_code != 200:
+            return None
+        return collect_failed_tests(decode_response(response), configuration=child["label"])
+
+    results = [None] * len(children)
+    with ThreadPoolExecutor(max_workers=min(CHILD_REPORT_WORKERS, len(children))) as executor:
+        # Worker threads send with the priority (and session) of the calling tool
+        futures = {
+            executor.submit(contextvars.copy_context().run, fetch_one, child): index
+            for index, child in enumerate(children)
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            index = futures[future]
+            results[index] = future.result()
+            if progress:
+                child = children[index]
+                partial = {"configuration": child["label"], "total_failures": len(results[index] or [])}
+                if results[index] is None:
+                    partial = {"configuration": child["label"], "message": "No test report available"}
+                progress(done, len(children), message=f"Collected test report of {child['label']}", partial=partial)
+
+    # Keep the order in which Jenkins lists the children
+    failed_tests = []
+    child_builds = []
+    for child, child_failures in zip(children, results):
+        if child_failures is None:
+            child_builds.append({**child, "message": "No test report available"})
+            continue
+        child_builds.append({**child, "total_failures": len(child_failures)})
+        failed_tests.extend(child_failures)
+
+    return failed_tests, child_builds
+
+def collect_report_failures(report):
+    """Collect failures from a test report, keeping child labels of aggregated reports"""
+    child_reports = report.get("childReports")
+    if not child_reports:
+        return collect_failed_tests(report)
+
+    failed_tests = []
+    for child_report in child_reports:
+        child_url = (child_report.get("child") or {}).get("url", "")
+        label = configuration_label(child_url) if child_url else None
+        failed_tests.extend(collect_failed_tests(child_report.get("result") or {}, configuration=label))
+    return failed_tests
+
+def extract_build_failures(client, base_url, job_name, build_info, progress=None):
+    """
+    Extract failed tests of a finished build using an open Jenkins client.
+    progress is an optional callback, see fetch_child_failures.
+    """
+    build_number = build_info.get("number")
+    status = build_info.get("result")
+    build_url = build_info.get("url")
+
+    if status == "SUCCESS":
+        return {
+            "job": job_name,
+            "buildNumber": build_number,
+            "buildUrl": build_url,
+            "status": status,
+            "failed_tests": [],
+            "message": "Build passed - no failures to report"
+        }
+
+    # Matrix and downstream builds keep their test reports on the child builds
+    children = discover_child_builds(base_url, build_info)
+    if children:
+        # The report of a matrix build aggregates its runs, but the parent of downstream
+        # builds may run tests of its own; those come first
+        own_failures = []
+        if not any(run.get("number") == build_number for run in build_info.get("runs") or []):
+            own_response = client.get(f"{base_url}/job/{job_name}/{build_number}/testReport/api/json")
+            if own_response.status_code == 200:
+                own_failures = collect_report_failures(decode_response(own_response))
+
+        if progress:
+            progress(0, len(children), message=f"Fetching test reports of {len(children)} child builds")
+        child_failures, child_builds = fetch_child_failures(client, children, progress)
+        failed_tests = own_failures + child_failures
+        return {
+            "job": job_name,
+            "buildNumber": build_number,
+            "buildUrl": build_url,
+            "status": status,
+            "failed_tests": failures_output(failed_tests),
+            "total_failures": len(failed_tests),
+            "child_builds": child_builds
+        }
+
+    # Get test report using dynamic build number
+    if progress:
+        progress(0, 1, message=f"Fetching test report of {job_name} #{build_number}")
+    test_url = f"{base_url}/job/{job_name}/{build_number}/testReport/api/json"
+    test_response = client.get(test_url)
+
+    if test_response.status_code != 200:
+        return {
+            "job": job_name,
+            "buildNumber": build_number,
+            "buildUrl": build_url,
+            "status": status,
+            "failed_tests": [],
+            "message": "No test report available"
+        }
+
+    failed_tests = collect_report_failures(decode_response(test_response))
+    if progress:
+        progress(1, 1, message=f"Found {len(failed_tests)} failed tests")
+
+    return {
+        "job": job_name,
+        "buildNumber": build_number,
+        "buildUrl": build_url,
+        "status": status,
+        "failed_tests": failures_output(failed_tests),
+        "total_failures": len(failed_tests)
+    }
+
+def iter_junit_failures(chunks):
+    """
+    Incrementally parse JUnit XML from an iterable of byte chunks and yield failed
+    cases as TestCase records. Finished elements are detached
+    from the tree as soon as they are handled, so memory stays flat for large reports.
+    """
+    parser = ET.XMLPullParser(events=("start", "end"))
+    stack = []
+
+    def handle_events():
+        for event, elem in parser.read_events():
+            if event == "start":
+                stack.append(elem)
+                continue
+
+            stack.pop()
+            parent = stack[-1] if stack else None
+
+            if elem.tag == "testcase":
+                failure = elem.find("failure")
+                if failure is None:
+                    failure = elem.find("error")
+                if failure is not None:
+                    error_details = failure.get("message", "")
+                    stack_trace = (failure.text or "").strip()
+
+                    # Skip infrastructure failures (no error details or stack trace)
+                    if error_details or stack_trace:
+                        yield TestCase(
+                            class_name=elem.get("classname", ""),
+                            name=elem.get("name", ""),
+                            error_details=error_details,
+                            stack_trace=stack_trace[:STACK_TRACE_LIMIT]
+                        )
+
+            # Children of a test case are read when the case ends; everything else can go now
+            if parent is not None and parent.tag != "testcase":
+                parent.remove(elem)
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from handle_events()
+    parser.close()
+    yield from handle_events()
+
+def has_all_reports(result):
+    """Whether every test report of the build was available when failures were extracted"""
+    if result.get("message") == "No test report available":
+        return False
+    return all("message" not in child for child in result.get("child_builds", []))
+
+def cached_build_failures(client, base_url, job_name, build_info, progress=None):
+    """
+    extract_build_failures, served from the cache for builds that have finished. The
+    cache is shared by all sessions, so build_info must have been fetched with the
+    caller's credentials: Jenkins answering that request is what authorizes them.
+    """
+    finished = not build_info.get("building") and build_info.get("result") is not None
+    cache_key = (base_url, job_name, build_info.get("number"))
+
+    if finished:
+        cached = _build_failures_cache.get(cache_key)
+        if cached is not None:
+            if progress:
+                progress(1, 1, message=f"Using cached failures of {job_name} #{build_info.get('number')}")
+            return dict(cached)
+
+    result = extract_build_failures(client, base_url, job_name, build_info, progress)
+    if finished and has_all_reports(result):
+        _build_failures_cache.set(cache_key, result)
+    # Callers add their own keys to the result
+    return dict(result)
+
+def fetch_failures_for_build(job_name, build_info, progress=None):
+    """Open a Jenkins client and extract failed tests of an already fetched build"""
+    jenkins_user, jenkins_token = get_jenkins_auth()
+
+    try:
+        with httpx.Client(auth=(jenkins_user, jenkins_token), transport=outbound.transport()) as client:
+            return cached_build_failures(client, get_jenkins_base_url(), job_name, build_info, progress)
+    except httpx.RequestError as e:
+        raise RuntimeError(f"Failed to fetch Jenkins data: {e}")
+
+def fetch_latest_build_failures(job_name, progress=None):
+    """Fetch the last build of a job and extract its failed tests"""
+    return fetch_build_failures(job_name, "lastBuild", progress)
+
+def fetch_build_failures(job_name, build_ref, progress=None):
+    """Fetch a build of a job (number or lastBuild) and extract its failed tests"""
+    jenkins_user, jenkins_token = get_jenkins_auth()
+    base_url = get_jenkins_base_url()
+
+    try:
+        with httpx.Client(auth=(jenkins_user, jenkins_token), transport=outbound.transport()) as client:
+            # Get build info first
+            build_api = f"{base_url}/job/{job_name}/{build_ref}/api/json"
+            response = client.get(build_api, params={"tree": BUILD_INFO_TREE})
+            response.raise_for_status()
+            build_info = decode_response(response)
+
+            return cached_build_failures(client, base_url, job_name, build_info, progress)
+
+    except httpx.RequestError as e:
+        raise RuntimeError(f"Failed to fetch Jenkins data: {e}")
+
+# -----------------------------
+# Jira Helpers
+# -----------------------------
+
+# Jira accepts at most 50 issues per bulk create request
+JIRA_BULK_CREATE_LIMIT = 50
+
+# Concurrent Jira writes per batch update
+BATCH_UPDATE_CONCURRENCY = 8
+
+def build_issue_description(input: BuildIssueCreateInput) -> dict:
+    """The ADF description of a Build Issue"""
+    return adf.doc(
+        adf.heading(1, adf.text("Summary")),
+        adf.bullet_list(
+            adf.list_item(
+                adf.paragraph(adf.text("Sample Builds", "strong")),
+                adf.bullet_list(adf.list_item(adf.paragraph(adf.text(input.sample_builds))))
+            ),
+            adf.list_item(adf.paragraph(adf.text("First Seen On", "strong"), adf.text(f": {input.first_seen}"))),
+            adf.list_item(adf.paragraph(adf.text("Frequency", "strong"), adf.text(f": {input.frequency}"))),
+            adf.list_item(adf.paragraph(adf.text("Last Seen On", "strong"), adf.text(f": {input.last_seen}")))
+        ),
+        adf.heading(1, adf.text("Error Details")),
+        adf.heading(2, adf.text("Tests Affected")),
+        adf.paragraph(adf.text(input.tests_affected)),
+        adf.heading(2, adf.text("Failure / Message")),
+        adf.paragraph(adf.text(input.failure_message, "code")),
+        adf.heading(2, adf.text("Stacktrace")),
+        adf.code_block("java", input.stacktrace)
+    )
+
+def build_issue_payload(input: BuildIssueCreateInput):
+    """Build the Jira create payload for a Build Issue"""
+    description = build_issue_description(input)
+
+    # Create issue payload
+    payload = {
+        "fields": {
+            "project": {"key": "CON"},
+            "summary": input.title,
+            "issuetype": {"name": "Build Issue"},
+            "components": [{"name": input.component}],
+            "labels": [input.label],
+            "customfield_17545": description,
+            "customfield_17737": input.last_seen,
+            "customfield_17736": {"value": input.frequency} if input.frequency else None
+        }
+    }
+
+    # Remove None values
+    payload["fields"] = {k: v for k, v in payload["fields"].items() if v is not None}
+
+    return payload
+
+def bulk_error_message(error):
+    """Flatten an element error of a Jira bulk create response into one message"""
+    element_errors = error.get("elementErrors", {})
+    messages = list(element_errors.get("errorMessages", []))
+    messages.extend(f"{field}: {message}" for field, message in element_errors.get("errors", {}).items())
+    return "; ".join(messages) or f"HTTP {error.get('status')}"
+
+async def find_transition_id(client, jira_url, issue_id, status):
+    """Look up the id of the transition that moves an issue to the given status"""
+    trans_resp = await client.get(f"{jira_url}/rest/api/3/issue/{issue_id}/transitions")
+    trans_resp.raise_for_status()
+
+    for trans in decode_response(trans_resp)["transitions"]:
+        if trans["to"]["name"].lower() == status.lower():
+            return trans["id"]
+    return None
+
+def jira_write_sender(client, jira_url):
+    """Send planned Jira write steps through an open async client"""
+    async def send(step):
+        request = client.put if step.method == "PUT" else client.post
+        return await request(f"{jira_url}{step.path}", json=step.payload)
+    return send
+
 # -----------------------------
 # MCP Tool Implementation
 # -----------------------------
 @mcp.tool("fetch_build_with_failures")
-def fetch_build_with_failures(input: JenkinsBuildFetchInput) -> dict:
+async def fetch_build_with_failures(input: JenkinsBuildFetchInput, ctx: Context = None) -> dict:
     """
     Fetch the latest Jenkins build and extract failed test details with error_details, stack_trace, and standard_output.
+    Reports progress per child build of matrix and pipeline builds.
+    """
+    reporter = ProgressReporter(ctx)
+    await reporter.stage(f"Fetching latest build of {input.job_name}")
+    return await asyncio.to_thread(fetch_latest_build_failures, input.job_name, reporter.threadsafe())
+
+@mcp.tool("wait_for_build")
+async def wait_for_build(input: BuildWaitInput, ctx: Context = None) -> dict:
+    """
+    Wait for a Jenkins build to finish, polling with exponential backoff, then extract
+    its failed tests in the same call. Returns early with status RUNNING on timeout.
+    Each poll is reported as progress.
     """
+    reporter = ProgressReporter(ctx)
     job_name = input.job_name
-    jenkins_user = os.getenv("JENKINS_USER")
-    jenkins_token = os.getenv("JENKINS_TOKEN")
-    base_url = "https://ci-comp.tasktop.com"
+    jenkins_user, jenkins_token = get_jenkins_auth()
+    base_url = get_jenkins_base_url()
 
-    if not all([jenkins_user, jenkins_token]):
-        raise ValueError("JENKINS_USER or JENKINS_TOKEN missing in .env")
+    build_ref = input.build_number if input.build_number is not None else "lastBuild"
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    interval = input.initial_interval
+    polls = 0
 
     try:
-        with httpx.Client(auth=(jenkins_user, jenkins_token)) as client:
-            # Get latest build info first
-            build_api = f"{base_url}/job/{job_name}/lastBuild/api/json"
-            response = client.get(build_api)
+        async with httpx.AsyncClient(auth=(jenkins_user, jenkins_token), transport=outbound.async_transport()) as client:
+            while True:
+                response = await client.get(
+                    f"{base_url}/job/{job_name}/{build_ref}/api/json",
+                    params={"tree": BUILD_INFO_TREE}
+                )
+                response.raise_for_status()
+                build_info = decode_response(response)
+                polls += 1
+
+                if not build_info.get("building"):
+                    break
+
+                remaining = input.timeout_seconds - (loop.time() - started)
+                if remaining <= 0:
+                    return {
+                        "job": job_name,
+                        "buildNumber": build_info.get("number"),
+                        "buildUrl": build_info.get("url"),
+                        "status": "RUNNING",
+                        "failed_tests": [],
+                        "polls": polls,
+                        "message": f"Build still running after {input.timeout_seconds} seconds"
+                    }
+
+                # Stay on the build we started watching even if a newer one is queued
+                build_ref = build_info.get("number", build_ref)
+                await reporter.update(
+                    round(loop.time() - started), input.timeout_seconds,
+                    message=f"{job_name} #{build_ref} still running after {polls} polls"
+                )
+                await asyncio.sleep(min(interval, remaining))
+                interval = min(interval * 2, input.max_interval)
+
+    except httpx.RequestError as e:
+        raise RuntimeError(f"Failed to fetch Jenkins data: {e}")
+
+    await reporter.stage(f"{job_name} #{build_info.get('number')} finished with {build_info.get('result')}")
+    result = await asyncio.to_thread(fetch_failures_for_build, job_name, build_info, reporter.threadsafe())
+    result["polls"] = polls
+    result["waited_seconds"] = round(loop.time() - started, 1)
+    return result
+
+@mcp.tool("fetch_junit_artifacts")
+def fetch_junit_artifacts(input: JUnitArtifactFetchInput) -> dict:
+    """
+    Extract failed tests from archived JUnit XML artifacts of a build, for jobs whose
+    testReport is missing or incomplete. Artifacts are streamed and parsed incrementally.
+    """
+    job_name = input.job_name
+    jenkins_user, jenkins_token = get_jenkins_auth()
+    base_url = get_jenkins_base_url()
+    build_ref = input.build_number if input.build_number is not None else "lastBuild"
+
+    try:
+        with httpx.Client(auth=(jenkins_user, jenkins_token), transport=outbound.transport()) as client:
+            response = client.get(
+                f"{base_url}/job/{job_name}/{build_ref}/api/json",
+                params={"tree": "number,url,result,artifacts[relativePath]"}
+            )
             response.raise_for_status()
-            build_info = response.json()
+            build_info = decode_response(response)
 
-            build_number = build_info.get("number")
-            status = build_info.get("result")
-            build_url = build_info.get("url")
+            build_url = build_info.get("url", "").rstrip("/")
+            artifact_paths = [
+                artifact["relativePath"]
+                for artifact in build_info.get("artifacts", [])
+                if fnmatch.fnmatch(artifact.get("relativePath", ""), input.pattern)
+            ]
 
-            if status == "SUCCESS":
-                return {
-                    "job": job_name,
-                    "buildNumber": build_number,
-                    "buildUrl": build_url,
-                    "status": status,
-                    "failed_tests": [],
-                    "message": "Build passed - no failures to report"
-                }
+            failed_tests = []
+            artifacts = []
+            for path in artifact_paths:
+                with client.stream("GET", f"{build_url}/artifact/{quote(path)}") as artifact_response:
+                    if artifact_response.status_code != 200:
+                        artifacts.append({"path": path, "message": f"Download failed: {artifact_response.status_code}"})
+                        continue
+                    try:
+                        artifact_failures = list(iter_junit_failures(artifact_response.iter_bytes()))
+                    except ET.ParseError as e:
+                        artifacts.append({"path": path, "message": f"Invalid JUnit XML: {e}"})
+                        continue
+                artifacts.append({"path": path, "total_failures": len(artifact_failures)})
+                failed_tests.extend(artifact_failures)
+
+    except httpx.RequestError as e:
+        raise RuntimeError(f"Failed to fetch Jenkins data: {e}")
+
+    result = {
+        "job": job_name,
+        "buildNumber": build_info.get("number"),
+        "buildUrl": build_info.get("url"),
+        "status": build_info.get("result"),
+        "failed_tests": failures_output(failed_tests),
+        "total_failures": len(failed_tests),
+        "artifacts": artifacts
+    }
+    if not artifact_paths:
+        result["message"] = f"No archived artifacts match {input.pattern}"
+    return result
 
-            # Get test report using dynamic build number
-            test_url = f"{base_url}/job/{job_name}/{build_number}/testReport/api/json"
-            test_response = client.get(test_url)
+@mcp.tool("fetch_test_detail")
+def fetch_test_detail(input: CaseDetailFetchInput) -> dict:
+    """
+    Fetch standard output, standard error and the full stack trace of a single test case.
+    Each output is limited to max_bytes; the tail is returned unless an offset is given.
+    """
+    job_name = input.job_name
+    jenkins_user, jenkins_token = get_jenkins_auth()
+    base_url = get_jenkins_base_url()
+
+    try:
+        with httpx.Client(auth=(jenkins_user, jenkins_token), transport=outbound.transport()) as client:
+            # Always asked, even for a cached case: the cache is shared by all sessions,
+            # and Jenkins refusing this call keeps its details from callers without access
+            build_ref = input.build_number if input.build_number is not None else "lastBuild"
+            response = client.get(
+                f"{base_url}/job/{job_name}/{build_ref}/api/json",
+                params={"tree": "number,url,building"}
+            )
+            response.raise_for_status()
+            build_info = decode_response(response)
 
-            if test_response.status_code != 200:
-                return {
+            build_number = build_info.get("number")
+            cache_key = (base_url, job_name, build_number, input.class_name, input.test_name)
+            detail = _case_detail_cache.get(cache_key)
+
+            if detail is None:
+                case_url = build_case_report_url(build_info.get("url", ""), input.class_name, input.test_name)
+                case_response = client.get(case_url)
+
+                if case_response.status_code != 200:
+                    return {
+                        "job": job_name,
+                        "buildNumber": build_number,
+                        "test": f"{input.class_name}.{input.test_name}",
+                        "message": "Test case not found in test report"
+                    }
+
+                case = decode_response(case_response)
+                detail = {
                     "job": job_name,
                     "buildNumber": build_number,
-                    "buildUrl": build_url,
-                    "status": status,
-                    "failed_tests": [],
-                    "message": "No test report available"
+                    "test": f"{input.class_name}.{input.test_name}",
+                    "status": case.get("status"),
+                    "error_details": case.get("errorDetails") or "",
+                    "stack_trace": case.get("errorStackTrace") or "",
+                    "stdout": case.get("stdout") or "",
+                    "stderr": case.get("stderr") or ""
                 }
 
-            report = test_response.json()
-            failed_tests = []
-
-            for suite in report.get("suites", []):
-                for case in suite.get("cases", []):
-                    if case.get("status") != "PASSED":
-                        error_details = case.get("errorDetails", "")
-                        stack_trace = case.get("errorStackTrace", "")
-
-                        # Skip infrastructure failures (no error details or stack trace)
-                        if not error_details and not stack_trace:
-                            continue
-
-                        # Build full test name with parameters
-                        class_name = case.get("className", "")
-                        test_name = case.get("name", "")
-                        full_test_name = f"{class_name}.{test_name}" if class_name and test_name else class_name
-
-                        failed_tests.append({
-                            "api": full_test_name,
-                            "error_details": error_details,
-                            "stack_trace": stack_trace[:300],
-                            ##"standard_output": case.get("stdout", "")[:100]
-                        })
-
-            return {
-                "job": job_name,
-                "buildNumber": build_number,
-                "buildUrl": build_url,
-                "status": status,
-                "failed_tests": failed_tests,
-                "total_failures": len(failed_tests)
-            }
+                # Results of a finished build are final
+                if not build_info.get("building"):
+                    _case_detail_cache.set(cache_key, detail)
 
     except httpx.RequestError as e:
         raise RuntimeError(f"Failed to fetch Jenkins data: {e}")
 
+    return {
+        "job": detail["job"],
+        "buildNumber": detail["buildNumber"],
+        "test": detail["test"],
+        "status": detail["status"],
+        "error_details": detail["error_details"],
+        "stack_trace": slice_output(detail["stack_trace"], input.max_bytes, input.offset),
+        "standard_output": slice_output(detail["stdout"], input.max_bytes, input.offset),
+        "standard_error": slice_output(detail["stderr"], input.max_bytes, input.offset)
+    }
+
 @mcp.tool("build_issues.fetch")
 async def fetch_build_issues():
-    JIRA_URL = os.getenv("JIRA_URL")
-    JIRA_USER = os.getenv("JIRA_USER")
-    JIRA_TOKEN = os.getenv("JIRA_TOKEN")
+    JIRA_URL = getenv("JIRA_URL")
+    JIRA_USER = getenv("JIRA_USER")
+    JIRA_TOKEN = getenv("JIRA_TOKEN")
 
     if not all([JIRA_URL, JIRA_USER, JIRA_TOKEN]):
         raise RuntimeError("Missing Jira credentials in .env")
@@ -156,14 +745,14 @@ async def fetch_build_issues():
     jql = f'type = "Build Issue" AND component = "Planview AgilePlace" ORDER BY created DESC'
     url = f"{JIRA_URL}/rest/api/3/search/jql"
 
-    async with httpx.AsyncClient(auth=(JIRA_USER, JIRA_TOKEN)) as client:
+    async with httpx.AsyncClient(auth=(JIRA_USER, JIRA_TOKEN), transport=outbound.async_transport()) as client:
         resp = await client.get(url, params={
             "jql": jql,
             "maxResults": 50,
             "fields": "key,summary,status,created,customfield_17737,customfield_17736"
         })
         resp.raise_for_status()
-        data = resp.json()
+        data = decode_response(resp)
 
     issues = []
     for issue in data.get("issues", []):
@@ -191,67 +780,21 @@ async def create_build_issue(input: BuildIssueCreateInput):
     """
     Create a new Build Issue in Jira with template-based description
     """
-    JIRA_URL = os.getenv("JIRA_URL")
-    JIRA_USER = os.getenv("JIRA_USER")
-    JIRA_TOKEN = os.getenv("JIRA_TOKEN")
+    JIRA_URL = getenv("JIRA_URL")
+    JIRA_USER = getenv("JIRA_USER")
+    JIRA_TOKEN = getenv("JIRA_TOKEN")
 
     if not all([JIRA_URL, JIRA_USER, JIRA_TOKEN]):
         raise RuntimeError("Missing Jira credentials in .env")
 
-    # Build the description template
-    description = {
-        "type": "doc",
-        "version": 1,
-        "content": [
-            {"type": "heading", "attrs": {"level": 1}, "content": [{"type": "text", "text": "Summary"}]},
-            {
-                "type": "bulletList",
-                "content": [
-                    {
-                        "type": "listItem",
-                        "content": [
-                            {"type": "paragraph", "content": [{"type": "text", "text": "Sample Builds", "marks": [{"type": "strong"}]}]},
-                            {"type": "bulletList", "content": [{"type": "listItem", "content": [{"type": "paragraph", "content": [{"type": "text", "text": input.sample_builds}]}]}]}
-                        ]
-                    },
-                    {"type": "listItem", "content": [{"type": "paragraph", "content": [{"type": "text", "text": "First Seen On", "marks": [{"type": "strong"}]}, {"type": "text", "text": f": {input.first_seen}"}]}]},
-                    {"type": "listItem", "content": [{"type": "paragraph", "content": [{"type": "text", "text": "Frequency", "marks": [{"type": "strong"}]}, {"type": "text", "text": f": {input.frequency}"}]}]},
-                    {"type": "listItem", "content": [{"type": "paragraph", "content": [{"type": "text", "text": "Last Seen On", "marks": [{"type": "strong"}]}, {"type": "text", "text": f": {input.last_seen}"}]}]}
-                ]
-            },
-            {"type": "heading", "attrs": {"level": 1}, "content": [{"type": "text", "text": "Error Details"}]},
-            {"type": "heading", "attrs": {"level": 2}, "content": [{"type": "text", "text": "Tests Affected"}]},
-            {"type": "paragraph", "content": [{"type": "text", "text": input.tests_affected}]},
-            {"type": "heading", "attrs": {"level": 2}, "content": [{"type": "text", "text": "Failure / Message"}]},
-            {"type": "paragraph", "content": [{"type": "text", "text": input.failure_message, "marks": [{"type": "code"}]}]},
-            {"type": "heading", "attrs": {"level": 2}, "content": [{"type": "text", "text": "Stacktrace"}]},
-            {"type": "codeBlock", "attrs": {"language": "java"}, "content": [{"type": "text", "text": input.stacktrace}]}
-        ]
-    }
-
-    # Create issue payload
-    payload = {
-        "fields": {
-            "project": {"key": "CON"},
-            "summary": input.title,
-            "issuetype": {"name": "Build Issue"},
-            "components": [{"name": input.component}],
-            "labels": [input.label],
-            "customfield_17545": description,
-            "customfield_17737": input.last_seen,
-            "customfield_17736": {"value": input.frequency} if input.frequency else None
-        }
-    }
-
-    # Remove None values
-    payload["fields"] = {k: v for k, v in payload["fields"].items() if v is not None}
+    payload = build_issue_payload(input)
 
     url = f"{JIRA_URL}/rest/api/3/issue"
 
-    async with httpx.AsyncClient(auth=(JIRA_USER, JIRA_TOKEN)) as client:
+    async with httpx.AsyncClient(auth=(JIRA_USER, JIRA_TOKEN), transport=outbound.async_transport()) as client:
         resp = await client.post(url, json=payload)
         resp.raise_for_status()
-        data = resp.json()
+        data = decode_response(resp)
 
     return {
         "success": True,
@@ -259,58 +802,111 @@ async def create_build_issue(input: BuildIssueCreateInput):
         "issue_id": data["id"]
     }
 
+@mcp.tool("build_issues.create_many")
+async def create_build_issues(input: BuildIssueCreateManyInput):
+    """
+    Create several Build Issues through the Jira bulk create endpoint, using the same
+    template as build_issues.create. Items that fail are reported without aborting the batch.
+    """
+    JIRA_URL = getenv("JIRA_URL")
+    JIRA_USER = getenv("JIRA_USER")
+    JIRA_TOKEN = getenv("JIRA_TOKEN")
+
+    if not all([JIRA_URL, JIRA_USER, JIRA_TOKEN]):
+        raise RuntimeError("Missing Jira credentials in .env")
+
+    url = f"{JIRA_URL}/rest/api/3/issue/bulk"
+    results = []
+
+    # Bulk work yields to interactive tool calls for Jira capacity
+    with priority(Priority.BATCH):
+        async with httpx.AsyncClient(auth=(JIRA_USER, JIRA_TOKEN), transport=outbound.async_transport()) as client:
+            for chunk_start in range(0, len(input.issues), JIRA_BULK_CREATE_LIMIT):
+                chunk = input.issues[chunk_start:chunk_start + JIRA_BULK_CREATE_LIMIT]
+                payload = {"issueUpdates": [build_issue_payload(issue) for issue in chunk]}
+
+                try:
+                    # Bulk payloads are large; encode them with the fast codec
+                    resp = await client.post(url, content=dumps(payload), headers=JSON_HEADERS)
+                except httpx.RequestError as e:
+                    results.extend({"success": False, "title": issue.title, "error": str(e)} for issue in chunk)
+                    continue
+
+                # Jira answers 201 with per-element errors, or 400 when every element failed
+                if resp.status_code not in (200, 201, 400):
+                    results.extend(
+                        {"success": False, "title": issue.title, "error": f"{resp.status_code} - {resp.text}"}
+                        for issue in chunk
+                    )
+                    continue
+
+                data = decode_response(resp)
+                errors = {error.get("failedElementNumber"): bulk_error_message(error) for error in data.get("errors", [])}
+                # Created issues come back in request order, without the failed elements
+                created = iter(data.get("issues", []))
+
+                for index, issue in enumerate(chunk):
+                    if index in errors:
+                        results.append({"success": False, "title": issue.title, "error": errors[index]})
+                        continue
+                    created_issue = next(created, None)
+                    if created_issue is None:
+                        results.append({"success": False, "title": issue.title, "error": "Missing from bulk create response"})
+                        continue
+                    results.append({
+                        "success": True,
+                        "title": issue.title,
+                        "issue_key": created_issue["key"],
+                        "issue_id": created_issue["id"]
+                    })
+
+    created_count = sum(1 for result in results if result["success"])
+    return {
+        "success": created_count == len(results),
+        "created": created_count,
+        "failed": len(results) - created_count,
+        "results": results
+    }
+
 @mcp.tool("update_jira_build_issue")
 async def update_jira_build_issue(input: BuildIssueUpdateInput):
     """
     Update ticket status and last seen date. Only updates provided fields.
     """
-    JIRA_URL = os.getenv("JIRA_URL")
-    JIRA_USER = os.getenv("JIRA_USER")
-    JIRA_TOKEN = os.getenv("JIRA_TOKEN")
+    JIRA_URL = getenv("JIRA_URL")
+    JIRA_USER = getenv("JIRA_USER")
+    JIRA_TOKEN = getenv("JIRA_TOKEN")
 
     if not all([JIRA_URL, JIRA_USER, JIRA_TOKEN]):
         raise RuntimeError("Missing Jira credentials in .env")
 
 
     last_seen_value = get_current_datetime()
-    async with httpx.AsyncClient(auth=(JIRA_USER, JIRA_TOKEN)) as client:
-        # Build payload with only provided fields
-        payload = {"fields": {}}
-
-        # Update last seen
-        payload["fields"]["customfield_17737"] = last_seen_value
-
-        # Update fields if any are provided
-        if payload["fields"]:
-            url = f"{JIRA_URL}/rest/api/3/issue/{input.issue_id}"
-            resp = await client.put(url, json=payload)
-            resp.raise_for_status()
-
-        # Handle status transition if provided
-        status_updated = None
+    async with httpx.AsyncClient(auth=(JIRA_USER, JIRA_TOKEN), transport=outbound.async_transport()) as client:
+        # Look up the transition first so the last seen update can be sent along with it
+        transition_id = None
         if input.status is not None:
             try:
-                # Get available transitions
-                trans_url = f"{JIRA_URL}/rest/api/3/issue/{input.issue_id}/transitions"
-                trans_resp = await client.get(trans_url)
-                trans_resp.raise_for_status()
-                transitions = trans_resp.json()["transitions"]
-
-                # Find matching transition
-                transition_id = None
-                for trans in transitions:
-                    if trans["to"]["name"].lower() == input.status.lower():
-                        transition_id = trans["id"]
-                        break
-
-                if transition_id:
-                    # Execute transition
-                    trans_payload = {"transition": {"id": transition_id}}
-                    await client.post(trans_url, json=trans_payload)
-                    status_updated = input.status
+                transition_id = await find_transition_id(client, JIRA_URL, input.issue_id, input.status)
             except:
                 pass
 
+        executed = await aexecute_issue_write(
+            jira_write_sender(client, JIRA_URL),
+            input.issue_id,
+            fields={"customfield_17737": last_seen_value},
+            transition_id=transition_id
+        )
+
+        # A failed merged transition has been retried as a PUT and a bare transition;
+        # like the transition lookup, only the last seen update is required to succeed
+        status_updated = None
+        for step, resp in executed:
+            if step.method == "PUT":
+                resp.raise_for_status()
+            if step.is_transition and succeeded(resp):
+                status_updated = input.status
+
     return {
         "success": True,
         "issue_id": input.issue_id,
@@ -318,6 +914,104 @@ async def update_jira_build_issue(input: BuildIssueUpdateInput):
         "status_updated": status_updated if status_updated else "not updated"
     }
 
+@mcp.tool("build_issues.update_many")
+async def update_jira_build_issues(input: BuildIssueUpdateManyInput):
+    """
+    Update last seen date, and status where provided, of many Build Issues concurrently.
+    The last seen date rides along with the transition, and transitions are grouped by
+    project and target status so the transition id is looked up once per workflow.
+    Outcomes are reported per input issue, in input order.
+    """
+    JIRA_URL = getenv("JIRA_URL")
+    JIRA_USER = getenv("JIRA_USER")
+    JIRA_TOKEN = getenv("JIRA_TOKEN")
+
+    if not all([JIRA_URL, JIRA_USER, JIRA_TOKEN]):
+        raise RuntimeError("Missing Jira credentials in .env")
+
+    last_seen_value = get_current_datetime()
+    semaphore = asyncio.Semaphore(BATCH_UPDATE_CONCURRENCY)
+    # By input position: an issue listed twice gets an outcome for each entry
+    outcomes = [
+        {"issue_id": issue.issue_id, "last_seen_updated": None, "status_updated": "not updated"}
+        for issue in input.issues
+    ]
+
+    # Bulk work yields to interactive tool calls for Jira capacity
+    with priority(Priority.BATCH):
+        async with httpx.AsyncClient(auth=(JIRA_USER, JIRA_TOKEN), transport=outbound.async_transport()) as client:
+            send = jira_write_sender(client, JIRA_URL)
+
+            async def update_issue(index, shared_transition_id=None):
+                """Apply last seen, and the transition when one applies, returning the transition id used"""
+                issue, outcome = input.issues[index], outcomes[index]
+                async with semaphore:
+                    try:
+                        transition_id = shared_transition_id
+                        if issue.status is not None and transition_id is None:
+                            transition_id = await find_transition_id(client, JIRA_URL, issue.issue_id, issue.status)
+                            if not transition_id:
+                                outcome["status_error"] = f"No transition to {issue.status}"
+
+                        executed = await aexecute_issue_write(
+                            send,
+                            issue.issue_id,
+                            fields={"customfield_17737": last_seen_value},
+                            transition_id=transition_id
+                        )
+                        for step, resp in executed:
+                            if "fields" in step.payload:
+                                resp.raise_for_status()
+                                outcome["last_seen_updated"] = last_seen_value
+                            if step.is_transition and succeeded(resp):
+                                outcome["status_updated"] = issue.status
+                                return transition_id
+
+                        if issue.status is None or not transition_id:
+                            return None
+
+                        # The shared id does not apply to this issue's current state; look up its own
+                        own_transition_id = await find_transition_id(client, JIRA_URL, issue.issue_id, issue.status)
+                        if not own_transition_id or own_transition_id == transition_id:
+                            outcome["status_error"] = f"No transition to {issue.status}"
+                            return None
+                        resp = await client.post(
+                            f"{JIRA_URL}/rest/api/3/issue/{issue.issue_id}/transitions",
+                            json={"transition": {"id": own_transition_id}}
+                        )
+                        resp.raise_for_status()
+                        outcome["status_updated"] = issue.status
+                        return own_transition_id
+                    except httpx.HTTPError as e:
+                        outcome["error" if outcome["last_seen_updated"] is None else "status_error"] = str(e)
+                        return None
+
+            async def update_group(indexes):
+                # Resolve the transition on the first issue, then reuse it for the rest of the group
+                transition_id = await update_issue(indexes[0])
+                await asyncio.gather(*(update_issue(index, transition_id) for index in indexes[1:]))
+
+            # Transitions belong to the project's workflow; numeric issue ids carry no
+            # project, so each of those resolves its own
+            by_workflow = {}
+            for index, issue in enumerate(input.issues):
+                if issue.status is not None:
+                    project = issue.issue_id.rsplit("-", 1)[0] if "-" in issue.issue_id else index
+                    by_workflow.setdefault((project, issue.status.lower()), []).append(index)
+
+            await asyncio.gather(
+                *(update_issue(index) for index, issue in enumerate(input.issues) if issue.status is None),
+                *(update_group(indexes) for indexes in by_workflow.values())
+            )
+
+    results = outcomes
+    return {
+        "success": not any("error" in result or "status_error" in result for result in results),
+        "last_seen_updated": last_seen_value,
+        "updated": sum(1 for result in results if result["last_seen_updated"]),
+        "results": results
+    }
+
 
 # -----------------------------
 # Entry Point
@@ -0,0 +1,153 @@
+"""
+Incremental watching of Jira searches.
+
+A watcher asks Jira only for the tickets of its search updated since its high-water
+mark, the latest "updated" timestamp it has returned, so a poll costs as much as the
+changes since the previous poll instead of the size of a time window. JQL compares
+dates to the minute, so a poll searches from the start of the watermark's minute;
+tickets of that minute that were returned already are recognised by key and updated
+timestamp and skipped. When they fill whole pages, e.g. after a bulk edit, the poll
+pages past them to the first change.
+
+The state of every watcher is kept in a JSON file and saved after each poll, so a
+restarted server carries on where it stopped. Tickets are reported once: a poll that
+returned them has moved the watermark past them.
+"""
+import logging
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+from mcp_tools.codec import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+WATCH_FORMAT = 1
+DEFAULT_WATCH_PATH = os.path.join(os.path.expanduser("~"), ".cache", "flowfabric-ai-agents", "ticket-watch.json")
+
+# Jira's timestamp format, e.g. 2025-09-23T07:35:46.553-0700
+JIRA_TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S.%f%z"
+
+
+def parse_timestamp(value: str) -> datetime:
+    return datetime.strptime(value, JIRA_TIMESTAMP_FORMAT)
+
+
+@dataclass
+class WatchState:
+    # Latest updated timestamp returned, as Jira formatted it
+    watermark: Optional[str] = None
+    # Updated timestamp by key of the tickets returned from the watermark's minute
+    seen: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class Change:
+    issue: Dict[str, Any]
+    # "created" for a ticket created since the previous poll, "updated" otherwise
+    kind: str
+
+
+def changes_query(jql: str, state: WatchState, since_hours: int = 24) -> str:
+    """JQL for the tickets of jql updated since the watermark, oldest change first"""
+    if state.watermark:
+        # Jira reports timestamps in the searching user's time zone, the one JQL dates
+        # are read in, so the watermark's own local time is used
+        since = f'"{parse_timestamp(state.watermark).strftime("%Y-%m-%d %H:%M")}"'
+    else:
+        since = f"-{since_hours}h"
+    return f"({jql}) AND updated >= {since} ORDER BY updated ASC"
+
+
+def take_changes(state: WatchState, issues: List[Dict[str, Any]], since_hours: int = 24) -> List[Change]:
+    """The issues of a poll not returned before; moves state past them"""
+    if state.watermark:
+        previous = parse_timestamp(state.watermark).replace(second=0, microsecond=0)
+    else:
+        previous = datetime.now(timezone.utc) - timedelta(hours=since_hours)
+
+    changes = []
+    latest = dict(state.seen)
+    watermark = state.watermark
+    for issue in issues:
+        fields = issue.get("fields") or {}
+        updated = fields.get("updated")
+        if not updated or state.seen.get(issue["key"]) == updated:
+            continue
+        created = fields.get("created")
+        kind = "created" if created and parse_timestamp(created) >= previous else "updated"
+        changes.append(Change(issue, kind))
+        latest[issue["key"]] = updated
+        if watermark is None or parse_timestamp(updated) > parse_timestamp(watermark):
+            watermark = updated
+
+    if watermark is not None:
+        # Only tickets of the watermark's minute can be returned by the next poll again
+        minute = parse_timestamp(watermark).replace(second=0, microsecond=0)
+        state.watermark = watermark
+        state.seen = {key: updated for key, updated in latest.items() if parse_timestamp(updated) >= minute}
+    return changes
+
+
+class TicketWatchStore:
+    """Watcher states by name, kept in a JSON file"""
+
+    def __init__(self, path: str = DEFAULT_WATCH_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def watching(self, name: str) -> Iterator[WatchState]:
+        """
+        Yield the state of watcher name and save it after the block. Polls of the
+        store run one at a time; a failed poll leaves the saved state as it was.
+        """
+        with self._lock:
+            states = self._read()
+            state = self._decode(states.get(name))
+            yield state
+            states[name] = {"watermark": state.watermark, "seen": state.seen}
+            self._write(states)
+
+    def reset(self, name: str) -> None:
+        with self._lock:
+            states = self._read()
+            if states.pop(name, None) is not None:
+                self._write(states)
+
+    @staticmethod
+    def _decode(saved: Optional[Dict[str, Any]]) -> WatchState:
+        if not saved:
+            return WatchState()
+        return WatchState(saved.get("watermark"), dict(saved.get("seen") or {}))
+
+    def _read(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, "rb") as state_file:
+                saved = loads(state_file.read())
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable ticket watch state %s: %s", self.path, e)
+            return {}
+        if not isinstance(saved, dict) or saved.get("format") != WATCH_FORMAT:
+            return {}
+        return saved.get("watchers") or {}
+
+    def _write(self, states: Dict[str, Any]) -> None:
+        directory = os.path.dirname(self.path) or "."
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".ticket-watch-")
+            with os.fdopen(fd, "wb") as tmp_file:
+                tmp_file.write(dumps({"format": WATCH_FORMAT, "watchers": states}))
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning("Could not save ticket watch state to %s: %s", self.path, e)
+
+
+ticket_watch = TicketWatchStore()
@@ -1,15 +1,25 @@
 import httpx
-import os
 import subprocess
 from urllib.parse import quote
 from dotenv import load_dotenv
 from fastmcp import FastMCP
 from pydantic import BaseModel
 
+from mcp_tools.adf import word_after
+from mcp_tools.codec import decode_response
+from mcp_tools.credentials import getenv
+from mcp_tools.outbound import outbound
+from mcp_tools.pagination import result_buffer
+from mcp_tools.prefetch import warm_results
+from mcp_tools.records import Issue
+
 load_dotenv()
 
 mcp = FastMCP("version-support-assistant")
 
+# Version support tickets link their release notes after this label
+RELEASE_NOTES_LABEL = "Release Information:"
+
 
 # -----------------------------
 # Schemas
@@ -18,6 +28,7 @@ class TicketFetchInput(BaseModel):
     type: str = "Version Support"   # <-- default set here
     status: str = "To Triage"   # <-- default set here
     limit: int = 100
+    cursor: str | None = None   # next_cursor of a previous call; other fields are then ignored
 
 
 class TicketOutput(BaseModel):
@@ -31,6 +42,8 @@ class TicketOutput(BaseModel):
 
 class TicketFetchOutput(BaseModel):
     tickets: list[TicketOutput]
+    next_cursor: str | None = None
+    remaining: int = 0
 
 
 class CommentInput(BaseModel):
@@ -73,33 +86,15 @@ def extract_text_from_description(desc):
     """Extract only the release notes URL from Jira description"""
     if not desc:
         return None
-    
-    def extract_from_content(content_list):
-        text_parts = []
-        for item in content_list:
-            if item.get("type") == "text":
-                text_parts.append(item.get("text", ""))
-            elif item.get("type") == "paragraph" and "content" in item:
-                text_parts.extend(extract_from_content(item["content"]))
-        return text_parts
-    
-    full_text = ""
-    if isinstance(desc, dict) and "content" in desc:
-        text_parts = extract_from_content(desc["content"])
-        full_text = "".join(text_parts).strip()
-    elif isinstance(desc, str):
-        full_text = desc
-    else:
-        return None
-    
-    # Extract URL after "Release Information:"
-    if "Release Information:" in full_text:
-        parts = full_text.split("Release Information:", 1)
-        if len(parts) > 1:
-            url_part = parts[1].strip().split()[0]  # Get first word after colon
-            return url_part
-    
-    return None
+    return word_after(desc, RELEASE_NOTES_LABEL)
+
+def page_output(page):
+    """Validate one page of ticket dicts into the tool output in a single call"""
+    return TicketFetchOutput.model_validate({
+        "tickets": page.items,
+        "next_cursor": page.next_cursor,
+        "remaining": page.remaining
+    })
 
 # -----------------------------
 # MCP Tool Implementation
@@ -108,11 +103,15 @@ def extract_text_from_description(desc):
 async def fetch_tickets(input: TicketFetchInput) -> TicketFetchOutput:
     """
     Fetch version support tickets from Jira based on type and status.
+    Large results are paged: pass the returned next_cursor as cursor to get the next page.
     Requires JIRA_URL, JIRA_USER, JIRA_TOKEN in environment.
     """
-    JIRA_URL = os.getenv("JIRA_URL")
-    JIRA_USER = os.getenv("JIRA_USER")
-    JIRA_TOKEN = os.getenv("JIRA_TOKEN")
+    if input.cursor:
+        return page_output(result_buffer.next_page("ticket.fetch", input.cursor))
+
+    JIRA_URL = getenv("JIRA_URL")
+    JIRA_USER = getenv("JIRA_USER")
+    JIRA_TOKEN = getenv("JIRA_TOKEN")
 
     if not all([JIRA_URL, JIRA_USER, JIRA_TOKEN]):
         raise RuntimeError("Missing Jira credentials in .env")
@@ -120,29 +119,35 @@ async def fetch_tickets(input: TicketFetchInput) -> TicketFetchOutput:
     jql = f'project = "CON" AND type = "{input.type}" AND status = "{input.status}" ORDER BY created DESC'
     url = f"{JIRA_URL}/rest/api/3/search/jql"
 
-    async with httpx.AsyncClient(auth=(JIRA_USER, JIRA_TOKEN)) as client:
-        resp = await client.get(url, params={
-            "jql": jql, 
-            "maxResults": input.limit,
-            "fields": "key,summary,status,assignee,created,description"
-        })
-        resp.raise_for_status()
-        data = resp.json()
-
-    tickets = [
-        TicketOutput(
-            id=issue["key"],
-            summary=issue["fields"]["summary"],
-            status=issue["fields"]["status"]["name"],
-            assignee=(issue["fields"]["assignee"]["displayName"]
-                      if issue["fields"].get("assignee") else None),
-            releaseNotes=extract_text_from_description(issue["fields"].get("description")),
-            created=issue["fields"]["created"]
-        )
-        for issue in data.get("issues", [])
-    ]
-
-    return TicketFetchOutput(tickets=tickets)
+    # The morning "To Triage" query is usually prefetched; Jira permissions differ per user
+    warm_key = ("ticket.fetch", JIRA_URL, JIRA_USER, jql, input.limit)
+    tickets = warm_results.get(warm_key)
+    if tickets is None:
+        async with httpx.AsyncClient(auth=(JIRA_USER, JIRA_TOKEN), transport=outbound.async_transport()) as client:
+            resp = await client.get(url, params={
+                "jql": jql, 
+                "maxResults": input.limit,
+                "fields": "key,summary,status,assignee,created,description"
+            })
+            resp.raise_for_status()
+            data = decode_response(resp)
+
+        issues = [Issue.from_json(issue) for issue in data.get("issues", [])]
+        tickets = [
+            {
+                "id": issue.key,
+                "summary": issue.summary,
+                "status": issue.status,
+                "assignee": issue.assignee,
+                "releaseNotes": extract_text_from_description(issue.description),
+                "created": issue.created
+            }
+            for issue in issues
+        ]
+        warm_results.put(warm_key, tickets)
+
+    # Large results come back a page at a time; the rest is served from the buffer
+    return page_output(result_buffer.paginate("ticket.fetch", tickets))
 
 
 @mcp.tool("ticket.comment")
@@ -151,9 +156,9 @@ async def add_comment(input: CommentInput) -> CommentOutput:
     Add a comment to a Jira ticket.
     Requires JIRA_URL, JIRA_USER, JIRA_TOKEN in environment.
     """
-    JIRA_URL = os.getenv("JIRA_URL")
-    JIRA_USER = os.getenv("JIRA_USER")
-    JIRA_TOKEN = os.getenv("JIRA_TOKEN")
+    JIRA_URL = getenv("JIRA_URL")
+    JIRA_USER = getenv("JIRA_USER")
+    JIRA_TOKEN = getenv("JIRA_TOKEN")
 
     if not all([JIRA_URL, JIRA_USER, JIRA_TOKEN]):
         return CommentOutput(success=False, error="Missing Jira credentials in .env")
@@ -162,10 +167,10 @@ async def add_comment(input: CommentInput) -> CommentOutput:
     payload = {"body": {"type": "doc", "version": 1, "content": [{"type": "paragraph", "content": [{"type": "text", "text": input.comment}]}]}}
 
     try:
-        async with httpx.AsyncClient(auth=(JIRA_USER, JIRA_TOKEN)) as client:
+        async with httpx.AsyncClient(auth=(JIRA_USER, JIRA_TOKEN), transport=outbound.async_transport()) as client:
             resp = await client.post(url, json=payload)
             resp.raise_for_status()
-            data = resp.json()
+            data = decode_response(resp)
             return CommentOutput(success=True, comment_id=data.get("id"))
     except Exception as e:
         return CommentOutput(success=False, error=str(e))
@@ -177,9 +182,9 @@ async def accept_ticket(input: StatusUpdateInput) -> StatusUpdateOutput:
     Update Jira ticket status to Accepted.
     Requires JIRA_URL, JIRA_USER, JIRA_TOKEN in environment.
     """
-    JIRA_URL = os.getenv("JIRA_URL")
-    JIRA_USER = os.getenv("JIRA_USER")
-    JIRA_TOKEN = os.getenv("JIRA_TOKEN")
+    JIRA_URL = getenv("JIRA_URL")
+    JIRA_USER = getenv("JIRA_USER")
+    JIRA_TOKEN = getenv("JIRA_TOKEN")
 
     if not all([JIRA_URL, JIRA_USER, JIRA_TOKEN]):
         return StatusUpdateOutput(success=False, error="Missing Jira credentials in .env")
@@ -188,10 +193,12 @@ async def accept_ticket(input: StatusUpdateInput) -> StatusUpdateOutput:
     payload = {"transition": {"id": "71"}}
 
     try:
-        async with httpx.AsyncClient(auth=(JIRA_USER, JIRA_TOKEN)) as client:
+        async with httpx.AsyncClient(auth=(JIRA_USER, JIRA_TOKEN), transport=outbound.async_transport()) as client:
             resp = await client.post(url, json=payload)
             resp.raise_for_status()
-            return StatusUpdateOutput(success=True)
+        # A prefetched search would still list the ticket with its old status
+        warm_results.discard(lambda key: key[0] == "ticket.fetch")
+        return StatusUpdateOutput(success=True)
     except Exception as e:
         return StatusUpdateOutput(success=False, error=str(e))
 
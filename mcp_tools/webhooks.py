@@ -0,0 +1,336 @@
+"""
+Receiver for Jira and Jenkins webhooks.
+
+An optional HTTP endpoint next to the MCP server (run_server.py --webhook-port) that
+lets Jira and Jenkins push their changes instead of the server polling for them:
+
+- POST /webhooks/jira: Jira issue webhooks (jira:issue_created, _updated, _deleted)
+- POST /webhooks/jenkins: build notifications of the Jenkins Notification plugin
+
+Every delivery is authenticated with the shared secret WEBHOOK_SECRET, either by an
+X-Hub-Signature header "sha256=<HMAC-SHA256 of the body>", as Jira sends for webhooks
+with a secret, or by the secret itself as X-Webhook-Token header or token query
+parameter, for senders that cannot sign.
+
+An issue event drops the prefetched Jira searches that may include its issue type, so
+the next call sees the change. Events then trigger the pipelines configured for them
+in a JSON file (--webhook-config, see webhooks.example.json), such as triage of a
+finished build or preparing a new sign-off ticket. Pipelines run one at a time in a
+background thread at batch priority; deliveries are answered without waiting for them.
+
+To try it without Jira or Jenkins, replay a recorded payload against a running receiver:
+python -m mcp_tools.webhooks replay jira tests/webhook_payloads/jira_issue_created.json
+"""
+import argparse
+import fnmatch
+import hashlib
+import hmac
+import importlib
+import json
+import logging
+import os
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Hashable, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from mcp_tools.cache import LRUCache
+from mcp_tools.outbound import Priority, priority
+from mcp_tools.prefetch import warm_results
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WEBHOOK_HOST = "127.0.0.1"
+DEFAULT_WEBHOOK_PORT = 8765
+MAX_BODY_BYTES = 1024 * 1024
+SIGNATURE_HEADER = "X-Hub-Signature"
+TOKEN_HEADER = "X-Webhook-Token"
+
+EVENTS = ("issue_created", "issue_updated", "issue_deleted", "build_completed")
+# Jenkins notifies every phase of a build; these mean it has finished
+BUILD_DONE_PHASES = ("COMPLETED", "FINALIZED")
+
+
+def sign(secret: str, body: bytes) -> str:
+    """The X-Hub-Signature value for body"""
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+def is_authentic(secret: str, body: bytes, headers, query: Dict[str, List[str]]) -> bool:
+    signature = headers.get(SIGNATURE_HEADER)
+    if signature:
+        return hmac.compare_digest(signature, sign(secret, body))
+    token = headers.get(TOKEN_HEADER) or (query.get("token") or [""])[0]
+    return bool(token) and hmac.compare_digest(token, secret)
+
+
+# -----------------------------
+# Events
+# -----------------------------
+
+@dataclass(frozen=True)
+class WebhookEvent:
+    # One of EVENTS
+    name: str
+    payload: Dict[str, Any]
+    # Identifies a delivery, so a repeated one is handled once
+    delivery: Hashable
+
+    @property
+    def issue(self) -> Dict[str, Any]:
+        return self.payload.get("issue") or {}
+
+    @property
+    def issue_type(self) -> Optional[str]:
+        return ((self.issue.get("fields") or {}).get("issuetype") or {}).get("name")
+
+    @property
+    def job(self) -> Optional[str]:
+        return self.payload.get("name")
+
+    @property
+    def build_number(self) -> Optional[int]:
+        return (self.payload.get("build") or {}).get("number")
+
+
+def jira_event(payload: Dict[str, Any]) -> Optional[WebhookEvent]:
+    """The event of a Jira webhook; None for events other than issue changes"""
+    name = payload.get("webhookEvent", "")
+    if name not in ("jira:issue_created", "jira:issue_updated", "jira:issue_deleted"):
+        return None
+    key = (payload.get("issue") or {}).get("key")
+    return WebhookEvent(name.split(":", 1)[1], payload, ("jira", name, key, payload.get("timestamp")))
+
+
+def jenkins_event(payload: Dict[str, Any]) -> Optional[WebhookEvent]:
+    """The event of a Jenkins notification; None until the build has finished"""
+    build = payload.get("build") or {}
+    if build.get("phase") not in BUILD_DONE_PHASES or build.get("number") is None:
+        return None
+    # COMPLETED and FINALIZED of one build are one event
+    return WebhookEvent("build_completed", payload, ("jenkins", payload.get("name"), build["number"]))
+
+
+EVENT_PARSERS: Dict[str, Callable[[Dict[str, Any]], Optional[WebhookEvent]]] = {
+    "jira": jira_event,
+    "jenkins": jenkins_event,
+}
+
+
+# -----------------------------
+# Pipelines
+# -----------------------------
+# Assistant modules are imported when a pipeline first runs, like their tools
+
+def triage_build(event: WebhookEvent) -> None:
+    """Failed tests of the finished build, which also fills the build failures cache"""
+    tests_triaging = importlib.import_module("mcp_tools.tests_triaging_assistant")
+    result = tests_triaging.fetch_build_failures(event.job, event.build_number)
+    logger.info(
+        "Triaged %s #%s: %d failed tests", event.job, event.build_number, len(result.get("failed_tests", []))
+    )
+
+
+def prepare_signoff(event: WebhookEvent) -> None:
+    """Fill in previous versions and related task links of a sign-off ticket"""
+    release_signoff = importlib.import_module("mcp_tools.release_signoff_assistant")
+    fix_versions = (event.issue.get("fields") or {}).get("fixVersions") or []
+    if not fix_versions:
+        logger.info("Sign-off ticket %s has no fix version yet; not prepared", event.issue.get("key"))
+        return
+
+    version = fix_versions[0]["name"]
+    steps = (
+        release_signoff.update_ticket_with_previous_versions(
+            release_signoff.UpdateTicketWithPreviousVersionsRequest(current_version=version)
+        ),
+        release_signoff.link_task_urls(release_signoff.UpdateTicketWithTaskUrlsRequest(current_version=version)),
+    )
+    for result in steps:
+        if result.get("success") is False:
+            raise RuntimeError(result.get("error"))
+
+
+PIPELINES: Dict[str, Callable[[WebhookEvent], None]] = {
+    "triage_build": triage_build,
+    "prepare_signoff": prepare_signoff,
+}
+
+
+class PipelineRule:
+    """Run a pipeline on an event, optionally only for some jobs (shell-style patterns) or an issue type"""
+
+    def __init__(self, event: str, pipeline: str, jobs: Optional[List[str]] = None, issue_type: Optional[str] = None):
+        if event not in EVENTS:
+            raise ValueError(f"Unknown webhook event {event!r}; expected one of {', '.join(EVENTS)}")
+        if pipeline not in PIPELINES:
+            raise ValueError(f"Unknown webhook pipeline {pipeline!r}; expected one of {', '.join(PIPELINES)}")
+        self.event = event
+        self.pipeline = pipeline
+        self.jobs = jobs
+        self.issue_type = issue_type
+
+    def matches(self, event: WebhookEvent) -> bool:
+        if event.name != self.event:
+            return False
+        if self.jobs is not None and not any(fnmatch.fnmatchcase(event.job or "", job) for job in self.jobs):
+            return False
+        return self.issue_type is None or event.issue_type == self.issue_type
+
+
+# -----------------------------
+# Receiver
+# -----------------------------
+
+def _mentions_issue_type(issue_type: str) -> Callable[[Hashable], bool]:
+    """Whether a warm_results key has a JQL query for issue_type"""
+    quoted = f'"{issue_type}"'
+    return lambda key: any(isinstance(part, str) and quoted in part for part in key)
+
+
+class WebhookReceiver:
+    def __init__(
+        self,
+        secret: Optional[str] = None,
+        rules: Optional[List[PipelineRule]] = None,
+        host: str = DEFAULT_WEBHOOK_HOST,
+        port: int = 0
+    ):
+        self.secret = secret or os.getenv("WEBHOOK_SECRET")
+        if not self.secret:
+            raise ValueError("Set WEBHOOK_SECRET to receive webhooks")
+        self.rules = rules or []
+        self.host = host
+        self.port = port
+        self._handled = LRUCache(maxsize=1024)
+        self._pipelines = ThreadPoolExecutor(max_workers=1, thread_name_prefix="webhook-pipeline")
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_config(cls, path: Optional[str] = None, **kwargs) -> "WebhookReceiver":
+        rules = []
+        if path:
+            with open(path, encoding="utf-8") as config_file:
+                config = json.load(config_file)
+            rules = [PipelineRule(**entry) for entry in config.get("pipelines", [])]
+        return cls(rules=rules, **kwargs)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def handle(self, source: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Apply an authenticated delivery; returns what was done about it"""
+        event = EVENT_PARSERS[source](payload)
+        if event is None:
+            return {"event": None}
+        if event.delivery in self._handled:
+            return {"event": event.name, "duplicate": True}
+        self._handled.set(event.delivery, True)
+
+        if event.name.startswith("issue_") and event.issue_type:
+            dropped = warm_results.discard(_mentions_issue_type(event.issue_type))
+            logger.debug("%s of %s dropped %d prefetched searches", event.name, event.issue.get("key"), dropped)
+
+        pipelines = [rule.pipeline for rule in self.rules if rule.matches(event)]
+        for name in pipelines:
+            self._pipelines.submit(self._run_pipeline, name, event)
+        return {"event": event.name, "pipelines": pipelines}
+
+    @staticmethod
+    def _run_pipeline(name: str, event: WebhookEvent) -> None:
+        try:
+            with priority(Priority.BATCH):
+                PIPELINES[name](event)
+        except Exception:
+            logger.exception("Webhook pipeline %s failed for %s", name, event.delivery)
+
+    def start(self) -> None:
+        self._server = ThreadingHTTPServer((self.host, self.port), _WebhookHandler)
+        self._server.daemon_threads = True
+        self._server.receiver = self
+        # A short poll interval keeps stop() quick
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, name="webhooks", daemon=True
+        )
+        self._thread.start()
+        logger.info("Receiving webhooks at %s/webhooks/", self.url)
+
+    def stop(self, wait: bool = True) -> None:
+        """Stop receiving; with wait, let the queued pipelines finish first"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        self._pipelines.shutdown(wait=wait, cancel_futures=not wait)
+
+
+class _WebhookHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        parts = urlsplit(self.path)
+        source = parts.path.rstrip("/").removeprefix("/webhooks/")
+        if source not in EVENT_PARSERS:
+            return self._reply(404, {"error": f"No webhook at {parts.path}"})
+
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            return self._reply(413, {"error": "Payload too large"})
+        body = self.rfile.read(length)
+
+        receiver: WebhookReceiver = self.server.receiver
+        if not is_authentic(receiver.secret, body, self.headers, parse_qs(parts.query)):
+            return self._reply(401, {"error": "Invalid signature or token"})
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            return self._reply(400, {"error": "Payload is not JSON"})
+        if not isinstance(payload, dict):
+            return self._reply(400, {"error": "Payload is not a JSON object"})
+
+        self._reply(202, receiver.handle(source, payload))
+
+    def _reply(self, status: int, body: Dict[str, Any]) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        logger.debug("Webhook %s - %s", self.address_string(), format % args)
+
+
+# -----------------------------
+# Replay
+# -----------------------------
+
+def replay(url: str, source: str, body: bytes, secret: str) -> Dict[str, Any]:
+    """Post a recorded payload to a receiver, signed like Jira signs it"""
+    request = urllib.request.Request(
+        f"{url.rstrip('/')}/webhooks/{source}",
+        data=body,
+        headers={"Content-Type": "application/json", SIGNATURE_HEADER: sign(secret, body)},
+        method="POST"
+    )
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay recorded webhook payloads against a running receiver")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    replay_parser = subcommands.add_parser("replay")
+    replay_parser.add_argument("source", choices=sorted(EVENT_PARSERS))
+    replay_parser.add_argument("payloads", nargs="+", metavar="PAYLOAD")
+    replay_parser.add_argument("--url", default=f"http://{DEFAULT_WEBHOOK_HOST}:{DEFAULT_WEBHOOK_PORT}")
+    args = parser.parse_args()
+
+    for path in args.payloads:
+        with open(path, "rb") as payload_file:
+            print(path, replay(args.url, args.source, payload_file.read(), os.environ["WEBHOOK_SECRET"]))
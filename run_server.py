@@ -1,26 +1,197 @@
 """
 Entry point for running the MCP server.
-This file imports all MCP tools and starts the FastMCP server.
+This file registers all MCP tools and starts the FastMCP server.
+
+By default the server runs on stdio, one process per client. With --transport sse or
+--transport streamable-http one long-lived server serves many clients over HTTP and
+shares its caches between them; each client sends its own credentials as request
+headers (see mcp_tools/credentials.py).
 """
+import argparse
+import asyncio
+import os
+import signal
 
-from mcp_tools.version_support_assistant import mcp as version_support_mcp
-from mcp_tools.tests_triaging_assistant import mcp as tests_triaging_mcp
-from mcp_tools.release_signoff_assistant import mcp as release_signoff_mcp
+from dotenv import load_dotenv
 from fastmcp import FastMCP
 
+from mcp_tools.credentials import credentials_from_headers, session_credentials
+from mcp_tools.prefetch import PrefetchScheduler
+from mcp_tools.registry import register_lazy_tools
+from mcp_tools.snapshot import DEFAULT_SNAPSHOT_PATH, snapshots
+from mcp_tools.webhooks import DEFAULT_WEBHOOK_HOST, WebhookReceiver
+
+# FASTMCP_* server settings may come from .env
+load_dotenv()
+
+TRANSPORTS = ["stdio", "sse", "streamable-http"]
+
+
+class CombinedMCP(FastMCP):
+    async def call_tool(self, name, arguments):
+        """
+        Call a tool with the credentials sent by the calling HTTP client. A client
+        that sends none gets none: the server's own secrets are for stdio use only.
+        """
+        try:
+            request = self._mcp_server.request_context.request
+        except LookupError:
+            request = None
+
+        credentials = credentials_from_headers(request.headers) if request is not None else None
+        with session_credentials(credentials):
+            return await super().call_tool(name, arguments)
+
+
 # Create a combined MCP server
-combined_mcp = FastMCP("flowfabric-ai-agents")
+combined_mcp = CombinedMCP("flowfabric-ai-agents")
+
+# Register the tools of all assistants from the manifest; each assistant module is
+# imported on the first call of one of its tools, which receives the combined
+# server's Context, so progress reaches clients
+register_lazy_tools(combined_mcp)
+
+
+def sse_app(server: FastMCP):
+    """Starlette app serving the MCP SSE transport at /sse and /messages/"""
+    from mcp.server.sse import SseServerTransport
+    from starlette.applications import Starlette
+    from starlette.responses import Response
+    from starlette.routing import Mount, Route
+
+    sse = SseServerTransport("/messages/")
+
+    async def handle_sse(request):
+        async with sse.connect_sse(request.scope, request.receive, request._send) as streams:
+            await server._mcp_server.run(
+                streams[0], streams[1], server._mcp_server.create_initialization_options()
+            )
+        # The stream has been answered already; this only completes the request cleanly
+        return Response()
+
+    return Starlette(
+        debug=server.settings.debug,
+        routes=[
+            Route("/sse", endpoint=handle_sse),
+            Mount("/messages/", app=sse.handle_post_message),
+        ]
+    )
+
+
+def streamable_http_app(server: FastMCP):
+    """Starlette app serving the MCP streamable HTTP transport at /mcp"""
+    # Needs an mcp SDK with streamable HTTP support (mcp>=1.8)
+    from contextlib import asynccontextmanager
+    from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+    from starlette.applications import Starlette
+    from starlette.routing import Route
+
+    session_manager = StreamableHTTPSessionManager(app=server._mcp_server)
+
+    class MCPEndpoint:
+        async def __call__(self, scope, receive, send):
+            await session_manager.handle_request(scope, receive, send)
+
+    @asynccontextmanager
+    async def lifespan(app):
+        async with session_manager.run():
+            yield
+
+    return Starlette(
+        debug=server.settings.debug,
+        routes=[Route("/mcp", endpoint=MCPEndpoint(), methods=["GET", "POST", "DELETE"])],
+        lifespan=lifespan
+    )
+
+
+HTTP_APPS = {"sse": sse_app, "streamable-http": streamable_http_app}
+
+
+async def run_http(server: FastMCP, transport: str) -> None:
+    """Serve one long-lived server to many clients over HTTP"""
+    import uvicorn
+
+    config = uvicorn.Config(
+        HTTP_APPS[transport](server),
+        host=server.settings.host,
+        port=server.settings.port,
+        log_level=server.settings.log_level.lower()
+    )
+    await uvicorn.Server(config).serve()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the FlowFabric AI agents MCP server")
+    parser.add_argument("--transport", choices=TRANSPORTS, default="stdio",
+                        help="stdio (default) for one client, sse or streamable-http to serve many")
+    parser.add_argument("--host", help="HTTP bind address (default: FASTMCP_HOST or 0.0.0.0)")
+    parser.add_argument("--port", type=int, help="HTTP port (default: FASTMCP_PORT or 8000)")
+    parser.add_argument("--cache-snapshot", default=DEFAULT_SNAPSHOT_PATH, metavar="PATH",
+                        help="file the caches are saved to on shutdown and restored from on start")
+    parser.add_argument("--no-cache-snapshot", dest="cache_snapshot", action="store_const", const=None,
+                        help="start with empty caches and do not save them")
+    parser.add_argument("--prefetch-config", metavar="PATH",
+                        help="JSON schedule of background prefetches (see mcp_tools/prefetch.py)")
+    parser.add_argument("--webhook-port", type=int, metavar="PORT",
+                        help="receive Jira and Jenkins webhooks on this port (needs WEBHOOK_SECRET)")
+    parser.add_argument("--webhook-host", default=DEFAULT_WEBHOOK_HOST,
+                        help=f"webhook bind address (default: {DEFAULT_WEBHOOK_HOST})")
+    parser.add_argument("--webhook-config", metavar="PATH",
+                        help="JSON pipelines run on webhook events (see mcp_tools/webhooks.py)")
+    return parser.parse_args(argv)
+
+
+# Set when SIGTERM stopped the server
+terminated = False
+
+
+def stop(signum, frame):
+    """Unwind main like Ctrl+C, so the snapshot is saved by its clean-up and not here,
+    where the interrupted code may hold the locks of the caches"""
+    global terminated
+    terminated = True
+    raise KeyboardInterrupt
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.host:
+        combined_mcp.settings.host = args.host
+    if args.port:
+        combined_mcp.settings.port = args.port
+
+    if args.cache_snapshot:
+        snapshots.enable(args.cache_snapshot)
+        # IDEs stop stdio servers with SIGTERM
+        signal.signal(signal.SIGTERM, stop)
+
+    scheduler = PrefetchScheduler.from_config(args.prefetch_config) if args.prefetch_config else None
+    if scheduler:
+        scheduler.start()
 
-# Register tools from all MCP instances
-for tool_name, tool_func in version_support_mcp._tools.items():
-    combined_mcp._tools[tool_name] = tool_func
+    receiver = None
+    if args.webhook_port is not None:
+        receiver = WebhookReceiver.from_config(args.webhook_config, host=args.webhook_host, port=args.webhook_port)
+        receiver.start()
 
-for tool_name, tool_func in tests_triaging_mcp._tools.items():
-    combined_mcp._tools[tool_name] = tool_func
+    try:
+        if args.transport == "stdio":
+            combined_mcp.run("stdio")
+        else:
+            asyncio.run(run_http(combined_mcp, args.transport))
+    finally:
+        if scheduler:
+            # A task that is still running finishes in the background thread
+            scheduler.stop(timeout=5)
+        if receiver:
+            # Pipelines that have not started yet are dropped
+            receiver.stop(wait=False)
+        snapshots.save()
+        if terminated:
+            # Exit at once like the default handler does; a normal exit would wait for
+            # the thread blocked reading stdin
+            os._exit(0)
 
-for tool_name, tool_func in release_signoff_mcp._tools.items():
-    combined_mcp._tools[tool_name] = tool_func
 
 if __name__ == "__main__":
-    # Start the combined MCP server on stdio
-    combined_mcp.run()
+    main()
@@ -108,4 +108,11 @@ def mock_subprocess():
         mock_result.returncode = 0
         mock_result.stderr = "remote: Change-Id: I1234567890abcdef"
         mock_run.return_value = mock_result
-        yield mock_run
\ No newline at end of file
+        yield mock_run
+
+@pytest.fixture(autouse=True)
+def clear_rejected_merges():
+    """Forget Jira write merges rejected in other tests."""
+    from mcp_tools.jira_writes import _rejected_merges
+    _rejected_merges.clear()
+    yield
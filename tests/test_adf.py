@@ -0,0 +1,170 @@
+"""
+Unit tests for the ADF traversal helpers.
+"""
+import pytest
+from mcp_tools.adf import (
+    doc,
+    find,
+    hard_break,
+    inline_card,
+    iter_text,
+    paragraph,
+    text,
+    to_markdown,
+    walk
+)
+
+
+@pytest.mark.unit
+class TestWalk:
+    """Test iterative traversal of ADF documents."""
+
+    def test_visits_nested_nodes_in_document_order(self):
+        """Test that lists, tables and panels are descended into."""
+        doc = {
+            "type": "doc",
+            "content": [
+                {"type": "paragraph", "content": [text("a")]},
+                {"type": "bulletList", "content": [
+                    {"type": "listItem", "content": [{"type": "paragraph", "content": [text("b")]}]}
+                ]},
+                {"type": "table", "content": [
+                    {"type": "tableRow", "content": [
+                        {"type": "tableCell", "content": [{"type": "panel", "content": [
+                            {"type": "paragraph", "content": [text("c")]}
+                        ]}]}
+                    ]}
+                ]}
+            ]
+        }
+
+        assert list(iter_text(doc)) == ["a", "b", "c"]
+
+    def test_prune_skips_children(self):
+        """Test that pruned nodes are yielded but their subtree is not."""
+        doc = {"type": "doc", "content": [
+            {"type": "codeBlock", "content": [text("skipped")]},
+            {"type": "paragraph", "content": [text("kept")]}
+        ]}
+
+        types = [node["type"] for node in walk(doc, prune=lambda node: node["type"] == "codeBlock")]
+
+        assert types == ["doc", "codeBlock", "paragraph", "text"]
+
+    def test_deep_document_does_not_recurse(self):
+        """Test that nesting beyond the recursion limit is handled."""
+        doc = text("leaf")
+        for _ in range(5000):
+            doc = {"type": "bulletList", "content": [doc]}
+
+        assert list(iter_text(doc)) == ["leaf"]
+
+    def test_malformed_nodes_are_ignored(self):
+        """Test that non-dict nodes and non-list content are skipped."""
+        doc = {"type": "doc", "content": [None, "x", {"type": "paragraph", "content": "bad"}, text("ok")]}
+
+        assert list(iter_text(doc)) == ["ok"]
+        assert list(walk("not a doc")) == []
+
+    def test_find_returns_first_match(self):
+        """Test that find stops at the first matching node."""
+        doc = {"type": "doc", "content": [
+            {"type": "inlineCard", "attrs": {"url": "first"}},
+            {"type": "inlineCard", "attrs": {"url": "second"}}
+        ]}
+
+        assert find(doc, lambda node: node["type"] == "inlineCard")["attrs"]["url"] == "first"
+        assert find(doc, lambda node: node["type"] == "table") is None
+
+
+@pytest.mark.unit
+class TestBuilders:
+    """Test the ADF node builders."""
+
+    def test_builds_nodes(self):
+        node = paragraph(text("Version: ", "strong"), text("1.2", "code"), inline_card("a"), hard_break())
+
+        assert node == {"type": "paragraph", "content": [
+            {"type": "text", "text": "Version: ", "marks": [{"type": "strong"}]},
+            {"type": "text", "text": "1.2", "marks": [{"type": "code"}]},
+            {"type": "inlineCard", "attrs": {"url": "a"}},
+            {"type": "hardBreak"}
+        ]}
+
+    def test_every_call_builds_new_nodes(self):
+        """Test that changing a built node does not change later ones."""
+        first = doc(paragraph(text("a", "strong")))
+        first["content"][0]["content"][0]["marks"].append({"type": "em"})
+
+        assert doc(paragraph(text("a", "strong")))["content"][0]["content"][0]["marks"] == [{"type": "strong"}]
+
+
+@pytest.mark.unit
+class TestMarkdown:
+    """Test rendering ADF to Markdown."""
+
+    def test_renders_blocks_and_marks(self):
+        """Test headings, marks, inline cards, nested lists and code blocks."""
+        document = doc(
+            {"type": "heading", "attrs": {"level": 2}, "content": [text("Summary")]},
+            paragraph(text("Version", "strong"), text(" "), text("25.3.4", "code"), hard_break(), inline_card("https://x/CON-1")),
+            {"type": "bulletList", "content": [
+                {"type": "listItem", "content": [
+                    paragraph(text("a")),
+                    {"type": "orderedList", "content": [{"type": "listItem", "content": [paragraph(text("b"))]}]}
+                ]}
+            ]},
+            {"type": "codeBlock", "attrs": {"language": "java"}, "content": [text("at X\nat Y")]}
+        )
+
+        assert to_markdown(document) == "\n".join([
+            "## Summary",
+            "",
+            "**Version** `25.3.4`",
+            "<https://x/CON-1>",
+            "",
+            "- a",
+            "  1. b",
+            "",
+            "```java",
+            "at X",
+            "at Y",
+            "```"
+        ])
+
+    def test_renders_tables_and_panels(self):
+        """Test that tables get a header separator and panels become quotes."""
+        cell = lambda value: {"type": "tableCell", "content": [paragraph(text(value))]}
+        document = doc(
+            {"type": "table", "content": [
+                {"type": "tableRow", "content": [cell("Key"), cell("Status")]},
+                {"type": "tableRow", "content": [cell("CON-1"), cell("a|b")]}
+            ]},
+            {"type": "panel", "content": [paragraph(text("Note"))]}
+        )
+
+        assert to_markdown(document) == "| Key | Status |\n|---|---|\n| CON-1 | a\\|b |\n\n> Note"
+
+    def test_plain_and_missing_descriptions(self):
+        """Test that strings pass through and other values render empty."""
+        assert to_markdown("already text") == "already text"
+        assert to_markdown(None) == ""
+
+    def test_code_with_backticks_keeps_its_text(self):
+        """Test that code fences are longer than any run of backticks in the code."""
+        document = doc(
+            paragraph(text("a*b* `c` # d", "code"), text(" "), text("`x`", "code")),
+            {"type": "codeBlock", "content": [text("```\nquoted\n```")]}
+        )
+
+        assert to_markdown(document) == "``a*b* `c` # d`` `` `x` ``\n\n````\n```\nquoted\n```\n````"
+
+    def test_deep_document_does_not_recurse(self):
+        """Test that lists and quotes nested beyond the recursion limit are rendered."""
+        document = paragraph(text("leaf"))
+        for _ in range(1200):
+            document = {"type": "bulletList", "content": [{"type": "listItem", "content": [document]}]}
+        for _ in range(1200):
+            document = {"type": "blockquote", "content": [document]}
+
+        assert to_markdown(document) == "> " * 1200 + "- " * 1200 + "leaf"
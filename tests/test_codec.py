@@ -0,0 +1,60 @@
+"""
+Unit tests for the JSON codec.
+"""
+import importlib
+import sys
+
+import httpx
+import pytest
+import requests
+from unittest.mock import patch
+from mcp_tools import codec
+
+
+@pytest.fixture(params=["default", "json"])
+def codec_module(request):
+    """The codec with the installed backend, and with the stdlib fallback forced"""
+    if request.param == "default":
+        yield codec
+        return
+
+    with patch.dict(sys.modules, {"orjson": None, "msgspec": None}):
+        fallback = importlib.reload(codec)
+        assert fallback.BACKEND == "json"
+        yield fallback
+    importlib.reload(codec)
+
+
+@pytest.mark.unit
+class TestCodec:
+    """Test decoding responses and encoding bodies."""
+
+    def test_decode_response_from_bytes(self, codec_module):
+        """Test decoding a real response body."""
+        response = httpx.Response(200, content='{"key": "CON-1", "summary": "Sign-off ü"}'.encode())
+
+        assert codec_module.decode_response(response) == {"key": "CON-1", "summary": "Sign-off ü"}
+
+    def test_decode_requests_response(self, codec_module):
+        """Test decoding a requests response body."""
+        response = requests.Response()
+        response._content = b'{"issues": []}'
+
+        assert codec_module.decode_response(response) == {"issues": []}
+
+    @pytest.mark.parametrize("body", [b")]}'\n{\"log\": []}", b"{\"log\": []}"])
+    def test_decode_xssi_response(self, codec_module, body):
+        """Test that the Gitiles prefix is skipped when present."""
+        response = httpx.Response(200, content=body)
+
+        assert codec_module.decode_xssi_response(response) == {"log": []}
+
+    def test_dumps_round_trip(self, codec_module):
+        """Test that encoded bodies are compact UTF-8 JSON."""
+        payload = {"issueUpdates": [{"fields": {"summary": "ü", "labels": ["a"]}}]}
+
+        encoded = codec_module.dumps(payload)
+
+        assert isinstance(encoded, bytes)
+        assert codec_module.loads(encoded) == payload
+        assert b" " not in encoded
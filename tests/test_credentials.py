@@ -0,0 +1,107 @@
+"""
+Unit tests for per-session credentials and the HTTP transport options.
+"""
+import asyncio
+import os
+import pytest
+from unittest.mock import MagicMock, PropertyMock, patch
+from mcp_tools.credentials import credentials_from_headers, getenv, session_credentials
+
+
+@pytest.mark.unit
+class TestSessionCredentials:
+    """Test credential lookup with and without a session."""
+
+    def test_environment_without_session(self):
+        """Test that stdio use reads the environment."""
+        with patch.dict(os.environ, {"JIRA_USER": "env-user"}):
+            assert getenv("JIRA_USER") == "env-user"
+
+    def test_session_values_override_environment(self):
+        """Test that a session's credentials win over the environment."""
+        with patch.dict(os.environ, {"JIRA_USER": "env-user", "JIRA_URL": "https://env"}):
+            with session_credentials({"JIRA_USER": "alice"}):
+                assert getenv("JIRA_USER") == "alice"
+                # Service URLs fall back to the server configuration
+                assert getenv("JIRA_URL") == "https://env"
+            assert getenv("JIRA_USER") == "env-user"
+
+    def test_secrets_not_mixed_with_environment(self):
+        """Test that a session never picks up the server's secrets."""
+        with patch.dict(os.environ, {"JIRA_TOKEN": "server-token", "GIT_USER_NAME": "server"}):
+            with session_credentials({"JIRA_USER": "alice"}):
+                assert getenv("JIRA_TOKEN") is None
+                assert getenv("GIT_USER_NAME", "default") == "default"
+
+    def test_credentials_from_headers(self):
+        """Test that only non-empty credential headers are taken."""
+        headers = {"x-jira-user": "alice", "x-jira-token": "", "authorization": "Bearer x"}
+
+        assert credentials_from_headers(headers) == {"JIRA_USER": "alice"}
+        assert credentials_from_headers({"accept": "*/*"}) == {}
+
+    @pytest.mark.asyncio
+    async def test_concurrent_sessions_are_isolated(self):
+        """Test that concurrent tool calls each see their own credentials."""
+        async def call(user):
+            with session_credentials({"JIRA_USER": user}):
+                await asyncio.sleep(0)
+                return await asyncio.to_thread(getenv, "JIRA_USER")
+
+        assert await asyncio.gather(call("alice"), call("bob")) == ["alice", "bob"]
+
+
+@pytest.mark.unit
+class TestCombinedServerTransport:
+    """Test the combined server's HTTP options."""
+
+    def test_parse_args(self):
+        """Test transport selection on the command line."""
+        from run_server import parse_args
+
+        assert parse_args([]).transport == "stdio"
+        args = parse_args(["--transport", "streamable-http", "--port", "9000"])
+        assert args.transport == "streamable-http"
+        assert args.port == 9000
+
+    @pytest.mark.asyncio
+    async def test_call_tool_uses_request_headers(self):
+        """Test that a tool call runs with the credentials of its HTTP request."""
+        from run_server import combined_mcp
+
+        @combined_mcp.tool()
+        def session_user() -> str:
+            return getenv("JIRA_USER")
+
+        request_context = MagicMock()
+        request_context.request.headers = {"x-jira-user": "alice"}
+        try:
+            with patch.object(type(combined_mcp._mcp_server), "request_context",
+                              new_callable=PropertyMock, return_value=request_context):
+                result = await combined_mcp.call_tool("session_user", {})
+        finally:
+            del combined_mcp._tool_manager._tools["session_user"]
+
+        assert result[0].text == "alice"
+
+    @pytest.mark.asyncio
+    async def test_call_tool_without_headers_gets_no_server_secrets(self):
+        """Test that an HTTP client sending no credentials does not act as the server owner."""
+        from run_server import combined_mcp
+
+        @combined_mcp.tool()
+        def session_secrets() -> str:
+            return f"{getenv('JIRA_USER')} {getenv('JIRA_TOKEN')} {getenv('JIRA_URL')}"
+
+        request_context = MagicMock()
+        request_context.request.headers = {"accept": "application/json"}
+        env = {"JIRA_USER": "owner", "JIRA_TOKEN": "server-token", "JIRA_URL": "https://env"}
+        try:
+            with patch.dict(os.environ, env), \
+                 patch.object(type(combined_mcp._mcp_server), "request_context",
+                              new_callable=PropertyMock, return_value=request_context):
+                result = await combined_mcp.call_tool("session_secrets", {})
+        finally:
+            del combined_mcp._tool_manager._tools["session_secrets"]
+
+        assert result[0].text == "None None https://env"
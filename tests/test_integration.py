@@ -6,6 +6,7 @@ import pytest
 import os
 import subprocess
 from unittest.mock import patch, MagicMock
+from mcp_tools.codec import dumps
 from mcp_tools.version_support_assistant import (
     fetch_tickets, add_comment, accept_ticket, create_gerrit_pr,
     TicketFetchInput, CommentInput, StatusUpdateInput, GerritPRInput
@@ -60,9 +61,9 @@ class TestIntegrationWithMocks:
         def mock_request(*args, **kwargs):
             mock_response = type('MockResponse', (), {})()
             if args[0] == 'get' or (hasattr(args[0], 'method') and args[0].method == 'GET'):
-                mock_response.json = lambda: fetch_response
+                mock_response.content = dumps(fetch_response)
             else:  # POST requests
-                mock_response.json = lambda: comment_response
+                mock_response.content = dumps(comment_response)
             mock_response.raise_for_status = lambda: None
             return mock_response
         
@@ -116,7 +117,7 @@ class TestIntegrationWithMocks:
         }
         
         mock_response = type('MockResponse', (), {})()
-        mock_response.json = lambda: fetch_response
+        mock_response.content = dumps(fetch_response)
         mock_response.raise_for_status = lambda: None
         mock_client.get.return_value = mock_response
         
@@ -230,7 +231,7 @@ class TestErrorHandlingIntegration:
         """Test handling of malformed API responses."""
         mock_client = mock_client_class.return_value.__aenter__.return_value
         mock_response = type('MockResponse', (), {})()
-        mock_response.json = lambda: {"unexpected": "format"}  # Missing 'issues' key
+        mock_response.content = dumps({"unexpected": "format"})  # Missing 'issues' key
         mock_response.raise_for_status = lambda: None
         mock_client.get.return_value = mock_response
         
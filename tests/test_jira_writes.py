@@ -0,0 +1,147 @@
+"""
+Unit tests for the Jira write planner.
+"""
+import pytest
+from unittest.mock import MagicMock
+from mcp_tools.codec import dumps
+from mcp_tools.jira_writes import (
+    WriteStep,
+    changed_fields,
+    execute_issue_write,
+    plan_issue_write,
+    plan_separate_writes
+)
+
+
+def response(status_code, body=None):
+    resp = MagicMock()
+    resp.status_code = status_code
+    resp.content = dumps(body or {})
+    return resp
+
+
+def not_on_screen(field):
+    return response(400, {"errorMessages": [], "errors": {
+        field: f"Field '{field}' cannot be set. It is not on the appropriate screen, or unknown."
+    }})
+
+
+@pytest.mark.unit
+class TestPlanIssueWrite:
+    """Test planning of merged field updates and transitions."""
+
+    def test_fields_and_transition_are_merged(self):
+        """Test that fields ride along with the transition."""
+        plan = plan_issue_write("CON-1", fields={"labels": ["Denim"]}, transition_id="31")
+
+        assert plan == [WriteStep(
+            "POST",
+            "/rest/api/3/issue/CON-1/transitions",
+            {"transition": {"id": "31"}, "fields": {"labels": ["Denim"]}}
+        )]
+
+    def test_fields_only(self):
+        """Test a plain field update without a transition."""
+        plan = plan_issue_write("CON-1", fields={"labels": ["Denim"]})
+
+        assert plan == [WriteStep("PUT", "/rest/api/3/issue/CON-1", {"fields": {"labels": ["Denim"]}})]
+
+    def test_nothing_to_write(self):
+        """Test that an empty write plans no requests."""
+        assert plan_issue_write("CON-1") == []
+
+    def test_separate_writes(self):
+        """Test the fallback plan order."""
+        plan = plan_separate_writes("CON-1", fields={"labels": ["Denim"]}, transition_id="31")
+
+        assert [step.method for step in plan] == ["PUT", "POST"]
+        assert plan[1].payload == {"transition": {"id": "31"}}
+
+
+@pytest.mark.unit
+class TestChangedFields:
+    """Test diffing intended fields against the current issue."""
+
+    def test_unchanged_fields_are_dropped(self):
+        """Test that fields already at the intended value are not written."""
+        current = {"labels": ["Denim", "release"], "summary": "Sign-off"}
+
+        assert changed_fields(current, {"labels": ["release", "Denim"], "summary": "Sign-off"}) == {}
+
+    def test_changed_and_missing_fields_are_kept(self):
+        """Test that differing and absent fields are kept."""
+        current = {"labels": ["release"]}
+
+        assert changed_fields(current, {"labels": ["Denim"], "customfield_1": "x"}) == {
+            "labels": ["Denim"],
+            "customfield_1": "x"
+        }
+
+
+@pytest.mark.unit
+class TestExecuteIssueWrite:
+    """Test execution with fallback to separate requests."""
+
+    def test_merged_write_sends_one_request(self):
+        """Test that a successful merged write is a single request."""
+        send = MagicMock(return_value=response(204))
+
+        executed = execute_issue_write(send, "CON-1", fields={"labels": ["Denim"]}, transition_id="31")
+
+        assert len(executed) == 1
+        send.assert_called_once()
+
+    def test_rejected_merge_falls_back(self):
+        """Test that a 400 on the merged transition retries as separate requests."""
+        send = MagicMock(side_effect=[response(400), response(204), response(204)])
+
+        executed = execute_issue_write(send, "CON-1", fields={"labels": ["Denim"]}, transition_id="31")
+
+        assert [step.method for step, _ in executed] == ["PUT", "POST"]
+        assert send.call_count == 3
+
+    def test_rejected_merge_is_remembered(self):
+        """Test that a merge the screen refused is not tried again for the same project and transition."""
+        send = MagicMock(side_effect=[not_on_screen("labels"), response(204), response(204), response(204), response(204)])
+        execute_issue_write(send, "CON-1", fields={"labels": ["Denim"]}, transition_id="31")
+
+        executed = execute_issue_write(send, "CON-2", fields={"labels": ["Denim"]}, transition_id="31")
+
+        assert [step.method for step, _ in executed] == ["PUT", "POST"]
+        assert send.call_count == 5
+        assert len(plan_issue_write("OTHER-1", fields={"labels": ["Denim"]}, transition_id="31")) == 1
+
+    def test_invalid_transition_not_remembered(self):
+        """Test that a 400 for a transition not available from the issue's status is not remembered."""
+        invalid = response(400, {"errorMessages": ["Transition id '31' is not valid for this issue."], "errors": {}})
+        send = MagicMock(side_effect=[invalid, response(204), invalid])
+
+        execute_issue_write(send, "CON-1", fields={"labels": ["Denim"]}, transition_id="31")
+
+        assert len(plan_issue_write("CON-2", fields={"labels": ["Denim"]}, transition_id="31")) == 1
+
+    def test_merge_by_issue_id_not_remembered(self):
+        """Test that numeric issue ids, which carry no project, never share a remembered rejection."""
+        send = MagicMock(side_effect=[not_on_screen("labels"), response(204), response(204)])
+
+        execute_issue_write(send, "10001", fields={"labels": ["Denim"]}, transition_id="31")
+
+        assert len(plan_issue_write("10002", fields={"labels": ["Denim"]}, transition_id="31")) == 1
+
+    def test_other_merge_failure_falls_back_without_remembering(self):
+        """Test that a merged transition failing for another reason still writes the fields."""
+        send = MagicMock(side_effect=[response(409), response(204), response(409)])
+
+        executed = execute_issue_write(send, "CON-1", fields={"labels": ["Denim"]}, transition_id="31")
+
+        assert [(step.method, resp.status_code) for step, resp in executed] == [("PUT", 204), ("POST", 409)]
+        assert len(plan_issue_write("CON-1", fields={"labels": ["Denim"]}, transition_id="31")) == 1
+
+    def test_failed_field_update_stops(self):
+        """Test that the transition is not attempted when the field update fails."""
+        send = MagicMock(side_effect=[response(400), response(403)])
+
+        executed = execute_issue_write(send, "CON-1", fields={"labels": ["Denim"]}, transition_id="31")
+
+        assert len(executed) == 1
+        assert executed[0][1].status_code == 403
@@ -5,6 +5,7 @@ import pytest
 import subprocess
 from unittest.mock import patch, AsyncMock, MagicMock
 import httpx
+from mcp_tools.codec import dumps
 from mcp_tools.version_support_assistant import (
     fetch_tickets, add_comment, accept_ticket, create_gerrit_pr,
     TicketFetchInput, CommentInput, StatusUpdateInput, GerritPRInput
@@ -22,7 +23,7 @@ class TestFetchTickets:
         # Setup mock client
         mock_client = AsyncMock()
         mock_response = MagicMock()
-        mock_response.json.return_value = sample_jira_response
+        mock_response.content = dumps(sample_jira_response)
         mock_client.get.return_value = mock_response
         mock_client_class.return_value.__aenter__.return_value = mock_client
         
@@ -82,7 +83,7 @@ class TestFetchTickets:
         """Test fetch_tickets with custom parameters."""
         mock_client = AsyncMock()
         mock_response = MagicMock()
-        mock_response.json.return_value = {"issues": []}
+        mock_response.content = dumps({"issues": []})
         mock_client.get.return_value = mock_response
         mock_client_class.return_value.__aenter__.return_value = mock_client
         
@@ -109,7 +110,7 @@ class TestAddComment:
         # Setup mock client
         mock_client = AsyncMock()
         mock_response = MagicMock()
-        mock_response.json.return_value = sample_comment_response
+        mock_response.content = dumps(sample_comment_response)
         mock_client.post.return_value = mock_response
         mock_client_class.return_value.__aenter__.return_value = mock_client
         
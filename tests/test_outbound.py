@@ -0,0 +1,292 @@
+"""
+Unit tests for the outbound request scheduler.
+"""
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import httpx
+import pytest
+from mcp_tools.outbound import (
+    AsyncGatedTransport, Bulkhead, GatedTransport, OutboundScheduler, Priority, current_priority, priority
+)
+
+
+def start_waiting(bulkhead, level, admitted):
+    """Acquire a slot in a thread that records its level once admitted"""
+    def wait():
+        bulkhead.acquire(level)
+        admitted.append(level)
+
+    thread = threading.Thread(target=wait, daemon=True)
+    thread.start()
+    return thread
+
+
+def wait_for_waiters(bulkhead, count):
+    deadline = time.monotonic() + 2
+    while len(bulkhead._waiting) < count:
+        assert time.monotonic() < deadline, "threads did not start waiting"
+        time.sleep(0.001)
+
+
+class StreamedBody(httpx.SyncByteStream):
+    """A response body that is read from the transport, like a real one"""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    def __iter__(self):
+        yield from self.chunks
+
+
+@pytest.fixture
+def keep_alive_server():
+    """A local HTTP/1.1 server; yields its URL and the list of connections it accepted"""
+    connections = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            super().setup()
+            connections.append(self.client_address)
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"ok")
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/", connections
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.unit
+class TestPriority:
+    """Test the priority of the calling context."""
+
+    def test_interactive_by_default(self):
+        assert current_priority() == Priority.INTERACTIVE
+
+    def test_nested_blocks(self):
+        with priority(Priority.BATCH):
+            assert current_priority() == Priority.BATCH
+            with priority(Priority.PREFETCH):
+                assert current_priority() == Priority.PREFETCH
+            assert current_priority() == Priority.BATCH
+        assert current_priority() == Priority.INTERACTIVE
+
+
+@pytest.mark.unit
+class TestBulkhead:
+    """Test concurrency limits and the admission order."""
+
+    def test_reserved_slots_are_interactive_only(self):
+        """Test that batch requests cannot use the reserved slots."""
+        bulkhead = Bulkhead(limit=3, reserved=1)
+        bulkhead.acquire(Priority.BATCH)
+        bulkhead.acquire(Priority.BATCH)
+
+        assert not bulkhead._try_take(Priority.PREFETCH)
+        assert bulkhead._try_take(Priority.INTERACTIVE)
+        assert bulkhead.active == 3
+
+    def test_invalid_reserve(self):
+        with pytest.raises(ValueError):
+            Bulkhead(limit=2, reserved=2)
+
+    def test_waiters_admitted_by_priority(self):
+        """Test that freed slots go to higher classes first, then in arrival order."""
+        bulkhead = Bulkhead(limit=1, reserved=0)
+        bulkhead.acquire(Priority.INTERACTIVE)
+        admitted = []
+        threads = []
+        for count, level in enumerate([Priority.PREFETCH, Priority.BATCH, Priority.INTERACTIVE], start=1):
+            threads.append(start_waiting(bulkhead, level, admitted))
+            wait_for_waiters(bulkhead, count)
+
+        for count in range(1, 4):
+            bulkhead.release()
+            deadline = time.monotonic() + 2
+            while len(admitted) < count and time.monotonic() < deadline:
+                time.sleep(0.001)
+        for thread in threads:
+            thread.join(2)
+
+        assert admitted == [Priority.INTERACTIVE, Priority.BATCH, Priority.PREFETCH]
+
+    def test_new_request_does_not_jump_the_queue(self):
+        """Test that a request does not take a slot ahead of a waiting request of its class."""
+        bulkhead = Bulkhead(limit=2, reserved=0)
+        bulkhead.acquire(Priority.BATCH)
+        bulkhead.acquire(Priority.BATCH)
+        admitted = []
+        thread = start_waiting(bulkhead, Priority.BATCH, admitted)
+        wait_for_waiters(bulkhead, 1)
+
+        bulkhead.active -= 1   # a slot freed without handing it over
+        assert not bulkhead._try_take(Priority.BATCH)
+        assert bulkhead._try_take(Priority.INTERACTIVE)
+
+        bulkhead.release()
+        thread.join(2)
+        assert admitted == [Priority.BATCH]
+
+    def test_event_loop_admitted_at_once(self):
+        """Test that blocking calls on an event loop thread never wait."""
+        bulkhead = Bulkhead(limit=1, reserved=0)
+        bulkhead.acquire(Priority.INTERACTIVE)
+
+        async def blocking_call():
+            bulkhead.acquire(Priority.BATCH)
+
+        asyncio.run(blocking_call())
+        assert bulkhead.active == 2
+
+        bulkhead.release()
+        bulkhead.release()
+        assert bulkhead.active == 0
+
+    def test_async_waiter(self):
+        """Test that a coroutine waits for a slot released by another thread."""
+        bulkhead = Bulkhead(limit=1, reserved=0)
+        bulkhead.acquire(Priority.INTERACTIVE)
+
+        async def scenario():
+            waiting = asyncio.create_task(bulkhead.aacquire(Priority.BATCH))
+            await asyncio.sleep(0.01)
+            assert not waiting.done()
+            threading.Thread(target=bulkhead.release).start()
+            await asyncio.wait_for(waiting, 2)
+
+        asyncio.run(scenario())
+        assert bulkhead.active == 1
+
+    def test_cancelled_waiter_gives_up_its_place(self):
+        """Test that a cancelled coroutine neither holds nor blocks a slot."""
+        bulkhead = Bulkhead(limit=1, reserved=0)
+        bulkhead.acquire(Priority.INTERACTIVE)
+
+        async def scenario():
+            waiting = asyncio.create_task(bulkhead.aacquire(Priority.INTERACTIVE))
+            await asyncio.sleep(0.01)
+            waiting.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiting
+
+        asyncio.run(scenario())
+        bulkhead.release()
+
+        assert bulkhead.active == 0
+        assert bulkhead._try_take(Priority.BATCH)
+
+
+@pytest.mark.unit
+class TestOutboundScheduler:
+    """Test per-host bulkheads and the httpx transports."""
+
+    def test_bulkhead_per_host(self):
+        scheduler = OutboundScheduler(limit=4, reserved=1, host_limits={"jenkins.example.com": 2})
+
+        jenkins = scheduler.bulkhead("jenkins.example.com")
+        assert scheduler.bulkhead("jenkins.example.com") is jenkins
+        assert (jenkins.limit, jenkins.reserved) == (2, 1)
+        assert scheduler.bulkhead("jira.example.com").limit == 4
+
+    def test_gate_holds_slot_for_block(self):
+        scheduler = OutboundScheduler()
+        bulkhead = scheduler.bulkhead("jira.example.com")
+
+        with scheduler.gate("https://jira.example.com/rest/api/2/search"):
+            assert bulkhead.active == 1
+        assert bulkhead.active == 0
+
+        with pytest.raises(RuntimeError):
+            with scheduler.gate("https://jira.example.com/rest/api/2/search"):
+                raise RuntimeError("request failed")
+        assert bulkhead.active == 0
+
+    def test_transport_releases_when_response_closed(self):
+        """Test that the slot is held until the response body has been read."""
+        scheduler = OutboundScheduler()
+        inner = httpx.MockTransport(lambda request: httpx.Response(200, stream=StreamedBody([b"Started", b"\n"])))
+        bulkhead = scheduler.bulkhead("jenkins.example.com")
+
+        with httpx.Client(transport=GatedTransport(scheduler, inner)) as client:
+            with client.stream("GET", "https://jenkins.example.com/job/nightly/1/consoleText") as response:
+                assert bulkhead.active == 1
+                assert "".join(response.iter_text()) == "Started\n"
+            assert bulkhead.active == 0
+
+            assert client.get("https://jenkins.example.com/job/nightly/1/consoleText").text == "Started\n"
+            assert bulkhead.active == 0
+
+    def test_transport_releases_read_response(self):
+        """Test that a response that is read already does not hold its slot."""
+        scheduler = OutboundScheduler()
+        inner = httpx.MockTransport(lambda request: httpx.Response(200, json={"ok": True}))
+
+        with httpx.Client(transport=GatedTransport(scheduler, inner)) as client:
+            assert client.get("https://jenkins.example.com/api/json").json() == {"ok": True}
+        assert scheduler.bulkhead("jenkins.example.com").active == 0
+
+    def test_transport_releases_on_error(self):
+        def fail(request):
+            raise httpx.ConnectError("refused", request=request)
+
+        scheduler = OutboundScheduler()
+        with httpx.Client(transport=GatedTransport(scheduler, httpx.MockTransport(fail))) as client:
+            with pytest.raises(httpx.ConnectError):
+                client.get("https://jenkins.example.com/api/json")
+        assert scheduler.bulkhead("jenkins.example.com").active == 0
+
+    def test_async_transport(self):
+        scheduler = OutboundScheduler()
+        inner = httpx.MockTransport(lambda request: httpx.Response(200, json={"issues": []}))
+
+        async def search():
+            async with httpx.AsyncClient(transport=AsyncGatedTransport(scheduler, inner)) as client:
+                response = await client.get("https://jira.example.com/rest/api/2/search")
+                return response.json()
+
+        assert asyncio.run(search()) == {"issues": []}
+        assert scheduler.bulkhead("jira.example.com").active == 0
+
+    def test_clients_share_connections(self, keep_alive_server):
+        """Test that each tool call's client reuses the connections of earlier ones."""
+        url, connections = keep_alive_server
+        scheduler = OutboundScheduler()
+
+        for _ in range(3):
+            with httpx.Client(transport=scheduler.transport()) as client:
+                assert client.get(url).text == "ok"
+        scheduler.close()
+
+        assert len(connections) == 1
+        assert scheduler.transport(retries=1) is not scheduler.transport(retries=1)
+
+    def test_async_clients_share_connections_per_loop(self, keep_alive_server):
+        url, connections = keep_alive_server
+        scheduler = OutboundScheduler()
+
+        async def calls():
+            for _ in range(3):
+                async with httpx.AsyncClient(transport=scheduler.async_transport()) as client:
+                    assert (await client.get(url)).text == "ok"
+            transport = scheduler.async_transport()
+            await scheduler.aclose()
+            return transport
+
+        first = asyncio.run(calls())
+        second = asyncio.run(calls())
+
+        assert first is not second
+        assert len(connections) == 2
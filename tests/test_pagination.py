@@ -0,0 +1,87 @@
+"""
+Unit tests for cursor-based pagination of tool results.
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from mcp_tools.codec import dumps
+from mcp_tools import version_support_assistant
+from mcp_tools.pagination import CursorError, ResultBuffer
+from mcp_tools.version_support_assistant import TicketFetchInput, fetch_tickets
+
+
+def items(count, size=100):
+    return [{"id": n, "text": "x" * size} for n in range(count)]
+
+
+@pytest.mark.unit
+class TestResultBuffer:
+    """Test paging by serialized size."""
+
+    def test_small_result_has_no_cursor(self):
+        """Test that results within the budget are returned whole."""
+        page = ResultBuffer(page_bytes=10_000).paginate("tool", items(5))
+
+        assert len(page.items) == 5
+        assert page.next_cursor is None
+        assert page.remaining == 0
+
+    def test_pages_cover_all_items_in_order(self):
+        """Test that following cursors enumerates every item once."""
+        buffer = ResultBuffer(page_bytes=500)
+        data = items(20)
+
+        page = buffer.paginate("tool", data, {"total": 20})
+        seen = list(page.items)
+        while page.next_cursor:
+            page = buffer.next_page("tool", page.next_cursor)
+            seen.extend(page.items)
+            assert page.meta == {"total": 20}
+
+        assert seen == data
+        assert 1 < len(buffer.paginate("tool", data).items) < 20
+
+    def test_oversized_item_is_still_returned(self):
+        """Test that a page always holds at least one item."""
+        page = ResultBuffer(page_bytes=10).paginate("tool", items(2))
+
+        assert len(page.items) == 1
+        assert page.remaining == 1
+
+    def test_cursor_is_single_use_and_scoped(self):
+        """Test that cursors cannot be replayed or used by another tool."""
+        buffer = ResultBuffer(page_bytes=200)
+        cursor = buffer.paginate("tool", items(5)).next_cursor
+
+        with pytest.raises(CursorError):
+            buffer.next_page("other-tool", cursor)
+        buffer.next_page("tool", cursor)
+        with pytest.raises(CursorError):
+            buffer.next_page("tool", cursor)
+
+
+@pytest.mark.unit
+class TestFetchTicketsPagination:
+    """Test paging of ticket.fetch results."""
+
+    @pytest.mark.asyncio
+    @patch('httpx.AsyncClient')
+    async def test_next_page_is_served_without_querying_jira(self, mock_client_class, mock_env_vars):
+        """Test that the cursor call is answered from the buffer."""
+        mock_client = AsyncMock()
+        mock_response = MagicMock()
+        mock_response.content = dumps({"issues": [
+            {"key": f"CON-{n}", "fields": {"summary": "s" * 200, "status": {"name": "To Triage"},
+                                          "created": "2025-09-01", "assignee": None}}
+            for n in range(10)
+        ]})
+        mock_client.get.return_value = mock_response
+        mock_client_class.return_value.__aenter__.return_value = mock_client
+
+        with patch.object(version_support_assistant, "result_buffer", ResultBuffer(page_bytes=1000)):
+            first = await fetch_tickets(TicketFetchInput())
+            second = await fetch_tickets(TicketFetchInput(cursor=first.next_cursor))
+
+        assert first.next_cursor and first.remaining == 10 - len(first.tickets)
+        ids = [ticket.id for ticket in first.tickets + second.tickets]
+        assert ids == [f"CON-{n}" for n in range(len(ids))]
+        mock_client.get.assert_called_once()
@@ -0,0 +1,159 @@
+"""
+Unit tests for background prefetching.
+"""
+import threading
+import time
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+from mcp_tools.codec import dumps
+from mcp_tools import prefetch
+from mcp_tools.prefetch import CronSchedule, PrefetchScheduler, ScheduledTask, WarmResults, prefetching, warm_results
+from mcp_tools.version_support_assistant import TicketFetchInput, fetch_tickets
+
+
+@pytest.fixture
+def fake_task(monkeypatch):
+    calls = []
+    monkeypatch.setitem(prefetch.PREFETCH_TASKS, "fake", lambda **options: calls.append(options))
+    return calls
+
+
+@pytest.mark.unit
+class TestCronSchedule:
+    """Test cron expression matching."""
+
+    def test_weekday_mornings(self):
+        """Test ranges, steps and day-of-week restrictions."""
+        schedule = CronSchedule("*/20 7-10 * * 1-5")
+
+        assert schedule.matches(datetime(2026, 10, 19, 7, 40))     # Monday
+        assert not schedule.matches(datetime(2026, 10, 19, 7, 41))
+        assert not schedule.matches(datetime(2026, 10, 18, 7, 40))  # Sunday
+        assert schedule.next_after(datetime(2026, 10, 16, 10, 40)) == datetime(2026, 10, 19, 7, 0)
+
+    def test_next_after_is_strictly_later(self):
+        """Test that the current minute is not returned again."""
+        schedule = CronSchedule("30 5 * * *")
+
+        assert schedule.next_after(datetime(2026, 10, 19, 5, 30, 10)) == datetime(2026, 10, 20, 5, 30)
+
+    def test_sunday_as_seven(self):
+        """Test that both 0 and 7 mean Sunday."""
+        assert CronSchedule("0 0 * * 7").matches(datetime(2026, 10, 18))
+        assert CronSchedule("0 0 * * 0").matches(datetime(2026, 10, 18))
+
+    def test_day_of_month_or_weekday(self):
+        """Test that with both day fields restricted either may match, like cron."""
+        schedule = CronSchedule("0 6 1 * 1")
+
+        assert schedule.matches(datetime(2026, 10, 1, 6))   # Thursday the 1st
+        assert schedule.matches(datetime(2026, 10, 19, 6))  # Monday
+
+    def test_leap_day(self):
+        """Test that rare expressions are found without scanning every minute."""
+        assert CronSchedule("0 0 29 2 *").next_after(datetime(2026, 10, 18)) == datetime(2028, 2, 29)
+
+    @pytest.mark.parametrize("expression", ["* * * *", "60 * * * *", "* 5-2 * * *", "*/0 * * * *", "0 0 31 2 *"])
+    def test_invalid_expressions(self, expression):
+        """Test that malformed or unsatisfiable expressions are rejected."""
+        with pytest.raises(ValueError):
+            CronSchedule(expression).next_after(datetime(2026, 10, 18))
+
+
+@pytest.mark.unit
+class TestWarmResults:
+    """Test that only prefetched results are served."""
+
+    def test_interactive_results_not_kept(self):
+        """Test that results of interactive calls are not cached."""
+        results = WarmResults()
+        results.put("key", [1])
+
+        assert results.get("key") is None
+
+    def test_prefetched_results_served_to_interactive_calls(self):
+        """Test that a prefetch refreshes upstream and warms later calls."""
+        results = WarmResults()
+        with prefetching():
+            results.put("key", [1])
+            assert results.get("key") is None
+
+        assert results.get("key") == [1]
+
+    @pytest.mark.asyncio
+    @patch('httpx.AsyncClient')
+    async def test_triage_tickets_prefetch_warms_ticket_fetch(self, mock_client_class, mock_env_vars):
+        """Test that ticket.fetch after the prefetch task does not query Jira."""
+        warm_results.clear()
+        mock_client = AsyncMock()
+        mock_response = MagicMock()
+        mock_response.content = dumps({"issues": [
+            {"key": "CON-1", "fields": {"summary": "s", "status": {"name": "To Triage"}, "created": "2025-09-01", "assignee": None}}
+        ]})
+        mock_client.get.return_value = mock_response
+        mock_client_class.return_value.__aenter__.return_value = mock_client
+
+        try:
+            with prefetching():
+                await fetch_tickets(TicketFetchInput())
+            result = await fetch_tickets(TicketFetchInput())
+            # Another query is not served from the prefetched result
+            await fetch_tickets(TicketFetchInput(status="Accepted"))
+        finally:
+            warm_results.clear()
+
+        assert [ticket.id for ticket in result.tickets] == ["CON-1"]
+        assert mock_client.get.call_count == 2
+
+
+@pytest.mark.unit
+class TestPrefetchScheduler:
+    """Test running scheduled tasks."""
+
+    def test_run_due_runs_matching_tasks(self, fake_task):
+        """Test that only tasks scheduled for the minute run, with their options."""
+        scheduler = PrefetchScheduler([
+            ScheduledTask("fake", "0 7 * * *", jobs=["a"]),
+            ScheduledTask("fake", "0 8 * * *", jobs=["b"])
+        ])
+
+        assert scheduler.run_due(datetime(2026, 10, 19, 7, 0)) == 1
+        assert fake_task == [{"jobs": ["a"]}]
+
+    def test_failing_task_does_not_stop_others(self, monkeypatch, fake_task):
+        """Test that a failing task is logged and the next one still runs."""
+        monkeypatch.setitem(prefetch.PREFETCH_TASKS, "broken", MagicMock(side_effect=RuntimeError("Jira down")))
+        scheduler = PrefetchScheduler([ScheduledTask("broken", "* * * * *"), ScheduledTask("fake", "* * * * *")])
+
+        assert scheduler.run_due(datetime(2026, 10, 19, 7, 0)) == 2
+        assert fake_task == [{}]
+
+    def test_tasks_run_as_prefetch(self, monkeypatch):
+        """Test that tasks run in prefetch mode, so their results warm the caches."""
+        seen = []
+        monkeypatch.setitem(prefetch.PREFETCH_TASKS, "probe", lambda: seen.append(prefetch._prefetching.get()))
+
+        PrefetchScheduler([ScheduledTask("probe", "* * * * *")]).run_due(datetime(2026, 10, 19, 7, 0))
+
+        assert seen == [True]
+
+    def test_unknown_task_rejected(self):
+        """Test that a misspelt task fails at start-up, not at its first run."""
+        with pytest.raises(ValueError, match="Unknown prefetch task"):
+            ScheduledTask("triage_ticket", "* * * * *")
+
+    def test_background_thread_runs_at_scheduled_minute(self, monkeypatch):
+        """Test that the thread sleeps until the next scheduled minute and runs the task."""
+        ran = threading.Event()
+        monkeypatch.setitem(prefetch.PREFETCH_TASKS, "signal", lambda: ran.set())
+        # A clock that reaches 07:00 a moment after the scheduler starts
+        start = time.monotonic()
+        clock = lambda: datetime(2026, 10, 19, 6, 59, 59, 950000) + timedelta(seconds=time.monotonic() - start)
+
+        scheduler = PrefetchScheduler([ScheduledTask("signal", "0 7 * * *")], clock=clock)
+        scheduler.start()
+        try:
+            assert ran.wait(5)
+        finally:
+            scheduler.stop(timeout=5)
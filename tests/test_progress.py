@@ -0,0 +1,117 @@
+"""
+Unit tests for progress reporting from long-running tools.
+"""
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from mcp_tools.progress import ProgressReporter
+from mcp_tools.release_signoff_assistant import (
+    UpdateTicketWithTaskUrlsRequest,
+    check_task_statuses,
+    update_ticket_with_task_urls
+)
+
+
+def make_ctx():
+    ctx = MagicMock()
+    ctx.report_progress = AsyncMock()
+    ctx.info = AsyncMock()
+    return ctx
+
+
+@pytest.mark.unit
+class TestProgressReporter:
+    """Test MCP progress and log notifications."""
+
+    @pytest.mark.asyncio
+    async def test_without_context_does_nothing(self):
+        """Test that tools called directly report nothing."""
+        reporter = ProgressReporter()
+
+        await reporter.update(1, 2, "stage", {"partial": True})
+        await reporter.stage("stage")
+        reporter.threadsafe()(1, 2)
+
+    @pytest.mark.asyncio
+    async def test_update_reports_progress_message_and_partial(self):
+        """Test that an update sends progress, the stage and the partial result."""
+        ctx = make_ctx()
+
+        await ProgressReporter(ctx).update(1, 4, "Checked CON-1", {"task_id": "CON-1"})
+
+        ctx.report_progress.assert_awaited_once_with(1, 4)
+        messages = [call.args[0] for call in ctx.info.await_args_list]
+        assert messages == ["Checked CON-1", 'partial result: {"task_id":"CON-1"}']
+
+    @pytest.mark.asyncio
+    async def test_client_errors_do_not_fail_the_tool(self):
+        """Test that a failing notification is swallowed."""
+        ctx = make_ctx()
+        ctx.report_progress.side_effect = RuntimeError("client went away")
+
+        await ProgressReporter(ctx).update(1, 2)
+
+    @pytest.mark.asyncio
+    async def test_threadsafe_callback_from_worker_thread(self):
+        """Test that a worker thread's updates reach the context."""
+        ctx = make_ctx()
+        progress = ProgressReporter(ctx).threadsafe()
+
+        await asyncio.to_thread(progress, 3, 5, "halfway")
+        # Let the scheduled update run on this loop
+        for _ in range(3):
+            await asyncio.sleep(0)
+
+        ctx.report_progress.assert_awaited_once_with(3, 5)
+        ctx.info.assert_awaited_once_with("halfway")
+
+
+@pytest.mark.unit
+class TestTaskUrlProgress:
+    """Test progress while related task statuses are checked."""
+
+    def test_each_task_checked_once_with_progress(self):
+        """Test that duplicate task links are checked once and reported per task."""
+        jira_client = MagicMock()
+        jira_client.get_ticket.side_effect = [
+            {"fields": {"status": {"name": "Done"}}},
+            {"fields": {"status": {"name": "In Progress"}}}
+        ]
+        progress = MagicMock()
+        urls = ["https://jira/browse/CON-1", "https://jira/browse/CON-2", "https://jira/browse/CON-1"]
+
+        incomplete = check_task_statuses(jira_client, urls, progress)
+
+        assert jira_client.get_ticket.call_count == 2
+        assert [task["task_id"] for task in incomplete] == ["CON-2"]
+        assert [call.args[:2] for call in progress.call_args_list] == [(1, 2), (2, 2)]
+        assert progress.call_args_list[1].args[3]["status"] == "In Progress"
+
+    @pytest.mark.asyncio
+    @patch('mcp_tools.release_signoff_assistant.JiraClient')
+    @patch('mcp_tools.release_signoff_assistant.get_commits_between_tags')
+    async def test_tool_reports_through_context(self, mock_commits, mock_jira_client):
+        """Test that the tool reports the commit stage through its context."""
+        mock_commits.return_value = {"success": False, "error": "no tags"}
+        ctx = make_ctx()
+
+        result = await update_ticket_with_task_urls(UpdateTicketWithTaskUrlsRequest(current_version="25.3.4"), ctx)
+        for _ in range(3):
+            await asyncio.sleep(0)
+
+        assert result["success"] is False
+        ctx.info.assert_awaited_once_with("Fetching commits for 25.3.4")
+
+
+@pytest.mark.unit
+class TestCombinedServer:
+    """Test that the combined server passes its context to long-running tools."""
+
+    def test_long_running_tools_take_context(self):
+        """Test that progress-reporting tools are registered with a context parameter."""
+        from run_server import combined_mcp
+
+        tools = combined_mcp._tool_manager._tools
+        assert tools["update_ticket_with_task_urls"].context_kwarg == "ctx"
+        assert tools["fetch_build_with_failures"].context_kwarg == "ctx"
+        assert tools["wait_for_build"].context_kwarg == "ctx"
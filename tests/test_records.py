@@ -0,0 +1,85 @@
+"""
+Unit tests for the internal record types.
+"""
+import pytest
+from mcp_tools.records import Commit, Issue, TestCase
+
+
+@pytest.mark.unit
+class TestIssue:
+    """Test decoding Jira issues."""
+
+    def test_from_json_and_as_ticket(self):
+        """Test that nested fields are flattened once and the ticket shape is kept."""
+        issue = Issue.from_json({
+            'key': 'CON-25671',
+            'id': '1001',
+            'fields': {
+                'summary': 'Release sign-off for 25.3.4',
+                'status': {'name': 'Accepted'},
+                'created': '2025-09-23T07:35:46.553-0700',
+                'assignee': None,
+                'reporter': {'displayName': 'Eng Ops'},
+                'fixVersions': [{'name': '25.3.4'}],
+                'labels': ['Denim']
+            }
+        })
+
+        assert issue.status == 'Accepted'
+        assert issue.labels == ('Denim',)
+        assert issue.as_ticket() == {
+            'key': 'CON-25671',
+            'summary': 'Release sign-off for 25.3.4',
+            'status': 'Accepted',
+            'created': '2025-09-23T07:35:46.553-0700',
+            'description': '',
+            'assignee': None,
+            'reporter': 'Eng Ops',
+            'fixVersions': ['25.3.4']
+        }
+
+    def test_records_are_slotted(self):
+        """Test that records carry no per-instance dict."""
+        issue = Issue.from_json({'key': 'CON-1', 'fields': {}})
+
+        assert not hasattr(issue, '__dict__')
+        assert not hasattr(TestCase('C', 't', '', ''), '__dict__')
+
+
+@pytest.mark.unit
+class TestTestCase:
+    """Test failed test case records."""
+
+    @pytest.mark.parametrize('class_name, name, api', [
+        ('com.example.FooTest', 'fails', 'com.example.FooTest.fails'),
+        ('com.example.FooTest', '', 'com.example.FooTest'),
+        ('', 'fails', 'fails')
+    ])
+    def test_api_name(self, class_name, name, api):
+        """Test the full test name used in failure summaries."""
+        assert TestCase(class_name, name, 'boom', '').api == api
+
+    def test_as_failure_includes_configuration_when_set(self):
+        """Test the failed test dict returned by the tools."""
+        case = TestCase('C', 't', 'boom', 'trace', configuration='jdk=11')
+
+        assert case.as_failure() == {
+            'api': 'C.t', 'error_details': 'boom', 'stack_trace': 'trace', 'configuration': 'jdk=11'
+        }
+        assert 'configuration' not in TestCase('C', 't', 'boom', 'trace').as_failure()
+
+
+@pytest.mark.unit
+class TestCommit:
+    """Test decoding Gitiles commits."""
+
+    def test_from_gitiles_links_task(self):
+        """Test that the subject line and the Jira task are extracted."""
+        commit = Commit.from_gitiles({'commit': '0123456789abcdef', 'message': 'CON-25522 Fix sync\n\nDetails'})
+
+        assert commit.as_dict() == {
+            'hash': '01234567',
+            'message': 'CON-25522 Fix sync',
+            'task_url': 'https://tasktop.atlassian.net/browse/CON-25522'
+        }
+        assert Commit.from_gitiles({'commit': 'abc', 'message': 'Bump version'}).task_url is None
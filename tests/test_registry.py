@@ -0,0 +1,84 @@
+"""
+Unit tests for lazy tool registration on the combined server.
+"""
+import os
+import subprocess
+import sys
+import threading
+import types
+import pytest
+from fastmcp import FastMCP
+from mcp_tools.registry import LazyTool, build_manifest, load_manifest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def fake_assistant():
+    module = types.ModuleType("fake_assistant")
+    module.mcp = FastMCP("fake-assistant")
+
+    @module.mcp.tool("fake.double")
+    def double(value: int) -> int:
+        """Double a value"""
+        return value * 2
+
+    @module.mcp.tool("fake.thread")
+    def thread_name() -> str:
+        """Name of the thread the tool runs in"""
+        return threading.current_thread().name
+
+    sys.modules["fake_assistant"] = module
+    yield module
+    del sys.modules["fake_assistant"]
+
+
+@pytest.mark.unit
+class TestToolManifest:
+    """Test that the manifest describes the tools the modules define."""
+
+    def test_manifest_is_up_to_date(self):
+        """Test that the checked-in manifest matches the assistant modules."""
+        assert load_manifest() == build_manifest(), "Regenerate it with: python -m mcp_tools.registry"
+
+    def test_server_start_imports_no_assistant(self):
+        """Test that starting the combined server lists tools without importing assistants."""
+        script = (
+            "import asyncio, sys\n"
+            "from run_server import combined_mcp\n"
+            "tools = asyncio.run(combined_mcp.list_tools())\n"
+            "print(len(tools), sorted(m for m in sys.modules if m.endswith('_assistant') or m == 'requests'))\n"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+
+        assert output == f"{len(load_manifest())} []"
+
+
+@pytest.mark.unit
+class TestLazyTool:
+    """Test delegation to the tool registered on the assistant module."""
+
+    @pytest.mark.asyncio
+    async def test_first_call_loads_module_tool(self, fake_assistant):
+        """Test that a call runs the module's tool with validated arguments."""
+        tool = LazyTool(name="fake.double", module="fake_assistant", description="", parameters={})
+
+        assert await tool.run({"value": "21"}) == 42
+        assert tool.load() is fake_assistant.mcp._tool_manager.get_tool("fake.double")
+
+    @pytest.mark.asyncio
+    async def test_blocking_tool_runs_in_worker_thread(self, fake_assistant):
+        """Test that a synchronous tool does not run on the event loop thread."""
+        tool = LazyTool(name="fake.thread", module="fake_assistant", description="", parameters={})
+
+        assert await tool.run({}) != threading.current_thread().name
+
+    @pytest.mark.asyncio
+    async def test_stale_manifest_entry(self, fake_assistant):
+        """Test that a tool missing from its module is reported clearly."""
+        tool = LazyTool(name="fake.removed", module="fake_assistant", description="", parameters={})
+
+        with pytest.raises(RuntimeError, match="regenerate the manifest"):
+            await tool.run({})
@@ -3,6 +3,9 @@ Tests for release sign-off assistant MCP tools.
 """
 import pytest
 from unittest.mock import Mock, patch, MagicMock
+from mcp_tools.codec import dumps
+from mcp_tools.credentials import session_credentials
+from mcp_tools.prefetch import prefetching, warm_results
 from mcp_tools.release_signoff_assistant import (
     fetch_release_signoff_tickets,
     fetch_ticket,
@@ -18,6 +21,8 @@ from mcp_tools.release_signoff_assistant import (
     UpdateTicketWithPreviousVersionsRequest,
     UpdateTicketWithTaskUrlsRequest,
     UpdateTicketStatusRequest,
+    ScanConsoleVersionsRequest,
+    scan_console_versions,
     extract_versions_from_description
 )
 
@@ -59,6 +64,49 @@ class TestExtractVersionsFromDescription:
         assert versions['current_sdk_version'] == "25.3.0.20250804-1138"
         assert versions['current_platform_version'] == "25.3.0.20250919-0941"
 
+    def test_label_applies_only_within_its_paragraph(self):
+        """Test that a label without a version does not claim the next paragraph's version."""
+        description = {
+            "type": "doc",
+            "content": [
+                {"type": "paragraph", "content": [{"type": "text", "text": "Current SDK Version: TBD"}]},
+                {"type": "paragraph", "content": [{"type": "text", "text": "Built 25.3.0.20250804-1138"}]}
+            ]
+        }
+
+        versions = extract_versions_from_description(description)
+
+        assert versions['current_sdk_version'] is None
+
+    def test_extract_versions_in_list_and_previous_fallback(self):
+        """Test nested versions, previous versions and rejection of non-CI versions."""
+        description = {
+            "type": "doc",
+            "content": [{
+                "type": "bulletList",
+                "content": [{
+                    "type": "listItem",
+                    "content": [{
+                        "type": "paragraph",
+                        "content": [
+                            {"type": "text", "text": "Previous Connector Version: 25.3.3, "},
+                            {"type": "hardBreak"},
+                            {"type": "text", "text": "25.3.0.20250820-0101", "marks": [{"type": "code"}]},
+                            {"type": "text", "text": " Previous SDK Version: "},
+                            {"type": "text", "text": "25.3.0.20250801-0900", "marks": [{"type": "code"}]}
+                        ]
+                    }]
+                }]
+            }]
+        }
+
+        versions = extract_versions_from_description(description)
+
+        assert versions['previous_connector_version'] == "25.3.0.20250820-0101"
+        assert versions['previous_sdk_version'] == "25.3.0.20250801-0900"
+        assert versions['current_connector_version'] == "25.3.0.20250820-0101"
+        assert versions['current_platform_version'] is None
+
 
 class TestFetchReleaseSignoffTickets:
     """Test fetching release sign-off tickets."""
@@ -122,6 +170,65 @@ class TestFetchTicket:
         assert result['success'] is True
         assert result['ticket']['key'] == 'CON-25671'
 
+    @patch('mcp_tools.release_signoff_assistant.JiraClient')
+    def test_fetch_ticket_output_modes(self, mock_jira_client):
+        """Test that full output is the default and compact output replaces the description with extracted fields."""
+        description = {
+            "type": "doc",
+            "content": [{
+                "type": "paragraph",
+                "content": [
+                    {"type": "text", "text": "Platform Version: 25.3.0.20250919-0941 "},
+                    {"type": "text", "text": "Release Information: https://docs.example.com/25.3.4 notes"}
+                ]
+            }]
+        }
+        mock_jira_client.return_value.get_ticket.return_value = {
+            'key': 'CON-25671',
+            'fields': {
+                'summary': 'Release sign-off for 25.3.4',
+                'status': {'name': 'Accepted'},
+                'created': '2025-09-23T07:35:46.553-0700',
+                'description': description,
+                'fixVersions': [{'name': '25.3.4'}]
+            }
+        }
+
+        compact = fetch_ticket(FetchTicketRequest(ticket_key='CON-25671', output_mode='compact'))['ticket']
+        full = fetch_ticket(FetchTicketRequest(ticket_key='CON-25671'))['ticket']
+
+        assert 'description' not in compact
+        assert compact['versions'] == {'current_platform_version': '25.3.0.20250919-0941'}
+        assert compact['release_notes_url'] == 'https://docs.example.com/25.3.4'
+        assert compact['description_digest']['preview'].startswith('Platform Version:')
+        assert full['description'] == description
+        assert 'description_digest' not in full
+
+    @patch('mcp_tools.release_signoff_assistant.adf.to_markdown', return_value='rendered')
+    @patch('mcp_tools.release_signoff_assistant.JiraClient')
+    def test_markdown_output_is_memoized_by_updated(self, mock_jira_client, mock_to_markdown):
+        """Test that a description is rendered once per ticket update."""
+        ticket = {
+            'key': 'CON-9',
+            'fields': {'summary': 's', 'status': {'name': 'Open'}, 'updated': '2025-09-23T07:00:00.000-0700',
+                       'description': {'type': 'doc', 'content': []}}
+        }
+        mock_jira_client.return_value.get_ticket.return_value = ticket
+        request = FetchTicketRequest(ticket_key='CON-9', output_mode='markdown')
+
+        assert fetch_ticket(request)['ticket']['description'] == 'rendered'
+        fetch_ticket(request)
+        assert mock_to_markdown.call_count == 1
+
+        ticket['fields']['updated'] = '2025-09-24T07:00:00.000-0700'
+        fetch_ticket(request)
+        assert mock_to_markdown.call_count == 2
+
+        # Another Jira site may have a ticket with the same key and timestamp
+        with session_credentials({'JIRA_URL': 'https://other.atlassian.net'}):
+            fetch_ticket(request)
+        assert mock_to_markdown.call_count == 3
+
 
 class TestFetchPreviousVersionTicket:
     """Test fetching previous version tickets."""
@@ -195,9 +302,9 @@ class TestUpdateTicketWithTaskUrls:
 class TestUpdateTicketStatus:
     """Test updating ticket status."""
     
-    @patch('mcp_tools.release_signoff_assistant.requests.get')
-    @patch('mcp_tools.release_signoff_assistant.requests.put')
-    @patch('mcp_tools.release_signoff_assistant.requests.post')
+    @patch('mcp_tools.release_signoff_assistant.http_session.get')
+    @patch('mcp_tools.release_signoff_assistant.http_session.put')
+    @patch('mcp_tools.release_signoff_assistant.http_session.post')
     @patch('mcp_tools.release_signoff_assistant.JiraClient')
     def test_update_status_success(self, mock_jira_client, mock_post, mock_put, mock_get):
         """Test successful status update."""
@@ -206,9 +313,9 @@ class TestUpdateTicketStatus:
         
         # Mock transitions response
         mock_get.return_value.status_code = 200
-        mock_get.return_value.json.return_value = {
+        mock_get.return_value.content = dumps({
             'transitions': [{'id': '101', 'to': {'name': 'Done'}}]
-        }
+        })
         
         # Mock successful responses
         mock_put.return_value.status_code = 204
@@ -218,4 +325,186 @@ class TestUpdateTicketStatus:
         result = update_ticket_status(request)
         
         assert result['success'] is True
-        assert result['status_updated'] == 'Done'
\ No newline at end of file
+        assert result['status_updated'] == 'Done'
+
+    @patch('mcp_tools.release_signoff_assistant.http_session.get')
+    @patch('mcp_tools.release_signoff_assistant.http_session.put')
+    @patch('mcp_tools.release_signoff_assistant.http_session.post')
+    @patch('mcp_tools.release_signoff_assistant.JiraClient')
+    def test_update_status_merges_label_into_transition(self, mock_jira_client, mock_post, mock_put, mock_get):
+        """Test that the label is sent with the transition in a single request."""
+        mock_jira_client.return_value.base_url = 'https://test.atlassian.net'
+        mock_get.return_value.status_code = 200
+        mock_get.return_value.content = dumps({
+            'transitions': [{'id': '101', 'to': {'name': 'Approved'}}]
+        })
+        mock_post.return_value.status_code = 204
+
+        result = update_ticket_status(UpdateTicketStatusRequest(ticket_key='CON-25671'))
+
+        assert result['success'] is True
+        assert result['requests_sent'] == 1
+        mock_put.assert_not_called()
+        assert mock_post.call_args[1]['json'] == {
+            'transition': {'id': '101'},
+            'fields': {'labels': ['Denim']}
+        }
+
+    @patch('mcp_tools.release_signoff_assistant.http_session.get')
+    @patch('mcp_tools.release_signoff_assistant.http_session.post')
+    @patch('mcp_tools.release_signoff_assistant.JiraClient')
+    def test_update_status_drops_prefetched_searches(self, mock_jira_client, mock_post, mock_get):
+        """Test that prefetched sign-off searches are not served after a write."""
+        mock_jira_client.return_value.base_url = 'https://test.atlassian.net'
+        mock_get.return_value.status_code = 200
+        mock_get.return_value.content = dumps({
+            'transitions': [{'id': '101', 'to': {'name': 'Approved'}}]
+        })
+        mock_post.return_value.status_code = 204
+        warm_key = ('release_signoff_tickets', 'https://test.atlassian.net', 'u', 'issuetype = "Release Sign-Off"', 50)
+        with prefetching():
+            warm_results.put(warm_key, {'issues': []})
+
+        result = update_ticket_status(UpdateTicketStatusRequest(ticket_key='CON-25671'))
+
+        assert result['success'] is True
+        assert warm_results.get(warm_key) is None
+
+    @patch('mcp_tools.release_signoff_assistant.http_session.get')
+    @patch('mcp_tools.release_signoff_assistant.http_session.put')
+    @patch('mcp_tools.release_signoff_assistant.http_session.post')
+    @patch('mcp_tools.release_signoff_assistant.JiraClient')
+    def test_update_status_skips_when_already_applied(self, mock_jira_client, mock_post, mock_put, mock_get):
+        """Test that no write is sent when the label and status are already set."""
+        mock_jira_client.return_value.base_url = 'https://test.atlassian.net'
+        mock_get.return_value.status_code = 200
+        mock_get.return_value.content = dumps({
+            'fields': {'labels': ['Denim'], 'status': {'name': 'Approved'}},
+            'transitions': [{'id': '111', 'to': {'name': 'Done'}}]
+        })
+
+        result = update_ticket_status(UpdateTicketStatusRequest(ticket_key='CON-25671'))
+
+        assert result['success'] is True
+        assert result['requests_sent'] == 0
+        mock_put.assert_not_called()
+        mock_post.assert_not_called()
+        assert mock_get.call_args[1]['params'] == {'fields': 'labels,status', 'expand': 'transitions'}
+
+
+class TestUpdateTicketWithPreviousVersions:
+    """Test recording previous versions on the current ticket."""
+
+    @staticmethod
+    def text_node(text):
+        # Versions are written as inline code
+        if text[0].isdigit():
+            return {'type': 'text', 'text': text, 'marks': [{'type': 'code'}]}
+        return {'type': 'text', 'text': text}
+
+    def ticket(self, key, paragraphs):
+        return {
+            'key': key,
+            'fields': {
+                'status': {'name': 'Open'},
+                'description': {
+                    'type': 'doc',
+                    'version': 1,
+                    'content': [
+                        {'type': 'paragraph', 'content': [self.text_node(text) for text in texts]}
+                        for texts in paragraphs
+                    ]
+                }
+            }
+        }
+
+    @patch('mcp_tools.release_signoff_assistant.JiraClient')
+    def test_skips_when_versions_already_recorded(self, mock_jira_client):
+        """Test that re-running does not append the same paragraph again."""
+        mock_client = mock_jira_client.return_value
+        current = self.ticket('CON-2', [
+            ['Previous Connector Version:', '25.3.0.20250904-1757'],
+            ['Previous SDK Version:', '25.3.0.20250804-1138']
+        ])
+        previous = self.ticket('CON-1', [
+            ['Current Connector Version:', '25.3.0.20250904-1757'],
+            ['Current SDK Version:', '25.3.0.20250804-1138']
+        ])
+        mock_client.search_tickets.side_effect = [{'issues': [current]}, {'issues': [previous]}]
+
+        result = update_ticket_with_previous_versions(
+            UpdateTicketWithPreviousVersionsRequest(current_version='25.3.4')
+        )
+
+        assert result['success'] is True
+        assert result['skipped'] is True
+        mock_client.update_ticket.assert_not_called()
+
+    @patch('mcp_tools.release_signoff_assistant.JiraClient')
+    def test_appends_without_mutating_fetched_ticket(self, mock_jira_client):
+        """Test that the new description is a copy with the versions appended."""
+        mock_client = mock_jira_client.return_value
+        current = self.ticket('CON-2', [['Release notes']])
+        previous = self.ticket('CON-1', [
+            ['Current Connector Version:', '25.3.0.20250904-1757'],
+            ['Current SDK Version:', '25.3.0.20250804-1138']
+        ])
+        mock_client.search_tickets.side_effect = [{'issues': [current]}, {'issues': [previous]}]
+
+        result = update_ticket_with_previous_versions(
+            UpdateTicketWithPreviousVersionsRequest(current_version='25.3.4')
+        )
+
+        assert result['success'] is True
+        description = mock_client.update_ticket.call_args[0][1]
+        assert len(description['content']) == 2
+        assert len(current['fields']['description']['content']) == 1
+
+
+class TestScanConsoleVersions:
+    """Test extracting versions from Jenkins console output."""
+
+    @staticmethod
+    def console_response(chunks, headers=None):
+        response = MagicMock()
+        response.status_code = 200
+        response.headers = headers or {'X-Text-Size': '1000'}
+        response.iter_content.return_value = iter(chunks)
+        response.__enter__.return_value = response
+        return response
+
+    @patch.dict('os.environ', {'JENKINS_USER': 'user', 'JENKINS_TOKEN': 'token'})
+    @patch('mcp_tools.release_signoff_assistant.http_session.get')
+    def test_scan_stops_when_all_versions_found(self, mock_get):
+        """Test that versions split across chunks are found and streaming stops early."""
+        chunks = iter([
+            b'[INFO] Building\n[INFO] com.tasktop.connector:com.tasktop.connector.leankit:jar:25.3.0.2025',
+            b'0904-1757\n[INFO] Resolved com/tasktop/sdk/core/25.3.0.20250804-1138/core.jar\n',
+            b'never read\n'
+        ])
+        mock_get.return_value = self.console_response(chunks)
+
+        request = ScanConsoleVersionsRequest(build_url='https://jenkins.test/job/release/7/')
+        result = scan_console_versions(request)
+
+        assert result['success'] is True
+        assert result['current_connector_version'] == '25.3.0.20250904-1757'
+        assert result['current_sdk_version'] == '25.3.0.20250804-1138'
+        assert next(chunks) == b'never read\n'
+        assert mock_get.call_args[1]['params'] == {'start': 0}
+        assert mock_get.call_args[1]['stream'] is True
+
+    @patch.dict('os.environ', {'JENKINS_USER': 'user', 'JENKINS_TOKEN': 'token'})
+    @patch('mcp_tools.release_signoff_assistant.http_session.get')
+    def test_scan_reports_missing_versions(self, mock_get):
+        """Test that missing versions are reported for manual input."""
+        mock_get.return_value = self.console_response(
+            [b'com.tasktop.connector.leankit 25.3.0.20250904-1757']
+        )
+
+        request = ScanConsoleVersionsRequest(build_url='https://jenkins.test/job/release/7/')
+        result = scan_console_versions(request)
+
+        assert result['success'] is False
+        assert result['current_connector_version'] == '25.3.0.20250904-1757'
+        assert 'current_sdk_version' in result['error']
@@ -0,0 +1,177 @@
+"""
+Unit tests for warm-start cache snapshots.
+"""
+import json
+import os
+import signal
+import time
+import pytest
+from mcp_tools.cache import LRUCache
+from mcp_tools.snapshot import CacheSnapshots
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    return str(tmp_path / "snapshot.json")
+
+
+def saved_cache(snapshot_path, name="test.cache", version=1, entries=((("CON-1", "t1"), "# One"),)):
+    """Save a cache with entries through a fresh registry and return it"""
+    registry = CacheSnapshots()
+    registry.enable(snapshot_path)
+    cache = registry.register(name, LRUCache(maxsize=8), version=version)
+    for key, value in entries:
+        cache.set(key, value)
+    registry.save()
+    return cache
+
+
+@pytest.mark.unit
+class TestCacheEntries:
+    """Test exporting and restoring LRU cache entries."""
+
+    def test_round_trip_keeps_order_and_age(self):
+        """Test that restored entries keep recency order and their original age."""
+        source = LRUCache(maxsize=8)
+        for key in "abc":
+            source.set(key, key.upper())
+        source.get("a")
+
+        target = LRUCache(maxsize=8)
+        target.set("new", "NEW")
+        assert target.restore(source.entries()) == 3
+
+        assert [key for key, _, _ in target.entries()] == ["b", "c", "a", "new"]
+        assert target.entries()[0][1] == source.entries()[0][1]
+
+    def test_expired_and_existing_entries_skipped(self):
+        """Test that TTL still applies and live values win."""
+        cache = LRUCache(maxsize=8, ttl=60)
+        cache.set("live", "current")
+
+        restored = cache.restore([("old", time.time() - 120, 1), ("live", time.time(), "stale"), ("ok", time.time(), 2)])
+
+        assert restored == 1
+        assert cache.get("old") is None
+        assert cache.get("live") == "current"
+        assert cache.get("ok") == 2
+
+
+@pytest.mark.unit
+class TestCacheSnapshots:
+    """Test persisting registered caches across restarts."""
+
+    def test_restart_restores_cache(self, snapshot_path):
+        """Test that a cache registered after a restart is filled from the snapshot."""
+        saved_cache(snapshot_path)
+
+        registry = CacheSnapshots()
+        registry.enable(snapshot_path)
+        cache = registry.register("test.cache", LRUCache(maxsize=8))
+
+        assert cache.get(("CON-1", "t1")) == "# One"
+
+    def test_cache_registered_before_enable(self, snapshot_path):
+        """Test that enabling fills caches of modules imported earlier."""
+        saved_cache(snapshot_path)
+
+        registry = CacheSnapshots()
+        cache = registry.register("test.cache", LRUCache(maxsize=8))
+        registry.enable(snapshot_path)
+
+        assert cache.get(("CON-1", "t1")) == "# One"
+
+    def test_disabled_by_default(self, snapshot_path):
+        """Test that nothing is read or written unless enabled."""
+        saved_cache(snapshot_path)
+
+        registry = CacheSnapshots()
+        cache = registry.register("test.cache", LRUCache(maxsize=8))
+        registry.save()
+
+        assert len(cache) == 0
+
+    def test_changed_cache_version_not_restored(self, snapshot_path):
+        """Test that a cache whose values changed shape starts empty."""
+        saved_cache(snapshot_path, version=1)
+
+        registry = CacheSnapshots()
+        registry.enable(snapshot_path)
+        cache = registry.register("test.cache", LRUCache(maxsize=8), version=2)
+
+        assert len(cache) == 0
+
+    def test_old_snapshot_ignored(self, snapshot_path):
+        """Test that a snapshot older than max_age is not restored."""
+        saved_cache(snapshot_path)
+        with open(snapshot_path) as snapshot_file:
+            snapshot = json.load(snapshot_file)
+        snapshot["saved_at"] -= 2 * 24 * 60 * 60
+        with open(snapshot_path, "w") as snapshot_file:
+            json.dump(snapshot, snapshot_file)
+
+        registry = CacheSnapshots()
+        registry.enable(snapshot_path)
+        cache = registry.register("test.cache", LRUCache(maxsize=8))
+
+        assert len(cache) == 0
+
+    def test_corrupt_snapshot_ignored(self, snapshot_path):
+        """Test that an unreadable snapshot starts cold instead of failing."""
+        with open(snapshot_path, "w") as snapshot_file:
+            snapshot_file.write("{not json")
+
+        registry = CacheSnapshots()
+        registry.enable(snapshot_path)
+        cache = registry.register("test.cache", LRUCache(maxsize=8))
+
+        assert len(cache) == 0
+
+    def test_unloaded_module_cache_carried_forward(self, snapshot_path):
+        """Test that caches of modules not imported in a run survive the next save."""
+        saved_cache(snapshot_path, name="lazy.cache")
+
+        registry = CacheSnapshots()
+        registry.enable(snapshot_path)
+        registry.register("other.cache", LRUCache(maxsize=8)).set("k", "v")
+        registry.save()
+
+        registry = CacheSnapshots()
+        registry.enable(snapshot_path)
+        assert registry.register("lazy.cache", LRUCache(maxsize=8)).get(("CON-1", "t1")) == "# One"
+        assert registry.register("other.cache", LRUCache(maxsize=8)).get("k") == "v"
+
+
+@pytest.mark.unit
+class TestShutdown:
+    """Test saving the snapshot when the server is stopped."""
+
+    def test_sigterm_saves_after_unwinding(self, snapshot_path, monkeypatch):
+        """Test that SIGTERM saves the caches even while the interrupted code holds a cache lock."""
+        import run_server
+
+        registry = CacheSnapshots()
+        cache = registry.register("test.cache", LRUCache(maxsize=8))
+        cache.set("CON-1", "# One")
+
+        def run(transport):
+            with cache._lock:
+                os.kill(os.getpid(), signal.SIGTERM)
+                time.sleep(1)
+
+        exits = []
+        monkeypatch.setattr(run_server, "snapshots", registry)
+        monkeypatch.setattr(run_server, "terminated", False)
+        monkeypatch.setattr(run_server.combined_mcp, "run", run)
+        monkeypatch.setattr(run_server.os, "_exit", exits.append)
+        previous = signal.getsignal(signal.SIGTERM)
+        try:
+            with pytest.raises(KeyboardInterrupt):
+                run_server.main(["--cache-snapshot", snapshot_path])
+        finally:
+            signal.signal(signal.SIGTERM, previous)
+
+        assert exits == [0]
+        with open(snapshot_path) as snapshot_file:
+            entries = json.load(snapshot_file)["caches"]["test.cache"]["entries"]
+        assert [(key, value) for key, _, value in entries] == [("CON-1", "# One")]
@@ -0,0 +1,745 @@
+"""
+Tests for tests triaging assistant MCP tools.
+"""
+import json
+import httpx
+import pytest
+import xml.etree.ElementTree as ET
+from unittest.mock import AsyncMock, MagicMock, patch
+from mcp_tools import tests_triaging_assistant
+from mcp_tools.tests_triaging_assistant import (
+    create_build_issue,
+    create_build_issues,
+    update_jira_build_issue,
+    update_jira_build_issues,    fetch_build_with_failures,
+    configuration_label,
+    fetch_junit_artifacts,
+    fetch_test_detail,
+    iter_junit_failures,
+    wait_for_build,
+    build_case_report_url,
+    slice_output,
+    BuildIssueCreateInput,
+    BuildIssueCreateManyInput,
+    BuildIssueUpdateInput,
+    BuildIssueUpdateManyInput,
+    BuildWaitInput,
+    CaseDetailFetchInput,
+    JenkinsBuildFetchInput,
+    JUnitArtifactFetchInput
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_build_failures_cache():
+    """Start every test without failures cached by earlier ones."""
+    tests_triaging_assistant._build_failures_cache.clear()
+
+
+@pytest.fixture
+def jenkins_env(monkeypatch):
+    """Provide Jenkins credentials for the tools."""
+    monkeypatch.setenv("JENKINS_URL", "https://jenkins.test")
+    monkeypatch.setenv("JENKINS_USER", "jenkins_user")
+    monkeypatch.setenv("JENKINS_TOKEN", "jenkins_token")
+
+
+def make_response(payload, status_code=200):
+    response = MagicMock()
+    response.status_code = status_code
+    response.content = json.dumps(payload).encode()
+    return response
+
+
+SAMPLE_TEST_REPORT = {
+    "suites": [{
+        "cases": [
+            {"className": "com.example.FooTest", "name": "passes", "status": "PASSED"},
+            {
+                "className": "com.example.FooTest",
+                "name": "fails",
+                "status": "FAILED",
+                "errorDetails": "expected 200 but was 500",
+                "errorStackTrace": "java.lang.AssertionError: expected 200"
+            },
+            {"className": "com.example.FooTest", "name": "infra", "status": "FAILED"}
+        ]
+    }]
+}
+
+
+@pytest.mark.unit
+class TestFetchBuildWithFailures:
+    """Test failure extraction from the latest build."""
+
+    @pytest.mark.asyncio
+    @patch('httpx.Client')
+    async def test_fetch_failures_skips_infrastructure_errors(self, mock_client_class, jenkins_env):
+        """Test that failed cases without details are skipped."""
+        mock_client = mock_client_class.return_value.__enter__.return_value
+        mock_client.get.side_effect = [
+            make_response({"number": 42, "result": "UNSTABLE", "url": "https://jenkins.test/job/connector-leankit/42/"}),
+            make_response(SAMPLE_TEST_REPORT)
+        ]
+
+        result = await fetch_build_with_failures(JenkinsBuildFetchInput())
+
+        assert result["buildNumber"] == 42
+        assert result["total_failures"] == 1
+        assert result["failed_tests"][0]["api"] == "com.example.FooTest.fails"
+
+    @pytest.mark.asyncio
+    @patch('httpx.Client')
+    async def test_fetch_failures_successful_build(self, mock_client_class, jenkins_env):
+        """Test that a passing build does not fetch the test report."""
+        mock_client = mock_client_class.return_value.__enter__.return_value
+        mock_client.get.return_value = make_response({"number": 42, "result": "SUCCESS", "url": "u"})
+
+        result = await fetch_build_with_failures(JenkinsBuildFetchInput())
+
+        assert result["failed_tests"] == []
+        mock_client.get.assert_called_once()
+
+    @pytest.mark.asyncio
+    @patch('httpx.Client')
+    async def test_failures_of_finished_build_are_cached(self, mock_client_class, jenkins_env):
+        """Test that a second call for the same finished build skips the test report."""
+        mock_client = mock_client_class.return_value.__enter__.return_value
+        build = {"number": 42, "result": "UNSTABLE", "url": "https://jenkins.test/job/connector-leankit/42/"}
+        mock_client.get.side_effect = [make_response(build), make_response(SAMPLE_TEST_REPORT), make_response(build)]
+
+        first = await fetch_build_with_failures(JenkinsBuildFetchInput())
+        second = await fetch_build_with_failures(JenkinsBuildFetchInput())
+
+        assert second == first
+        assert mock_client.get.call_count == 3
+
+    @pytest.mark.asyncio
+    @patch('httpx.Client')
+    async def test_missing_test_report_not_cached(self, mock_client_class, jenkins_env):
+        """Test that a build whose report was not available is fetched again."""
+        mock_client = mock_client_class.return_value.__enter__.return_value
+        build = {"number": 42, "result": "FAILURE", "url": "https://jenkins.test/job/connector-leankit/42/"}
+        mock_client.get.side_effect = [
+            make_response(build), make_response({}, status_code=404),
+            make_response(build), make_response(SAMPLE_TEST_REPORT)
+        ]
+
+        await fetch_build_with_failures(JenkinsBuildFetchInput())
+        result = await fetch_build_with_failures(JenkinsBuildFetchInput())
+
+        assert result["total_failures"] == 1
+
+
+@pytest.mark.unit
+class TestChildBuildFanOut:
+    """Test failure extraction from matrix runs and downstream builds."""
+
+    def test_configuration_labels(self):
+        """Test labels for matrix runs and downstream builds."""
+        assert configuration_label("https://jenkins.test/job/matrix/jdk=11,label=linux/42/") == "jdk=11,label=linux"
+        assert configuration_label("https://jenkins.test/job/folder/job/downstream/12/") == "downstream #12"
+
+    @pytest.mark.asyncio
+    @patch('httpx.Client')
+    async def test_matrix_runs_are_fetched_and_labelled(self, mock_client_class, jenkins_env):
+        """Test that failures of every current matrix run are merged with their labels."""
+        mock_client = mock_client_class.return_value.__enter__.return_value
+        build_info = {
+            "number": 42,
+            "result": "UNSTABLE",
+            "url": "https://jenkins.test/job/matrix/42/",
+            "runs": [
+                {"number": 42, "url": "https://jenkins.test/job/matrix/jdk=11/42/"},
+                {"number": 42, "url": "https://jenkins.test/job/matrix/jdk=17/42/"},
+                {"number": 41, "url": "https://jenkins.test/job/matrix/jdk=8/41/"}
+            ]
+        }
+        reports = {
+            "https://jenkins.test/job/matrix/jdk=11/42/testReport/api/json": make_response(SAMPLE_TEST_REPORT),
+            "https://jenkins.test/job/matrix/jdk=17/42/testReport/api/json": make_response({}, status_code=404)
+        }
+        mock_client.get.side_effect = lambda url, **kwargs: (
+            make_response(build_info) if url.endswith("/lastBuild/api/json") else reports[url]
+        )
+
+        result = await fetch_build_with_failures(JenkinsBuildFetchInput(job_name="matrix"))
+
+        assert result["total_failures"] == 1
+        assert result["failed_tests"][0]["configuration"] == "jdk=11"
+        assert [child["label"] for child in result["child_builds"]] == ["jdk=11", "jdk=17"]
+        assert result["child_builds"][1]["message"] == "No test report available"
+
+    @pytest.mark.asyncio
+    @patch('httpx.Client')
+    async def test_downstream_builds_are_fetched(self, mock_client_class, jenkins_env):
+        """Test that downstream builds with relative URLs are resolved and labelled."""
+        mock_client = mock_client_class.return_value.__enter__.return_value
+        build_info = {
+            "number": 7,
+            "result": "FAILURE",
+            "url": "https://jenkins.test/job/pipeline/7/",
+            "subBuilds": [{"jobName": "connector-leankit", "buildNumber": 99, "url": "job/connector-leankit/99/"}]
+        }
+        reports = {
+            "https://jenkins.test/job/pipeline/7/testReport/api/json": make_response({}, status_code=404),
+            "https://jenkins.test/job/connector-leankit/99/testReport/api/json": make_response(SAMPLE_TEST_REPORT)
+        }
+        mock_client.get.side_effect = lambda url, **kwargs: (
+            make_response(build_info) if url.endswith("/lastBuild/api/json") else reports[url]
+        )
+
+        result = await fetch_build_with_failures(JenkinsBuildFetchInput(job_name="pipeline"))
+
+        assert result["total_failures"] == 1
+        assert result["failed_tests"][0]["configuration"] == "connector-leankit #99"
+
+    @pytest.mark.asyncio
+    @patch('httpx.Client')
+    async def test_parent_failures_kept_with_downstream_builds(self, mock_client_class, jenkins_env):
+        """Test that a parent running tests of its own reports them next to its downstream builds."""
+        mock_client = mock_client_class.return_value.__enter__.return_value
+        build_info = {
+            "number": 7,
+            "result": "UNSTABLE",
+            "url": "https://jenkins.test/job/pipeline/7/",
+            "subBuilds": [{"jobName": "connector-leankit", "buildNumber": 99, "url": "job/connector-leankit/99/"}]
+        }
+        parent_report = {"suites": [{"cases": [{
+            "className": "com.example.SmokeTest", "name": "starts", "status": "FAILED",
+            "errorDetails": "timeout", "errorStackTrace": "", "stdout": ""
+        }]}]}
+        reports = {
+            "https://jenkins.test/job/pipeline/7/testReport/api/json": make_response(parent_report),
+            "https://jenkins.test/job/connector-leankit/99/testReport/api/json": make_response(SAMPLE_TEST_REPORT)
+        }
+        mock_client.get.side_effect = lambda url, **kwargs: (
+            make_response(build_info) if url.endswith("/lastBuild/api/json") else reports[url]
+        )
+
+        result = await fetch_build_with_failures(JenkinsBuildFetchInput(job_name="pipeline"))
+
+        assert result["total_failures"] == 2
+        assert result["failed_tests"][0]["api"] == "com.example.SmokeTest.starts"
+        assert "configuration" not in result["failed_tests"][0]
+        assert result["failed_tests"][1]["configuration"] == "connector-leankit #99"
+
+    @pytest.mark.asyncio
+    @patch('httpx.Client')
+    async def test_aggregated_report_keeps_child_labels(self, mock_client_class, jenkins_env):
+        """Test that aggregated child reports keep their configuration labels."""
+        mock_client = mock_client_class.return_value.__enter__.return_value
+        mock_client.get.side_effect = [
+            make_response({"number": 42, "result": "UNSTABLE", "url": "u"}),
+            make_response({"childReports": [{
+                "child": {"number": 42, "url": "https://jenkins.test/job/matrix/jdk=11/42/"},
+                "result": SAMPLE_TEST_REPORT
+            }]})
+        ]
+
+        result = await fetch_build_with_failures(JenkinsBuildFetchInput(job_name="matrix"))
+
+        assert result["failed_tests"][0]["configuration"] == "jdk=11"
+
+
+JUNIT_XML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<testsuites>
+  <testsuite name="com.example.FooTest" tests="4">
+    <testcase classname="com.example.FooTest" name="passes"><system-out>ok</system-out></testcase>
+    <testcase classname="com.example.FooTest" name="fails[Story]">
+      <failure message="expected 200 but was 500" type="java.lang.AssertionError">java.lang.AssertionError: expected 200
+	at com.example.FooTest.fails(FooTest.java:12)</failure>
+    </testcase>
+    <testcase classname="com.example.FooTest" name="errors"><error message="Connection reset"/></testcase>
+    <testcase classname="com.example.FooTest" name="infra"><failure/></testcase>
+    <testcase classname="com.example.FooTest" name="skipped"><skipped/></testcase>
+  </testsuite>
+</testsuites>
+"""
+
+
+@pytest.mark.unit
+class TestJUnitArtifacts:
+    """Test JUnit XML artifact ingestion."""
+
+    def test_iter_failures_across_chunk_boundaries(self):
+        """Test incremental parsing of XML split into small chunks."""
+        chunks = [JUNIT_XML[i:i + 7] for i in range(0, len(JUNIT_XML), 7)]
+
+        failures = list(iter_junit_failures(chunks))
+
+        assert [f.api for f in failures] == ["com.example.FooTest.fails[Story]", "com.example.FooTest.errors"]
+        assert failures[0].error_details == "expected 200 but was 500"
+        assert failures[0].stack_trace.startswith("java.lang.AssertionError: expected 200")
+        assert failures[1].stack_trace == ""
+
+    def test_iter_failures_detaches_handled_cases(self):
+        """Test that handled test cases do not stay attached to the tree."""
+        roots = []
+
+        class RecordingParser(ET.XMLPullParser):
+            def read_events(self):
+                for event, elem in super().read_events():
+                    if not roots:
+                        roots.append(elem)
+                    yield event, elem
+
+        suite = b"<testsuite>" + b"".join(b'<testcase classname="C" name="t%d"/>' % i for i in range(1000))
+        with patch('mcp_tools.tests_triaging_assistant.ET.XMLPullParser', RecordingParser):
+            failures = list(iter_junit_failures([suite, b"</testsuite>"]))
+
+        assert failures == []
+        assert len(roots[0]) == 0
+
+    @patch('httpx.Client')
+    def test_fetch_junit_artifacts(self, mock_client_class, jenkins_env):
+        """Test that matching artifacts are streamed and parsed."""
+        mock_client = mock_client_class.return_value.__enter__.return_value
+        mock_client.get.return_value = make_response({
+            "number": 42,
+            "result": "UNSTABLE",
+            "url": "https://jenkins.test/job/connector-leankit/42/",
+            "artifacts": [
+                {"relativePath": "target/surefire-reports/TEST-com.example.FooTest.xml"},
+                {"relativePath": "target/connector.jar"}
+            ]
+        })
+        artifact_response = MagicMock()
+        artifact_response.status_code = 200
+        artifact_response.iter_bytes.return_value = iter([JUNIT_XML[:100], JUNIT_XML[100:]])
+        mock_client.stream.return_value.__enter__.return_value = artifact_response
+
+        result = fetch_junit_artifacts(JUnitArtifactFetchInput())
+
+        assert result["total_failures"] == 2
+        assert result["artifacts"] == [
+            {"path": "target/surefire-reports/TEST-com.example.FooTest.xml", "total_failures": 2}
+        ]
+        mock_client.stream.assert_called_once_with(
+            "GET",
+            "https://jenkins.test/job/connector-leankit/42/artifact/target/surefire-reports/TEST-com.example.FooTest.xml"
+        )
+
+
+@pytest.mark.unit
+class TestWaitForBuild:
+    """Test waiting for a build to finish before extracting failures."""
+
+    @pytest.mark.asyncio
+    @patch('mcp_tools.tests_triaging_assistant.asyncio.sleep', new_callable=AsyncMock)
+    @patch('httpx.Client')
+    @patch('httpx.AsyncClient')
+    async def test_wait_backs_off_until_finished(self, mock_async_client_class, mock_client_class, mock_sleep, jenkins_env):
+        """Test exponential backoff and hand-off to failure extraction."""
+        mock_async_client = AsyncMock()
+        mock_async_client_class.return_value.__aenter__.return_value = mock_async_client
+        mock_async_client.get.side_effect = [
+            make_response({"number": 42, "building": True, "result": None, "url": "u"}),
+            make_response({"number": 42, "building": True, "result": None, "url": "u"}),
+            make_response({"number": 42, "building": False, "result": "UNSTABLE", "url": "u"})
+        ]
+        mock_client = mock_client_class.return_value.__enter__.return_value
+        mock_client.get.return_value = make_response(SAMPLE_TEST_REPORT)
+
+        result = await wait_for_build(BuildWaitInput(initial_interval=2, max_interval=3))
+
+        assert result["status"] == "UNSTABLE"
+        assert result["total_failures"] == 1
+        assert result["polls"] == 3
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [2, 3]
+        # Later polls are pinned to the build number seen first
+        assert "/job/connector-leankit/42/api/json" in mock_async_client.get.call_args_list[1].args[0]
+
+    @pytest.mark.asyncio
+    @patch('httpx.AsyncClient')
+    async def test_wait_times_out(self, mock_async_client_class, jenkins_env):
+        """Test that a build still running at the timeout is reported as RUNNING."""
+        mock_async_client = AsyncMock()
+        mock_async_client_class.return_value.__aenter__.return_value = mock_async_client
+        mock_async_client.get.return_value = make_response({"number": 42, "building": True, "url": "u"})
+
+        result = await wait_for_build(BuildWaitInput(timeout_seconds=0))
+
+        assert result["status"] == "RUNNING"
+        assert result["polls"] == 1
+
+
+@pytest.mark.unit
+class TestCaseDetailHelpers:
+    """Test per-case URL building and output slicing."""
+
+    def test_case_report_url_escapes_parameters(self):
+        """Test that parameterized names are escaped like Jenkins safe names."""
+        url = build_case_report_url(
+            "https://jenkins.test/job/connector-leankit/42/",
+            "com.tasktop.connector.leankit.auth.AuthenticationTest",
+            "validate[OAuth 2.0 / Story]"
+        )
+
+        assert url == (
+            "https://jenkins.test/job/connector-leankit/42/testReport/com.tasktop.connector.leankit.auth/"
+            "AuthenticationTest/validate%5BOAuth%202.0%20_%20Story%5D/api/json"
+        )
+
+    def test_case_report_url_default_package(self):
+        """Test classes without a package use the (root) segment."""
+        url = build_case_report_url("https://jenkins.test/job/x/1/", "SmokeTest", "run")
+
+        assert "/testReport/%28root%29/SmokeTest/run/api/json" in url
+
+    def test_slice_output_tail(self):
+        """Test that the tail is returned when no offset is given."""
+        result = slice_output("0123456789", 4)
+
+        assert result["content"] == "6789"
+        assert result["start"] == 6
+        assert result["total_bytes"] == 10
+        assert result["truncated"] is True
+
+    def test_slice_output_range(self):
+        """Test slicing an explicit byte range."""
+        result = slice_output("0123456789", 3, offset=2)
+
+        assert result["content"] == "234"
+        assert result["end"] == 5
+
+    def test_slice_output_short_text(self):
+        """Test that short outputs are returned untruncated."""
+        result = slice_output("abc", 100)
+
+        assert result["content"] == "abc"
+        assert result["truncated"] is False
+
+
+@pytest.mark.unit
+class TestFetchTestDetail:
+    """Test on-demand test case detail retrieval."""
+
+    @patch('httpx.Client')
+    def test_fetch_detail_caches_completed_builds(self, mock_client_class, jenkins_env):
+        """Test that details of a finished build are fetched once; only the build is asked again."""
+        tests_triaging_assistant._case_detail_cache.clear()
+        mock_client = mock_client_class.return_value.__enter__.return_value
+        mock_client.get.side_effect = [
+            make_response({"number": 42, "url": "https://jenkins.test/job/connector-leankit/42/", "building": False}),
+            make_response({
+                "status": "FAILED",
+                "errorDetails": "expected 200",
+                "errorStackTrace": "java.lang.AssertionError\n\tat Foo.bar",
+                "stdout": "GET /api/board 500",
+                "stderr": ""
+            }),
+            make_response({"number": 42, "url": "https://jenkins.test/job/connector-leankit/42/", "building": False})
+        ]
+
+        request = CaseDetailFetchInput(build_number=42, class_name="com.example.FooTest", test_name="bar", max_bytes=9)
+        first = fetch_test_detail(request)
+        second = fetch_test_detail(request)
+
+        assert first == second
+        assert first["standard_output"]["content"] == "board 500"
+        assert first["standard_output"]["truncated"] is True
+        assert first["error_details"] == "expected 200"
+        assert mock_client.get.call_count == 3
+        assert mock_client.get.call_args[1]["params"] == {"tree": "number,url,building"}
+
+    @patch('httpx.Client')
+    def test_fetch_detail_cached_case_needs_access(self, mock_client_class, jenkins_env):
+        """Test that a cached case is not served to a caller Jenkins turns away."""
+        tests_triaging_assistant._case_detail_cache.clear()
+        tests_triaging_assistant._case_detail_cache.set(
+            ("https://jenkins.test", "connector-leankit", 42, "com.example.FooTest", "bar"),
+            {"stdout": "secret", "stderr": "", "stack_trace": ""}
+        )
+        mock_client = mock_client_class.return_value.__enter__.return_value
+        rejected = make_response({}, status_code=401)
+        rejected.raise_for_status.side_effect = httpx.HTTPStatusError("401 Unauthorized", request=MagicMock(), response=rejected)
+        mock_client.get.return_value = rejected
+
+        with pytest.raises(httpx.HTTPStatusError):
+            fetch_test_detail(CaseDetailFetchInput(build_number=42, class_name="com.example.FooTest", test_name="bar"))
+
+    @patch('httpx.Client')
+    def test_fetch_detail_running_build_not_cached(self, mock_client_class, jenkins_env):
+        """Test that details of a running build are not cached."""
+        tests_triaging_assistant._case_detail_cache.clear()
+        mock_client = mock_client_class.return_value.__enter__.return_value
+        mock_client.get.side_effect = [
+            make_response({"number": 43, "url": "https://jenkins.test/job/connector-leankit/43/", "building": True}),
+            make_response({"status": "FAILED", "stdout": "out"})
+        ]
+
+        result = fetch_test_detail(CaseDetailFetchInput(class_name="com.example.FooTest", test_name="bar"))
+
+        assert result["buildNumber"] == 43
+        assert len(tests_triaging_assistant._case_detail_cache) == 0
+
+    @patch('httpx.Client')
+    def test_fetch_detail_missing_case(self, mock_client_class, jenkins_env):
+        """Test a case that is not in the test report."""
+        tests_triaging_assistant._case_detail_cache.clear()
+        mock_client = mock_client_class.return_value.__enter__.return_value
+        mock_client.get.side_effect = [
+            make_response({"number": 44, "url": "https://jenkins.test/job/connector-leankit/44/", "building": False}),
+            make_response({}, status_code=404)
+        ]
+
+        result = fetch_test_detail(CaseDetailFetchInput(class_name="com.example.FooTest", test_name="missing"))
+
+        assert result["message"] == "Test case not found in test report"
+
+    def test_fetch_detail_missing_credentials(self, mock_env_vars_missing):
+        """Test that missing Jenkins credentials are reported."""
+        with pytest.raises(ValueError, match="JENKINS_USER or JENKINS_TOKEN"):
+            fetch_test_detail(CaseDetailFetchInput(class_name="com.example.FooTest", test_name="bar"))
+
+
+@pytest.mark.unit
+class TestCreateBuildIssues:
+    """Test single and bulk Build Issue creation."""
+
+    @pytest.mark.asyncio
+    @patch('httpx.AsyncClient')
+    async def test_create_single_issue_uses_template(self, mock_client_class, mock_env_vars):
+        """Test that a single issue is created with the template description."""
+        mock_client = AsyncMock()
+        mock_client_class.return_value.__aenter__.return_value = mock_client
+        mock_client.post.return_value = make_response({"key": "CON-1", "id": "1001"})
+
+        result = await create_build_issue(BuildIssueCreateInput(title="LeanKit - auth fails", frequency=""))
+
+        payload = mock_client.post.call_args[1]["json"]
+        assert result == {"success": True, "issue_key": "CON-1", "issue_id": "1001"}
+        assert payload["fields"]["customfield_17545"]["type"] == "doc"
+        assert "customfield_17736" not in payload["fields"]
+
+    @pytest.mark.asyncio
+    @patch('httpx.AsyncClient')
+    async def test_create_many_reports_partial_failures(self, mock_client_class, mock_env_vars):
+        """Test that failed elements are reported next to created issues."""
+        mock_client = AsyncMock()
+        mock_client_class.return_value.__aenter__.return_value = mock_client
+        mock_client.post.return_value = make_response({
+            "issues": [{"key": "CON-1", "id": "1001"}, {"key": "CON-3", "id": "1003"}],
+            "errors": [{
+                "status": 400,
+                "failedElementNumber": 1,
+                "elementErrors": {"errorMessages": [], "errors": {"summary": "Summary is too long"}}
+            }]
+        }, status_code=201)
+
+        issues = [BuildIssueCreateInput(title=f"LeanKit - failure {i}") for i in range(3)]
+        result = await create_build_issues(BuildIssueCreateManyInput(issues=issues))
+
+        assert result["created"] == 2
+        assert result["failed"] == 1
+        assert result["success"] is False
+        assert [r.get("issue_key") for r in result["results"]] == ["CON-1", None, "CON-3"]
+        assert result["results"][1]["error"] == "summary: Summary is too long"
+        assert mock_client.post.call_args[0][0] == "https://test.atlassian.net/rest/api/3/issue/bulk"
+        assert len(json.loads(mock_client.post.call_args[1]["content"])["issueUpdates"]) == 3
+
+    @pytest.mark.asyncio
+    @patch('httpx.AsyncClient')
+    async def test_create_many_chunks_requests(self, mock_client_class, mock_env_vars):
+        """Test that large batches are split into chunks of 50 and failed chunks do not abort."""
+        mock_client = AsyncMock()
+        mock_client_class.return_value.__aenter__.return_value = mock_client
+        mock_client.post.side_effect = [
+            make_response({"issues": [{"key": f"CON-{i}", "id": str(i)} for i in range(50)], "errors": []}, 201),
+            make_response({}, status_code=500)
+        ]
+
+        issues = [BuildIssueCreateInput(title=f"failure {i}") for i in range(51)]
+        result = await create_build_issues(BuildIssueCreateManyInput(issues=issues))
+
+        assert mock_client.post.call_count == 2
+        assert result["created"] == 50
+        assert result["results"][50]["success"] is False
+
+
+@pytest.mark.unit
+class TestUpdateBuildIssues:
+    """Test single and batch Build Issue updates."""
+
+    @pytest.mark.asyncio
+    @patch('httpx.AsyncClient')
+    async def test_update_single_issue_with_transition(self, mock_client_class, mock_env_vars):
+        """Test last seen update followed by a status transition."""
+        mock_client = AsyncMock()
+        mock_client_class.return_value.__aenter__.return_value = mock_client
+        mock_client.put.return_value = make_response({}, 204)
+        mock_client.get.return_value = make_response({"transitions": [{"id": "11", "to": {"name": "Triage"}}]})
+        mock_client.post.return_value = make_response({}, 204)
+
+        result = await update_jira_build_issue(BuildIssueUpdateInput(issue_id="CON-1", status="triage"))
+
+        payload = mock_client.post.call_args[1]["json"]
+        assert result["status_updated"] == "triage"
+        assert payload["transition"] == {"id": "11"}
+        assert payload["fields"]["customfield_17737"] == result["last_seen_updated"]
+        mock_client.put.assert_not_called()
+
+    @pytest.mark.asyncio
+    @patch('httpx.AsyncClient')
+    async def test_update_single_issue_falls_back_when_screen_refuses_fields(self, mock_client_class, mock_env_vars):
+        """Test separate field update and transition when the merged request is rejected."""
+        mock_client = AsyncMock()
+        mock_client_class.return_value.__aenter__.return_value = mock_client
+        mock_client.put.return_value = make_response({}, 204)
+        mock_client.get.return_value = make_response({"transitions": [{"id": "11", "to": {"name": "Triage"}}]})
+        mock_client.post.side_effect = [make_response({}, 400), make_response({}, 204)]
+
+        result = await update_jira_build_issue(BuildIssueUpdateInput(issue_id="CON-1", status="Triage"))
+
+        assert result["status_updated"] == "Triage"
+        mock_client.put.assert_called_once()
+        assert mock_client.post.call_args[1]["json"] == {"transition": {"id": "11"}}
+
+    @pytest.mark.asyncio
+    @patch('httpx.AsyncClient')
+    async def test_update_single_issue_writes_last_seen_when_transition_fails(self, mock_client_class, mock_env_vars):
+        """Test that a failed merged transition still updates last seen and does not raise."""
+        mock_client = AsyncMock()
+        mock_client_class.return_value.__aenter__.return_value = mock_client
+        forbidden = make_response({}, 403)
+        forbidden.raise_for_status.side_effect = RuntimeError("403 Forbidden")
+        mock_client.put.return_value = make_response({}, 204)
+        mock_client.get.return_value = make_response({"transitions": [{"id": "11", "to": {"name": "Triage"}}]})
+        mock_client.post.return_value = forbidden
+
+        result = await update_jira_build_issue(BuildIssueUpdateInput(issue_id="CON-1", status="Triage"))
+
+        assert result["status_updated"] == "not updated"
+        assert mock_client.put.call_args[1]["json"]["fields"]["customfield_17737"] == result["last_seen_updated"]
+
+    @pytest.mark.asyncio
+    @patch('httpx.AsyncClient')
+    async def test_rejected_merge_not_retried(self, mock_client_class, mock_env_vars):
+        """Test that once the transition screen refused the field, later updates skip the merged request."""
+        mock_client = AsyncMock()
+        mock_client_class.return_value.__aenter__.return_value = mock_client
+        mock_client.put.return_value = make_response({}, 204)
+        mock_client.get.return_value = make_response({"transitions": [{"id": "11", "to": {"name": "Triage"}}]})
+        not_on_screen = make_response({"errors": {"customfield_17737": "Field 'customfield_17737' cannot be set. "
+                                                                       "It is not on the appropriate screen, or unknown."}}, 400)
+        mock_client.post.side_effect = [not_on_screen, make_response({}, 204), make_response({}, 204)]
+
+        await update_jira_build_issue(BuildIssueUpdateInput(issue_id="CON-1", status="Triage"))
+        result = await update_jira_build_issue(BuildIssueUpdateInput(issue_id="CON-2", status="Triage"))
+
+        assert result["status_updated"] == "Triage"
+        assert mock_client.post.call_count == 3
+        assert mock_client.put.call_count == 2
+
+    @pytest.mark.asyncio
+    @patch('httpx.AsyncClient')
+    async def test_update_many_groups_transitions(self, mock_client_class, mock_env_vars):
+        """Test that transitions are looked up once per target status."""
+        mock_client = AsyncMock()
+        mock_client_class.return_value.__aenter__.return_value = mock_client
+        mock_client.put.return_value = make_response({}, 204)
+        mock_client.get.return_value = make_response({"transitions": [{"id": "11", "to": {"name": "Triage"}}]})
+        mock_client.post.return_value = make_response({}, 204)
+
+        issues = [BuildIssueUpdateInput(issue_id=f"CON-{i}", status="Triage") for i in range(5)]
+        issues.append(BuildIssueUpdateInput(issue_id="CON-9"))
+        result = await update_jira_build_issues(BuildIssueUpdateManyInput(issues=issues))
+
+        assert result["success"] is True
+        assert result["updated"] == 6
+        assert mock_client.put.call_count == 1
+        assert mock_client.get.call_count == 1
+        assert mock_client.post.call_count == 5
+        assert result["results"][5]["status_updated"] == "not updated"
+
+    @pytest.mark.asyncio
+    @patch('httpx.AsyncClient')
+    async def test_update_many_looks_up_transitions_per_project(self, mock_client_class, mock_env_vars):
+        """Test that issues of different projects do not share a transition id."""
+        mock_client = AsyncMock()
+        mock_client_class.return_value.__aenter__.return_value = mock_client
+        mock_client.get.side_effect = lambda url, **kwargs: make_response(
+            {"transitions": [{"id": "11" if "/CON-" in url else "31", "to": {"name": "Triage"}}]}
+        )
+        mock_client.post.return_value = make_response({}, 204)
+
+        issues = [BuildIssueUpdateInput(issue_id=key, status="Triage") for key in ("CON-1", "SDK-1", "CON-2", "SDK-2")]
+        result = await update_jira_build_issues(BuildIssueUpdateManyInput(issues=issues))
+
+        assert result["success"] is True
+        assert mock_client.get.call_count == 2
+        sent = {call[0][0].split("/")[-2]: call[1]["json"]["transition"]["id"] for call in mock_client.post.call_args_list}
+        assert sent == {"CON-1": "11", "CON-2": "11", "SDK-1": "31", "SDK-2": "31"}
+
+    @pytest.mark.asyncio
+    @patch('httpx.AsyncClient')
+    async def test_update_many_reports_duplicate_issues_by_position(self, mock_client_class, mock_env_vars):
+        """Test that an issue listed twice gets a result for each entry, in input order."""
+        mock_client = AsyncMock()
+        mock_client_class.return_value.__aenter__.return_value = mock_client
+        mock_client.put.return_value = make_response({}, 204)
+        mock_client.get.return_value = make_response({"transitions": [{"id": "11", "to": {"name": "Triage"}}]})
+        mock_client.post.return_value = make_response({}, 204)
+
+        issues = [
+            BuildIssueUpdateInput(issue_id="CON-1", status="Triage"),
+            BuildIssueUpdateInput(issue_id="CON-2"),
+            BuildIssueUpdateInput(issue_id="CON-1")
+        ]
+        result = await update_jira_build_issues(BuildIssueUpdateManyInput(issues=issues))
+
+        assert [r["issue_id"] for r in result["results"]] == ["CON-1", "CON-2", "CON-1"]
+        assert [r["status_updated"] for r in result["results"]] == ["Triage", "not updated", "not updated"]
+        assert result["updated"] == 3
+
+    @pytest.mark.asyncio
+    @patch('httpx.AsyncClient')
+    async def test_update_many_reports_per_issue_failures(self, mock_client_class, mock_env_vars):
+        """Test that one failing issue does not stop the others."""
+        mock_client = AsyncMock()
+        mock_client_class.return_value.__aenter__.return_value = mock_client
+
+        def put(url, **kwargs):
+            response = make_response({}, 204)
+            if url.endswith("CON-2"):
+                response.raise_for_status.side_effect = httpx.HTTPStatusError(
+                    "404 Not Found", request=MagicMock(), response=MagicMock()
+                )
+            return response
+
+        mock_client.put.side_effect = put
+        mock_client.get.return_value = make_response({"transitions": []})
+
+        issues = [BuildIssueUpdateInput(issue_id="CON-1", status="Done"), BuildIssueUpdateInput(issue_id="CON-2")]
+        result = await update_jira_build_issues(BuildIssueUpdateManyInput(issues=issues))
+
+        assert result["success"] is False
+        assert result["results"][0]["last_seen_updated"] is not None
+        assert result["results"][0]["status_error"] == "No transition to Done"
+        assert "404" in result["results"][1]["error"]
+
+    @pytest.mark.asyncio
+    @patch('httpx.AsyncClient')
+    async def test_update_many_looks_up_own_transition_when_shared_one_fails(self, mock_client_class, mock_env_vars):
+        """Test that an issue in a different workflow state gets its own transition id."""
+        mock_client = AsyncMock()
+        mock_client_class.return_value.__aenter__.return_value = mock_client
+        mock_client.put.return_value = make_response({}, 204)
+        mock_client.get.side_effect = [
+            make_response({"transitions": [{"id": "11", "to": {"name": "Triage"}}]}),
+            make_response({"transitions": [{"id": "21", "to": {"name": "Triage"}}]})
+        ]
+        mock_client.post.side_effect = [
+            make_response({}, 204),   # CON-1 merged with id 11
+            make_response({}, 400),   # CON-2 merged with shared id 11
+            make_response({}, 400),   # CON-2 bare transition with id 11
+            make_response({}, 204)    # CON-2 bare transition with its own id 21
+        ]
+
+        issues = [BuildIssueUpdateInput(issue_id="CON-1", status="Triage"), BuildIssueUpdateInput(issue_id="CON-2", status="Triage")]
+        result = await update_jira_build_issues(BuildIssueUpdateManyInput(issues=issues))
+
+        assert result["success"] is True
+        assert [r["status_updated"] for r in result["results"]] == ["Triage", "Triage"]
+        assert mock_client.post.call_args[1]["json"] == {"transition": {"id": "21"}}
@@ -0,0 +1,218 @@
+"""
+Unit tests for incremental ticket watching.
+"""
+import pytest
+from unittest.mock import Mock, patch
+from mcp_tools.release_signoff_assistant import WatchReleaseTicketsRequest, watch_release_signoff_tickets
+from mcp_tools.ticket_watch import TicketWatchStore, WatchState, changes_query, take_changes
+
+
+def jira_issue(key, updated, created="2026-10-01T09:00:00.000+0200", summary="Release sign-off"):
+    return {
+        'key': key,
+        'fields': {
+            'summary': summary,
+            'status': {'name': 'Open'},
+            'created': created,
+            'updated': updated,
+            'description': '',
+            'fixVersions': []
+        }
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    return TicketWatchStore(str(tmp_path / "watch.json"))
+
+
+@pytest.mark.unit
+class TestChangesQuery:
+    """Test the JQL of a poll."""
+
+    def test_first_poll_looks_back(self):
+        query = changes_query('issuetype = "Release Sign-Off"', WatchState(), since_hours=6)
+
+        assert query == '(issuetype = "Release Sign-Off") AND updated >= -6h ORDER BY updated ASC'
+
+    def test_from_watermark_minute(self):
+        """Test that the search starts at the watermark's minute, in its own time zone."""
+        state = WatchState("2026-10-18T09:41:27.512+0200")
+
+        assert 'updated >= "2026-10-18 09:41" ORDER BY updated ASC' in changes_query("project = CON", state)
+
+
+@pytest.mark.unit
+class TestTakeChanges:
+    """Test de-duplication and the high-water mark."""
+
+    def test_advances_watermark(self):
+        state = WatchState()
+        issues = [
+            jira_issue("CON-1", "2026-10-18T09:40:05.000+0200"),
+            jira_issue("CON-2", "2026-10-18T09:41:27.512+0200"),
+        ]
+
+        changes = take_changes(state, issues)
+
+        assert [change.issue['key'] for change in changes] == ["CON-1", "CON-2"]
+        assert state.watermark == "2026-10-18T09:41:27.512+0200"
+        assert state.seen == {"CON-2": "2026-10-18T09:41:27.512+0200"}
+
+    def test_skips_tickets_returned_before(self):
+        """Test that the watermark's minute is searched again without repeating its tickets."""
+        state = WatchState("2026-10-18T09:41:27.512+0200", {"CON-2": "2026-10-18T09:41:27.512+0200"})
+        issues = [
+            jira_issue("CON-2", "2026-10-18T09:41:27.512+0200"),
+            jira_issue("CON-3", "2026-10-18T09:41:50.000+0200"),
+        ]
+
+        changes = take_changes(state, issues)
+
+        assert [change.issue['key'] for change in changes] == ["CON-3"]
+        assert state.seen == {
+            "CON-2": "2026-10-18T09:41:27.512+0200",
+            "CON-3": "2026-10-18T09:41:50.000+0200"
+        }
+
+    def test_reports_ticket_again_when_updated(self):
+        state = WatchState("2026-10-18T09:41:27.512+0200", {"CON-2": "2026-10-18T09:41:27.512+0200"})
+
+        changes = take_changes(state, [jira_issue("CON-2", "2026-10-18T10:02:00.000+0200")])
+
+        assert [(change.issue['key'], change.kind) for change in changes] == [("CON-2", "updated")]
+        assert state.seen == {"CON-2": "2026-10-18T10:02:00.000+0200"}
+
+    def test_created_since_previous_poll(self):
+        state = WatchState("2026-10-18T09:41:27.512+0200")
+        issues = [
+            jira_issue("CON-4", "2026-10-18T09:50:00.000+0200", created="2026-10-18T09:49:00.000+0200"),
+            jira_issue("CON-5", "2026-10-18T09:51:00.000+0200", created="2026-09-30T12:00:00.000+0200"),
+        ]
+
+        assert [change.kind for change in take_changes(state, issues)] == ["created", "updated"]
+
+    def test_empty_poll_keeps_state(self):
+        state = WatchState("2026-10-18T09:41:27.512+0200", {"CON-2": "2026-10-18T09:41:27.512+0200"})
+
+        assert take_changes(state, []) == []
+        assert state == WatchState("2026-10-18T09:41:27.512+0200", {"CON-2": "2026-10-18T09:41:27.512+0200"})
+
+
+@pytest.mark.unit
+class TestTicketWatchStore:
+    """Test persistence of watcher states."""
+
+    def test_state_survives_restart(self, store):
+        with store.watching("signoff") as state:
+            take_changes(state, [jira_issue("CON-1", "2026-10-18T09:40:05.000+0200")])
+
+        restarted = TicketWatchStore(store.path)
+        with restarted.watching("signoff") as state:
+            assert state.watermark == "2026-10-18T09:40:05.000+0200"
+        with restarted.watching("other") as state:
+            assert state == WatchState()
+
+    def test_failed_poll_keeps_saved_state(self, store):
+        with pytest.raises(RuntimeError):
+            with store.watching("signoff") as state:
+                take_changes(state, [jira_issue("CON-1", "2026-10-18T09:40:05.000+0200")])
+                raise RuntimeError("Jira API error: 503")
+
+        with store.watching("signoff") as state:
+            assert state == WatchState()
+
+    def test_reset(self, store):
+        with store.watching("signoff") as state:
+            take_changes(state, [jira_issue("CON-1", "2026-10-18T09:40:05.000+0200")])
+
+        store.reset("signoff")
+
+        with store.watching("signoff") as state:
+            assert state.watermark is None
+
+    def test_unreadable_file_starts_over(self, store):
+        with open(store.path, "w") as state_file:
+            state_file.write("{not json")
+
+        with store.watching("signoff") as state:
+            assert state == WatchState()
+
+
+@pytest.mark.unit
+class TestWatchReleaseSignoffTickets:
+    """Test the watch tool."""
+
+    @pytest.fixture(autouse=True)
+    def watch_store(self, store):
+        with patch('mcp_tools.release_signoff_assistant.ticket_watch', store):
+            yield store
+
+    @pytest.fixture
+    def jira(self):
+        with patch('mcp_tools.release_signoff_assistant.JiraClient') as mock_jira_client:
+            client = Mock(base_url='https://test.atlassian.net', username='test_user')
+            mock_jira_client.return_value = client
+            yield client
+
+    def test_second_call_reports_only_changes(self, jira):
+        jira.search_tickets.return_value = {'issues': [jira_issue("CON-1", "2026-10-18T09:40:05.000+0200")]}
+        first = watch_release_signoff_tickets(WatchReleaseTicketsRequest(status='Open'))
+
+        jira.search_tickets.return_value = {'issues': [
+            jira_issue("CON-1", "2026-10-18T09:40:05.000+0200"),
+            jira_issue("CON-6", "2026-10-18T09:40:40.000+0200", created="2026-10-18T09:40:39.000+0200"),
+        ]}
+        second = watch_release_signoff_tickets(WatchReleaseTicketsRequest(status='Open'))
+
+        assert [ticket['key'] for ticket in first['tickets']] == ["CON-1"]
+        assert [(ticket['key'], ticket['change']) for ticket in second['tickets']] == [("CON-6", "created")]
+        assert second['watermark'] == "2026-10-18T09:40:40.000+0200"
+        query = jira.search_tickets.call_args[0][0]
+        assert query == (
+            '(issuetype = "Release Sign-Off" AND status = "Open") '
+            'AND updated >= "2026-10-18 09:40" ORDER BY updated ASC'
+        )
+
+    def test_more_when_page_is_full(self, jira):
+        jira.search_tickets.return_value = {'issues': [
+            jira_issue("CON-1", "2026-10-18T09:40:05.000+0200"),
+            jira_issue("CON-2", "2026-10-18T09:45:05.000+0200"),
+        ]}
+
+        result = watch_release_signoff_tickets(WatchReleaseTicketsRequest(limit=2))
+
+        assert result['more'] is True
+        assert result['returned'] == 2
+
+    def test_error_keeps_position(self, jira, watch_store):
+        jira.search_tickets.side_effect = Exception("Jira API error: 503 - unavailable")
+
+        result = watch_release_signoff_tickets(WatchReleaseTicketsRequest())
+
+        assert result['success'] is False
+        assert 'Jira API error' in result['error']
+        with watch_store.watching("release_signoff https://test.atlassian.net test_user *") as state:
+            assert state == WatchState()
+
+    def test_failed_rendering_keeps_position(self, jira, watch_store):
+        """Test that tickets are reported again when building the output failed."""
+        jira.search_tickets.return_value = {'issues': [jira_issue("CON-1", "2026-10-18T09:40:05.000+0200")]}
+
+        with patch('mcp_tools.release_signoff_assistant.ticket_output', side_effect=ValueError("bad description")):
+            failed = watch_release_signoff_tickets(WatchReleaseTicketsRequest())
+        retried = watch_release_signoff_tickets(WatchReleaseTicketsRequest())
+
+        assert failed['success'] is False
+        assert [ticket['key'] for ticket in retried['tickets']] == ["CON-1"]
+
+    def test_pages_past_tickets_of_one_minute(self, jira):
+        """Test that more tickets of one minute than fit a page are all reported, once."""
+        bulk_edit = [jira_issue(f"CON-{n}", f"2026-10-18T09:40:0{n}.000+0200") for n in range(3)]
+        pages = {None: {'issues': bulk_edit[:2], 'nextPageToken': 'page-2'}, 'page-2': {'issues': bulk_edit[2:]}}
+        jira.search_tickets.side_effect = lambda query, limit, page_token: pages[page_token]
+
+        polls = [watch_release_signoff_tickets(WatchReleaseTicketsRequest(limit=2)) for _ in range(3)]
+
+        assert [[ticket['key'] for ticket in poll['tickets']] for poll in polls] == [["CON-0", "CON-1"], ["CON-2"], []]
+        assert [poll['more'] for poll in polls] == [True, False, False]
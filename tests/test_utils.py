@@ -89,6 +89,33 @@ class TestExtractTextFromDescription:
         result = extract_text_from_description(description)
         assert result == "https://nested.example.com/release"
     
+    def test_release_info_inside_list(self):
+        """Test extraction when release information sits in a bullet list."""
+        description = {
+            "type": "doc",
+            "version": 1,
+            "content": [
+                {
+                    "type": "bulletList",
+                    "content": [
+                        {
+                            "type": "listItem",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {"type": "text", "text": "Release Information: https://list.example.com/release"}
+                                    ]
+                                }
+                            ]
+                        }
+                    ]
+                }
+            ]
+        }
+        result = extract_text_from_description(description)
+        assert result == "https://list.example.com/release"
+    
     def test_multiple_urls_after_release_info(self):
         """Test extraction when multiple URLs follow release information marker."""
         description = "Some text. Release Information: https://first.com/release https://second.com/release"
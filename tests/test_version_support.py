@@ -5,6 +5,8 @@ import pytest
 import subprocess
 from unittest.mock import patch, AsyncMock, MagicMock
 import httpx
+from mcp_tools.codec import dumps
+from mcp_tools.prefetch import prefetching, warm_results
 from mcp_tools.version_support_assistant import (
     fetch_tickets, add_comment, accept_ticket, create_gerrit_pr,
     TicketFetchInput, CommentInput, StatusUpdateInput, GerritPRInput
@@ -22,7 +24,7 @@ class TestFetchTickets:
         # Setup mock client
         mock_client = AsyncMock()
         mock_response = MagicMock()
-        mock_response.json.return_value = sample_jira_response
+        mock_response.content = dumps(sample_jira_response)
         mock_client.get.return_value = mock_response
         mock_client_class.return_value.__aenter__.return_value = mock_client
         
@@ -82,7 +84,7 @@ class TestFetchTickets:
         """Test fetch_tickets with custom parameters."""
         mock_client = AsyncMock()
         mock_response = MagicMock()
-        mock_response.json.return_value = {"issues": []}
+        mock_response.content = dumps({"issues": []})
         mock_client.get.return_value = mock_response
         mock_client_class.return_value.__aenter__.return_value = mock_client
         
@@ -109,7 +111,7 @@ class TestAddComment:
         # Setup mock client
         mock_client = AsyncMock()
         mock_response = MagicMock()
-        mock_response.json.return_value = sample_comment_response
+        mock_response.content = dumps(sample_comment_response)
         mock_client.post.return_value = mock_response
         mock_client_class.return_value.__aenter__.return_value = mock_client
         
@@ -185,6 +187,22 @@ class TestAcceptTicket:
         assert "CON-12345" in call_args[0][0]  # URL contains ticket ID
         assert call_args[1]["json"]["transition"]["id"] == "71"
     
+    @pytest.mark.asyncio
+    @patch('httpx.AsyncClient')
+    async def test_accept_ticket_drops_prefetched_searches(self, mock_client_class, mock_env_vars):
+        """Test that prefetched searches are not served after the status changed."""
+        mock_client = AsyncMock()
+        mock_client.post.return_value = MagicMock()
+        mock_client_class.return_value.__aenter__.return_value = mock_client
+        warm_key = ("ticket.fetch", "https://test.atlassian.net", "u", 'type = "Version Support"', 100)
+        with prefetching():
+            warm_results.put(warm_key, [{"id": "CON-12345", "status": "To Triage"}])
+
+        result = await accept_ticket(StatusUpdateInput(ticket_id="CON-12345"))
+
+        assert result.success is True
+        assert warm_results.get(warm_key) is None
+
     @pytest.mark.asyncio
     async def test_accept_ticket_missing_credentials(self, mock_env_vars_missing):
         """Test accept_ticket with missing credentials."""
@@ -0,0 +1,200 @@
+"""
+Unit tests for the webhook receiver, driven by recorded Jira and Jenkins payloads.
+"""
+import json
+import os
+import urllib.error
+import urllib.request
+import pytest
+from unittest.mock import patch
+from mcp_tools import webhooks
+from mcp_tools.prefetch import prefetching, warm_results
+from mcp_tools.webhooks import PipelineRule, WebhookReceiver, jenkins_event, jira_event, replay, sign
+
+SECRET = "s3cret"
+PAYLOADS = os.path.join(os.path.dirname(__file__), "webhook_payloads")
+
+
+def recorded(name):
+    with open(os.path.join(PAYLOADS, name), "rb") as payload_file:
+        return payload_file.read()
+
+
+def post(url, body, headers=None):
+    """POST body and return (status, decoded reply)"""
+    request = urllib.request.Request(url, data=body, headers=headers or {}, method="POST")
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+@pytest.fixture
+def ran(monkeypatch):
+    """Replace the pipelines with ones that record the events they ran for"""
+    calls = []
+    for name in webhooks.PIPELINES:
+        monkeypatch.setitem(webhooks.PIPELINES, name, lambda event, name=name: calls.append((name, event.delivery)))
+    return calls
+
+
+@pytest.fixture
+def receiver(ran):
+    rules = [
+        PipelineRule("build_completed", "triage_build", jobs=["connector-*"]),
+        PipelineRule("issue_created", "prepare_signoff", issue_type="Release Sign-Off"),
+    ]
+    receiver = WebhookReceiver(SECRET, rules)
+    receiver.start()
+    yield receiver
+    receiver.stop()
+
+
+@pytest.fixture
+def warm():
+    """Prefetched searches of sign-off and version support tickets"""
+    with prefetching():
+        warm_results.put(("release_signoff_tickets", "https://test.atlassian.net", "u", 'issuetype = "Release Sign-Off"', 50), {})
+        warm_results.put(("ticket.fetch", "https://test.atlassian.net", "u", 'type = "Version Support"', 100), [])
+    yield
+    warm_results.clear()
+
+
+@pytest.mark.unit
+class TestEvents:
+    """Test recognising recorded payloads."""
+
+    def test_jira_issue_created(self):
+        event = jira_event(json.loads(recorded("jira_issue_created.json")))
+
+        assert event.name == "issue_created"
+        assert event.issue_type == "Release Sign-Off"
+        assert event.issue["key"] == "CON-26012"
+
+    def test_other_jira_events_ignored(self):
+        assert jira_event({"webhookEvent": "jira:worklog_updated"}) is None
+
+    def test_jenkins_only_finished_builds(self):
+        assert jenkins_event(json.loads(recorded("jenkins_build_started.json"))) is None
+
+        event = jenkins_event(json.loads(recorded("jenkins_build_finalized.json")))
+        assert (event.name, event.job, event.build_number) == ("build_completed", "connector-leankit", 412)
+
+    def test_completed_and_finalized_are_one_delivery(self):
+        finalized = json.loads(recorded("jenkins_build_finalized.json"))
+        completed = json.loads(recorded("jenkins_build_finalized.json"))
+        completed["build"]["phase"] = "COMPLETED"
+
+        assert jenkins_event(completed).delivery == jenkins_event(finalized).delivery
+
+    def test_unknown_rule(self):
+        with pytest.raises(ValueError, match="pipeline"):
+            PipelineRule("build_completed", "deploy")
+        with pytest.raises(ValueError, match="event"):
+            PipelineRule("build_started", "triage_build")
+
+    def test_secret_required(self):
+        with patch.dict(os.environ, {}, clear=True):
+            with pytest.raises(ValueError, match="WEBHOOK_SECRET"):
+                WebhookReceiver()
+
+
+@pytest.mark.unit
+class TestWebhookReceiver:
+    """Test the receiver with a local stand-in posting recorded payloads."""
+
+    def test_new_signoff_ticket(self, receiver, ran, warm):
+        """Test that a new sign-off ticket drops its searches and is prepared."""
+        reply = replay(receiver.url, "jira", recorded("jira_issue_created.json"), SECRET)
+        receiver.stop()
+
+        assert reply == {"event": "issue_created", "pipelines": ["prepare_signoff"]}
+        assert ran == [("prepare_signoff", ("jira", "jira:issue_created", "CON-26012", 1792300861512))]
+        assert warm_results.get(("release_signoff_tickets", "https://test.atlassian.net", "u", 'issuetype = "Release Sign-Off"', 50)) is None
+        assert warm_results.get(("ticket.fetch", "https://test.atlassian.net", "u", 'type = "Version Support"', 100)) == []
+
+    def test_updated_ticket_runs_no_pipeline(self, receiver, ran, warm):
+        reply = replay(receiver.url, "jira", recorded("jira_issue_updated.json"), SECRET)
+        receiver.stop()
+
+        assert reply == {"event": "issue_updated", "pipelines": []}
+        assert ran == []
+        assert warm_results.get(("ticket.fetch", "https://test.atlassian.net", "u", 'type = "Version Support"', 100)) is None
+
+    def test_finished_build_triaged_once(self, receiver, ran):
+        """Test that a build is triaged once, however many phases Jenkins reports."""
+        finalized = recorded("jenkins_build_finalized.json")
+        completed = finalized.replace(b'"FINALIZED"', b'"COMPLETED"')
+
+        replies = [
+            replay(receiver.url, "jenkins", body, SECRET)
+            for body in (recorded("jenkins_build_started.json"), completed, finalized)
+        ]
+        receiver.stop()
+
+        assert replies == [
+            {"event": None},
+            {"event": "build_completed", "pipelines": ["triage_build"]},
+            {"event": "build_completed", "duplicate": True},
+        ]
+        assert ran == [("triage_build", ("jenkins", "connector-leankit", 412))]
+
+    def test_job_filter(self, receiver, ran):
+        body = recorded("jenkins_build_finalized.json").replace(b'"connector-leankit"', b'"platform-nightly"')
+
+        assert replay(receiver.url, "jenkins", body, SECRET)["pipelines"] == []
+
+    def test_token_for_unsigned_senders(self, receiver):
+        body = recorded("jenkins_build_started.json")
+
+        assert post(f"{receiver.url}/webhooks/jenkins?token={SECRET}", body)[0] == 202
+        assert post(f"{receiver.url}/webhooks/jenkins", body, {"X-Webhook-Token": SECRET})[0] == 202
+
+    def test_rejects_unauthenticated(self, receiver, ran):
+        body = recorded("jira_issue_created.json")
+
+        assert post(f"{receiver.url}/webhooks/jira", body)[0] == 401
+        assert post(f"{receiver.url}/webhooks/jira?token=guess", body)[0] == 401
+        tampered = body.replace(b"25.3.5", b"25.3.6")
+        assert post(f"{receiver.url}/webhooks/jira", tampered, {"X-Hub-Signature": sign(SECRET, body)})[0] == 401
+        receiver.stop()
+        assert ran == []
+
+    def test_bad_requests(self, receiver):
+        assert post(f"{receiver.url}/webhooks/gerrit", b"{}", {"X-Webhook-Token": SECRET})[0] == 404
+        assert post(f"{receiver.url}/webhooks/jira", b"not json", {"X-Webhook-Token": SECRET})[0] == 400
+        assert post(f"{receiver.url}/webhooks/jira", b"[]", {"X-Webhook-Token": SECRET})[0] == 400
+
+
+@pytest.mark.unit
+class TestPipelines:
+    """Test the pipelines with the assistant functions they call mocked."""
+
+    def test_triage_build_fetches_build(self):
+        event = jenkins_event(json.loads(recorded("jenkins_build_finalized.json")))
+
+        with patch("mcp_tools.tests_triaging_assistant.fetch_build_failures", return_value={"failed_tests": []}) as fetch:
+            webhooks.triage_build(event)
+
+        fetch.assert_called_once_with("connector-leankit", 412)
+
+    def test_prepare_signoff_for_fix_version(self):
+        event = jira_event(json.loads(recorded("jira_issue_created.json")))
+
+        with patch("mcp_tools.release_signoff_assistant.update_ticket_with_previous_versions",
+                   return_value={"success": True}) as previous_versions, \
+             patch("mcp_tools.release_signoff_assistant.link_task_urls", return_value={"success": True}) as task_urls:
+            webhooks.prepare_signoff(event)
+
+        assert previous_versions.call_args[0][0].current_version == "25.3.5"
+        assert task_urls.call_args[0][0].current_version == "25.3.5"
+
+    def test_prepare_signoff_reports_failure(self):
+        event = jira_event(json.loads(recorded("jira_issue_created.json")))
+
+        with patch("mcp_tools.release_signoff_assistant.update_ticket_with_previous_versions",
+                   return_value={"success": False, "error": "No release sign-off ticket found for version 25.3.4"}), \
+             patch("mcp_tools.release_signoff_assistant.link_task_urls", return_value={"success": True}):
+            with pytest.raises(RuntimeError, match="25.3.4"):
+                webhooks.prepare_signoff(event)